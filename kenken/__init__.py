@@ -0,0 +1,106 @@
+'''
+A KenKen solver.
+
+The core types and solvers are imported with the package; the batch and
+multiprocessing helpers are imported the first time they are used, so
+that importing kenken stays cheap. The testing values used in the
+examples live in kenken.examples.
+'''
+
+from kenken.bounded import iter_neighbours, solve_kenken_bounded
+from kenken.cages import cage_neighbours, solve_kenken_cages
+from kenken.dlx import algorithm_x, exact_cover_matrix, solve_kenken_dlx
+from kenken.fileio import (FORMATS, MalformedPuzzle, SolutionWriter,
+                           encode_board, format_puzzle, format_text,
+                           iter_puzzles, parse_record, print_sol, read_puzzle,
+                           read_puzzles, read_solutions)
+from kenken.flat import (GUESS_FLAG, NO_CAGE, FlatPuzzle, flat_neighbours,
+                         flatten_puzzle, solve_kenken_flat, unflatten_puzzle)
+from kenken.generate import generate_corpus, generate_puzzle, latin_square
+from kenken.ordering import (ORDERINGS, order_fewest, order_file,
+                             order_filled, order_product, reorder_constraints)
+## propagate (the function) is left in kenken.propagate, so that it does
+## not hide the submodule of the same name
+from kenken.propagate import (cage_groups, cage_lookup, cage_support,
+                              initial_domains, solve_kenken_cp)
+from kenken.puzzle import (Guess, Posn, Puzzle, cage_index, cell_number,
+                           line_masks, puzzle_key)
+from kenken.solver import (apply_guess, available_vals, fill_in_guess,
+                           find_blank, guess_valid, neighbours, place_guess,
+                           solve_kenken)
+from kenken.session import SolverSession
+from kenken.solutions import check_solution, count_solutions, iter_solutions
+from kenken.stats import SolveStats
+from kenken.symmetry import lex_leader, puzzle_symmetries, solution_orbit
+from kenken.tables import (cage_assignments, cage_clashes, cage_multisets,
+                           cage_satisfied, cage_tuples, tuple_fits)
+from kenken.trail import solve_kenken_trail, trail_search
+
+## names imported from a submodule on first use (see __getattr__)
+LAZY = {'ENGINES': 'kenken.batch',
+        'puzzle_files': 'kenken.batch',
+        'solve_batch': 'kenken.batch',
+        'solve_stream': 'kenken.batch',
+        'iter_batch': 'kenken.batch',
+        'iter_batch_stacked': 'kenken.batch',
+        'BATCH_ENGINES': 'kenken.batch',
+        'save_solution': 'kenken.batch',
+        'write_result': 'kenken.batch',
+        'write_results': 'kenken.batch',
+        'print_entry': 'kenken.batch',
+        'SolveTimeout': 'kenken.parallel',
+        'solve_pool': 'kenken.parallel',
+        'split_frontier': 'kenken.parallel',
+        'solve_kenken_parallel': 'kenken.parallel',
+        'SolutionCache': 'kenken.cache',
+        'fingerprint': 'kenken.cache',
+        'TIERS': 'kenken.bench',
+        'run_bench': 'kenken.bench',
+        'SolverServer': 'kenken.server',
+        'solve_kenken_vector': 'kenken.vector',
+        'solve_kenken_vector_batch': 'kenken.vector',
+        'puzzle_cnf': 'kenken.sat',
+        'format_dimacs': 'kenken.sat',
+        'solve_kenken_sat': 'kenken.sat',
+        'main': 'kenken.cli'}
+
+
+def __getattr__(name):
+    '''
+    Returns the attribute name of kenken from the submodule LAZY gives
+    for it, importing that submodule if needed.
+
+    Effects: May import a module
+
+    __getattr__: Str -> Any
+    '''
+    if name not in LAZY:
+        raise AttributeError("module 'kenken' has no attribute " + repr(name))
+    import importlib
+    value = getattr(importlib.import_module(LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+## the names from kenken import * binds: the eagerly imported ones, so
+## that it does not import the LAZY modules (or need NumPy)
+__all__ = ['FORMATS', 'FlatPuzzle', 'GUESS_FLAG', 'Guess', 'MalformedPuzzle',
+           'NO_CAGE', 'ORDERINGS', 'Posn', 'Puzzle', 'SolutionWriter',
+           'SolveStats', 'SolverSession', 'algorithm_x', 'apply_guess',
+           'available_vals', 'cage_assignments', 'cage_clashes', 'cage_groups',
+           'cage_index', 'cage_lookup', 'cage_multisets', 'cage_neighbours',
+           'cage_satisfied', 'cage_support', 'cage_tuples', 'cell_number',
+           'check_solution', 'count_solutions', 'encode_board',
+           'exact_cover_matrix', 'fill_in_guess', 'find_blank',
+           'flat_neighbours', 'flatten_puzzle', 'format_puzzle', 'format_text',
+           'generate_corpus', 'generate_puzzle', 'guess_valid',
+           'initial_domains', 'iter_neighbours', 'iter_puzzles',
+           'iter_solutions', 'latin_square', 'lex_leader', 'line_masks',
+           'neighbours', 'order_fewest', 'order_file', 'order_filled',
+           'order_product', 'parse_record', 'place_guess', 'print_sol',
+           'puzzle_key', 'puzzle_symmetries', 'read_puzzle', 'read_puzzles',
+           'read_solutions', 'reorder_constraints', 'solution_orbit',
+           'solve_kenken', 'solve_kenken_bounded', 'solve_kenken_cages',
+           'solve_kenken_cp', 'solve_kenken_dlx', 'solve_kenken_flat',
+           'solve_kenken_trail', 'trail_search', 'tuple_fits',
+           'unflatten_puzzle']
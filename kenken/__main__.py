@@ -0,0 +1,9 @@
+'''
+Runs the command line interface: python -m kenken [options] [puzzles].
+'''
+
+import sys
+
+from kenken.cli import main
+
+sys.exit(main())
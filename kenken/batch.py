@@ -0,0 +1,271 @@
+'''
+Solving many puzzle files in one process.
+'''
+
+import glob
+import os
+import time
+
+from kenken.bounded import solve_kenken_bounded
+from kenken.cages import solve_kenken_cages
+from kenken.dlx import solve_kenken_dlx
+from kenken.fileio import print_sol, read_puzzle, read_puzzles
+from kenken.flat import solve_kenken_flat
+from kenken.propagate import solve_kenken_cp
+from kenken.sat import solve_kenken_sat
+from kenken.solver import solve_kenken
+from kenken.trail import solve_kenken_trail
+
+
+## ******** BATCH SOLVING ***************
+
+## ENGINES maps a name to each solver above; every one consumes a Puzzle
+## and produces a Puzzle or False.
+ENGINES = {'search': solve_kenken,
+           'bounded': solve_kenken_bounded,
+           'flat': solve_kenken_flat,
+           'cages': solve_kenken_cages,
+           'cp': solve_kenken_cp,
+           'dlx': solve_kenken_dlx,
+           'trail': solve_kenken_trail,
+           'sat': solve_kenken_sat}
+
+## BATCH_ENGINES maps the name of an engine in ENGINES to a solver that
+## consumes a list of Puzzles and produces the list of their solutions
+## in one call (see iter_batch_stacked).
+BATCH_ENGINES = {}
+
+## the vector engine needs NumPy, which is optional
+try:
+    from kenken.vector import solve_kenken_vector, solve_kenken_vector_batch
+    ENGINES['vector'] = solve_kenken_vector
+    BATCH_ENGINES['vector'] = solve_kenken_vector_batch
+except ImportError:
+    pass
+
+
+def puzzle_files(sources, manifest=None):
+    '''
+    Returns the list of puzzle file names given by sources and manifest.
+    Each source is a directory (meaning every .txt file in it, in sorted
+    order), a glob pattern (every match, in sorted order), or a file
+    name. manifest, if given, is a file listing one puzzle file per line,
+    relative to the manifest's directory; blank lines and lines starting
+    with # are skipped.
+
+    Effects: Reads from a file
+
+    puzzle_files: (listof Str) (anyof Str None) -> (listof Str)
+
+    Example:
+       puzzle_files(["inp1836.txt"]) => ["inp1836.txt"]
+    '''
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            files.extend(sorted(glob.glob(os.path.join(source, "*.txt"))))
+        elif glob.has_magic(source):
+            files.extend(sorted(glob.glob(source)))
+        else:
+            files.append(source)
+    if manifest != None:
+        base = os.path.dirname(manifest)
+        with open(manifest, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line != "" and not line.startswith("#"):
+                    files.append(os.path.join(base, line))
+    return files
+
+
+## An Entry is a (list Str (anyof Puzzle False Str) Float), holding a
+## puzzle file name, its solution (False if it has none, or a Str saying
+## why it was not solved, such as "timeout"), and the seconds taken.
+
+
+def write_result(f, entry):
+    '''
+    Writes entry to the open file f: a header line "# <file> <seconds>"
+    followed by the solution in the print_sol format (or the line
+    "no solution", or "not solved: <reason>"), and a blank line.
+
+    Effects: Writes to a file
+
+    write_result: File Entry -> None
+    '''
+    name, sol, secs = entry
+    f.write("# {0} {1:.6f}\n".format(name, secs))
+    if isinstance(sol, str):
+        f.write("not solved: " + sol + "\n")
+    elif sol == False:
+        f.write("no solution\n")
+    else:
+        for row in sol.board:
+            f.write("  ".join(map(str, row)) + "\n")
+    f.write("\n")
+
+
+def write_results(results, fname):
+    '''
+    Writes every entry in results to one file, fname, with write_result.
+
+    Effects: Writes to a file
+
+    write_results: (listof Entry) Str -> None
+    '''
+    with open(fname, "w") as f:
+        for entry in results:
+            write_result(f, entry)
+
+
+def solve_batch(files, solver=solve_kenken, out_dir=None, results=None,
+                report=None):
+    '''
+    Reads and solves every puzzle file in files, in order, with solver,
+    and returns the list of their Entries (see iter_batch).
+
+    If out_dir is given, each solution is written by save_solution. If
+    results is given, all of them are written to that one file by
+    write_results. If report is given, it is called with each Entry as
+    it is made.
+
+    Effects: Reads from and writes to files
+
+    solve_batch: (listof Str) (Puzzle -> (anyof Puzzle False))
+                 (anyof Str None) (anyof Str None)
+                 (anyof (Entry -> Any) None) -> (listof Entry)
+
+    Example:
+       solve_batch(["inp1836.txt"]) => [["inp1836.txt", puzzle1soln, 0.0...]]
+    '''
+    done = []
+    for entry in iter_batch(files, solver):
+        if out_dir != None:
+            save_solution(entry, out_dir)
+        if report != None:
+            report(entry)
+        done.append(entry)
+    if results != None:
+        write_results(done, results)
+    return done
+
+
+def iter_batch(files, solver=solve_kenken):
+    '''
+    Produces, one at a time, the Entry for each puzzle file in files,
+    reading and solving them in order with solver. A file that cannot be
+    read or solved gets the error message as its solution, as in
+    parallel.solve_chunk, instead of stopping the batch.
+
+    Effects: Reads from files
+
+    iter_batch: (iterableof Str) (Puzzle -> (anyof Puzzle False))
+                -> (generatorof Entry)
+    '''
+    for name in files:
+        start = time.perf_counter()
+        try:
+            sol = solver(read_puzzle(name))
+        except Exception as err:
+            sol = "error: {0!r}".format(err)
+        yield [name, sol, time.perf_counter() - start]
+
+
+def iter_batch_stacked(files, batch_solver, count):
+    '''
+    Produces, one at a time, the Entry for each puzzle file in files, in
+    order, like iter_batch, but reads count files at a time and solves
+    their puzzles in one call to batch_solver (see BATCH_ENGINES). Each
+    Entry gets an equal share of the seconds its call took. A file that
+    cannot be read gets the error message as its solution; if the call
+    fails, so does every puzzle in it.
+
+    Effects: Reads from files
+
+    iter_batch_stacked: (listof Str)
+                        ((listof Puzzle) -> (listof (anyof Puzzle False)))
+                        Nat -> (generatorof Entry)
+    Requires: count > 0
+    '''
+    for first in range(0, len(files), count):
+        start = time.perf_counter()
+        names = files[first:first + count]
+        sols = [None] * len(names)
+        ## read[i] is the index in names of the i-th puzzle read
+        read = []
+        puzzles = []
+        for i in range(len(names)):
+            try:
+                puzzles.append(read_puzzle(names[i]))
+                read.append(i)
+            except Exception as err:
+                sols[i] = "error: {0!r}".format(err)
+        try:
+            solved = batch_solver(puzzles)
+        except Exception as err:
+            solved = ["error: {0!r}".format(err)] * len(puzzles)
+        for i in range(len(read)):
+            sols[read[i]] = solved[i]
+        secs = (time.perf_counter() - start) / len(names)
+        for i in range(len(names)):
+            yield [names[i], sols[i], secs]
+
+
+def save_solution(entry, out_dir):
+    '''
+    Writes the solution of entry with print_sol to out_dir/<name>.out,
+    for a puzzle file <name>.txt, if the puzzle was solved.
+
+    Effects: Writes to a file
+
+    save_solution: Entry Str -> None
+    '''
+    name, sol, secs = entry
+    if sol != False and not isinstance(sol, str):
+        stem = os.path.splitext(os.path.basename(name))[0]
+        print_sol(sol, os.path.join(out_dir, stem + ".out"))
+
+
+def solve_stream(fname, solver=solve_kenken):
+    '''
+    Produces an Entry for each puzzle in the file fname (standard input
+    if fname is "-"), which may hold any number of puzzles (see
+    iter_puzzles), solving them one at a time with solver. The k-th
+    puzzle (counting from 1) is named "<fname>#<k>". Malformed puzzles
+    are reported on standard error and skipped; a puzzle solver fails on
+    gets the error message as its solution, as in iter_batch.
+
+    Effects: Reads from a file
+
+    solve_stream: Str (Puzzle -> (anyof Puzzle False)) -> (generatorof Entry)
+    '''
+    k = 0
+    start = time.perf_counter()
+    for puz in read_puzzles(fname):
+        k += 1
+        try:
+            sol = solver(puz)
+        except Exception as err:
+            sol = "error: {0!r}".format(err)
+        yield ["{0}#{1}".format(fname, k), sol, time.perf_counter() - start]
+        start = time.perf_counter()
+
+
+def print_entry(entry, out=None):
+    '''
+    Prints one [file, solution, seconds] entry of solve_batch as a line
+    of the form "<file>  <seconds>s  solved" (or "no solution"), to the
+    open file out (standard output if out is None).
+
+    Effects: Prints to the screen or writes to a file
+
+    print_entry: Entry (anyof File None) -> None
+    '''
+    name, sol, secs = entry
+    if isinstance(sol, str):
+        status = sol
+    elif sol == False:
+        status = "no solution"
+    else:
+        status = "solved"
+    print("{0}  {1:.6f}s  {2}".format(name, secs, status), file=out)
@@ -0,0 +1,252 @@
+'''
+Benchmarks of the solving engines on a generated puzzle corpus, reported
+as JSON: run_bench, and python -m kenken.bench.
+'''
+
+import argparse
+import json
+import os
+import platform
+import signal  # per-puzzle time limits
+import sys
+import time
+import tracemalloc  # peak memory of each solve
+
+from kenken.batch import ENGINES
+from kenken.fileio import format_puzzle
+from kenken.generate import generate_corpus
+from kenken.parallel import SolveTimeout, raise_timeout
+from kenken.solver import solve_kenken
+from kenken.stats import SolveStats
+
+
+## ******** BENCHMARKS ***************
+
+## Each engine is run twice on every puzzle of the corpus: once plainly,
+## for the latency figures, and once under tracemalloc (and, for the
+## search engine, with a SolveStats) for the peak memory and the number
+## of nodes expanded. The corpus is generate_corpus(sizes, count, seed),
+## so a report can be compared with one from another version of the
+## solver as long as the sizes, count and seed match.
+##
+## A Report is a (dictof Str Any) ready for json.dumps; see run_bench.
+
+## TIERS groups the board sizes of the corpus.
+TIERS = {'small': [3, 4],
+         'medium': [5, 6],
+         'large': [7, 8, 9]}
+
+
+def percentile(times, p):
+    '''
+    Returns the p-th percentile of the non-empty list times, by the
+    nearest rank method.
+
+    percentile: (listof Float) Nat -> Float
+    Requires: times != [], 0 < p <= 100
+
+    Examples:
+       percentile([4.0, 1.0, 3.0, 2.0], 50) => 2.0
+       percentile([4.0, 1.0, 3.0, 2.0], 95) => 4.0
+    '''
+    ordered = sorted(times)
+    rank = -(-p * len(ordered) // 100)
+    return ordered[rank - 1]
+
+
+def run_limited(f, timeout):
+    '''
+    Returns f(), or "timeout" if it runs for more than timeout seconds
+    (where the platform supports SIGALRM, and timeout is not None).
+
+    Effects: Changes and restores the SIGALRM handler
+
+    run_limited: (-> Any) (anyof Float None) -> Any
+    '''
+    if timeout == None or not hasattr(signal, "SIGALRM"):
+        return f()
+    old = signal.signal(signal.SIGALRM, raise_timeout)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        return f()
+    except SolveTimeout:
+        return "timeout"
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, old)
+
+
+def bench_puzzle(engine, puz, timeout):
+    '''
+    Runs the engine named engine on puz as described above, and returns
+    [status, seconds, nodes, peak], where status is "solved", "unsolved"
+    or "timeout", nodes is None except for the search engine, and peak is
+    the peak memory in bytes (None after a timeout).
+
+    Effects: Changes and restores the SIGALRM handler
+
+    bench_puzzle: Str Puzzle (anyof Float None)
+                  -> (list Str Float (anyof Nat None) (anyof Nat None))
+    '''
+    solver = ENGINES[engine]
+    start = time.perf_counter()
+    sol = run_limited(lambda: solver(puz), timeout)
+    secs = time.perf_counter() - start
+    if sol == "timeout":
+        return ["timeout", secs, None, None]
+
+    stats = None
+    if engine == "search":
+        stats = SolveStats()
+        solver = lambda puz: solve_kenken(puz, None, stats)
+    tracemalloc.start()
+    try:
+        run_limited(lambda: solver(puz), timeout)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    status = "unsolved" if sol == False else "solved"
+    return [status, secs, None if stats == None else stats.nodes, peak]
+
+
+def bench_engine(engine, size, puzzles, timeout):
+    '''
+    Returns the summary of running the engine named engine on puzzles, a
+    non-empty list of puzzles of the given size, as a dictionary.
+
+    Effects: Changes and restores the SIGALRM handler
+
+    bench_engine: Str Nat (listof Puzzle) (anyof Float None)
+                  -> (dictof Str Any)
+    '''
+    counts = {"solved": 0, "unsolved": 0, "timeout": 0}
+    times = []
+    nodes = 0
+    node_secs = 0.0
+    peak = 0
+    for puz in puzzles:
+        status, secs, n, mem = bench_puzzle(engine, puz, timeout)
+        counts[status] += 1
+        times.append(secs)
+        if n != None:
+            nodes += n
+            node_secs += secs
+        if mem != None:
+            peak = max(peak, mem)
+    res = {"engine": engine, "size": size, "puzzles": len(puzzles),
+           "solved": counts["solved"], "unsolved": counts["unsolved"],
+           "timeouts": counts["timeout"],
+           "p50": percentile(times, 50), "p95": percentile(times, 95),
+           "mean": sum(times) / len(times), "total": sum(times),
+           "nodes": None, "nodes_per_sec": None, "peak_bytes": peak}
+    if engine == "search":
+        res["nodes"] = nodes
+        if node_secs > 0:
+            res["nodes_per_sec"] = nodes / node_secs
+    return res
+
+
+def run_bench(engines=None, tiers=("small", "medium"), count=5, seed=0,
+              timeout=10.0, report=None):
+    '''
+    Benchmarks each engine named in engines (every one in ENGINES by
+    default) on count generated puzzles of each size of each tier in
+    tiers, and returns a Report: a dictionary holding the settings, the
+    Python version and a list "results" with one summary (see
+    bench_engine) per engine and size. Each summary is also passed to
+    report, if it is given, as soon as it is made.
+
+    Effects: Changes and restores the SIGALRM handler, calls report
+
+    run_bench: (anyof (listof Str) None) (listof Str) Nat Any
+               (anyof Float None) (anyof ((dictof Str Any) -> Any) None)
+               -> Report
+    '''
+    if engines == None:
+        engines = sorted(ENGINES)
+    results = []
+    for tier in tiers:
+        for size in TIERS[tier]:
+            puzzles = [puz for name, puz in generate_corpus([size], count,
+                                                            seed)]
+            for engine in engines:
+                res = bench_engine(engine, size, puzzles, timeout)
+                res["tier"] = tier
+                results.append(res)
+                if report != None:
+                    report(res)
+    return {"seed": seed, "count": count, "timeout": timeout,
+            "tiers": list(tiers), "engines": list(engines),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "results": results}
+
+
+def main(argv=None):
+    '''
+    Runs run_bench from the command line, writing its Report as JSON to
+    a file or to standard output, or writes the corpus to files.
+
+    Effects: Writes to files or the screen, prints progress to
+             standard error
+
+    main: (anyof (listof Str) None) -> Nat
+    '''
+    parser = argparse.ArgumentParser(
+        description="Benchmark the KenKen engines on generated puzzles.")
+    parser.add_argument("-e", "--engine", action="append",
+                        choices=sorted(ENGINES),
+                        help="engine to run (repeat for more; default all)")
+    parser.add_argument("-t", "--tier", action="append",
+                        choices=sorted(TIERS),
+                        help="sizes to run (repeat for more; default "
+                             "small and medium)")
+    parser.add_argument("-n", "--count", type=int, default=5,
+                        help="puzzles of each size")
+    parser.add_argument("--seed", default="0", help="corpus seed")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="seconds allowed per puzzle")
+    parser.add_argument("-o", "--output", help="write the JSON report here")
+    parser.add_argument("-w", "--write", metavar="DIR",
+                        help="only write the corpus to DIR, one puzzle "
+                             "file per puzzle, instead of benchmarking")
+    args = parser.parse_args(argv)
+    tiers = args.tier or ["small", "medium"]
+
+    if args.write != None:
+        os.makedirs(args.write, exist_ok=True)
+        sizes = []
+        for tier in tiers:
+            sizes.extend(TIERS[tier])
+        for name, puz in generate_corpus(sizes, args.count, args.seed):
+            with open(os.path.join(args.write, name + ".txt"), "w") as f:
+                f.write(format_puzzle(puz))
+        return 0
+
+    def progress(res):
+        print("{0:>7} {1}x{1}  p50 {2:.6f}s  p95 {3:.6f}s  {4} timeouts"
+              .format(res["engine"], res["size"], res["p50"], res["p95"],
+                      res["timeouts"]), file=sys.stderr)
+
+    report = run_bench(args.engine, tiers, args.count, args.seed,
+                       args.timeout, progress)
+    text = json.dumps(report, indent=2)
+    if args.output == None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+'''
+check.expect("Tbench1", percentile([4.0, 1.0, 3.0, 2.0], 50), 2.0)
+check.expect("Tbench2", percentile([4.0, 1.0, 3.0, 2.0], 95), 4.0)
+check.expect("Tbench3", bench_puzzle("search", puzzle1, None)[:1], ["solved"])
+check.expect("Tbench4", bench_puzzle("trail", puzzle1partial4a, None)[:1],
+             ["unsolved"])
+'''
@@ -0,0 +1,148 @@
+'''
+The cage by cage search in memory proportional to its depth:
+solve_kenken_bounded.
+'''
+
+import copy  # copies nested list to avoid mutating the consumed lists
+import time  # timings for SolveStats
+from collections import OrderedDict
+
+from kenken.ordering import ORDERINGS, reorder_constraints
+from kenken.puzzle import Puzzle, puzzle_key
+from kenken.solver import (apply_guess, available_vals, fill_in_guess,
+                           find_blank, guess_valid)
+
+
+## ******** MEMORY BOUNDED SEARCH ***************
+
+## solve_kenken holds every sibling of every puzzle on its path in
+## to_visit, each a full copy of the board, and the key of every puzzle
+## it has expanded in visited, so its memory grows with the number of
+## puzzles explored. But the cage by cage search is a tree (each puzzle
+## is reached by one sequence of guesses only), so:
+##   - the stack holds one generator of neighbours per level instead of
+##     a list of them, and a neighbour is built only when it is visited;
+##   - visited is not needed at all. If max_visited is given, up to that
+##     many keys are kept, least recently seen dropped first, which only
+##     matters for orderings that could reach a puzzle twice.
+## Memory is then proportional to the depth of the search (the number of
+## cells plus the number of cages), not to the puzzles explored, and the
+## puzzles are visited in the same order as by solve_kenken. Iterative
+## deepening is not needed: every solution lies at the same depth.
+
+
+def iter_neighbours(puz, order=None):
+    '''
+    Produces the neighbours of puz, one at a time and in the same order as
+    neighbours(puz, order), leaving out those guess_valid rules out.
+
+    iter_neighbours: Puzzle (anyof Ordering None) -> (generatorof Puzzle)
+
+    Example:
+       list(iter_neighbours(puzzle2a)) => [puzzle2b]
+    '''
+    tmp = Puzzle(puz.size, copy.deepcopy(puz.board),
+                 copy.deepcopy(puz.constraints), puz.cages, puz.rows,
+                 puz.cols)
+    if order != None:
+        tmp = reorder_constraints(tmp, order)
+    if tmp.constraints == []:
+        return
+    pos = None
+    for cell in tmp.cages.get(tmp.constraints[0][0], []):
+        if isinstance(tmp.board[cell.y][cell.x], str):
+            pos = cell
+            break
+    if pos == None:
+        if guess_valid(tmp):
+            yield apply_guess(tmp)
+        return
+    for val in available_vals(tmp, pos):
+        nbr = fill_in_guess(tmp, pos, val)
+        if guess_valid(nbr):
+            yield nbr
+
+
+def solve_kenken_bounded(orig, order=None, max_visited=None, stats=None):
+    '''
+    Finds the solution to a KenKen puzzle, orig, or returns False if
+    there is no solution, like solve_kenken(orig, order), but keeping at
+    most max_visited puzzle keys (None for none at all) and one pending
+    neighbour generator per level of the search. Raises ValueError if
+    max_visited is negative.
+
+    If stats (a SolveStats) is given, the puzzles expanded, the deepest
+    stack (as peak_frontier), the keys kept and the time taken are added
+    to it.
+
+    Effects: Mutates stats, if it is given
+
+    solve_kenken_bounded: Puzzle (anyof Ordering Str None) (anyof Nat None)
+                          (anyof SolveStats None) -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_bounded(puzzle1) => puzzle1soln
+    '''
+    if max_visited != None and max_visited < 0:
+        raise ValueError("max_visited must not be negative")
+    if isinstance(order, str):
+        order = ORDERINGS[order]
+    if stats != None:
+        start = time.perf_counter()
+    visited = OrderedDict()
+    sol = False
+    if find_blank(orig) == False:
+        sol = orig
+        stack = []
+    else:
+        stack = [iter_neighbours(orig, order)]
+        if stats != None:
+            stats.nodes += 1
+            stats.event('expand', 0, orig)
+            stats.peak_frontier = max(stats.peak_frontier, 1)
+    while stack != []:
+        puz = next(stack[-1], None)
+        if puz == None:
+            stack.pop()
+            continue
+        if find_blank(puz) == False:
+            sol = puz
+            break
+        if max_visited != None:
+            key = puzzle_key(puz)
+            if key in visited:
+                visited.move_to_end(key)
+                continue
+            visited[key] = True
+            if len(visited) > max_visited:
+                visited.popitem(last=False)
+        stack.append(iter_neighbours(puz, order))
+        if stats != None:
+            stats.nodes += 1
+            stats.event('expand', len(stack) - 1, puz)
+            if len(stack) > stats.peak_frontier:
+                stats.peak_frontier = len(stack)
+
+    if stats != None:
+        stats.visited = len(visited)
+        stats.seconds += time.perf_counter() - start
+    return sol
+
+
+'''
+check.expect("Tbnd1", solve_kenken_bounded(puzzle1), puzzle1soln)
+check.expect("Tbnd2", solve_kenken_bounded(puzzle1partial, 'fewest', 3),
+             puzzle1soln)
+check.expect("Tbnd3", solve_kenken_bounded(puzzle1partial4a), False)
+check.expect("Tbnd4", solve_kenken_bounded(puzzle1soln), puzzle1soln)
+check.expect("Tbnd5", list(iter_neighbours(puzzle1)), puzzle1_first_guess[1:3])
+stats = SolveStats()
+solve_kenken_bounded(puzzle1, None, None, stats)
+check.expect("Tbnd6", [stats.nodes, stats.visited, stats.peak_frontier],
+             [29, 0, 25])
+try:
+    solve_kenken_bounded(puzzle1, None, -1)
+    check.expect("Tbnd7", "accepted", "ValueError")
+except ValueError:
+    check.expect("Tbnd7", "ValueError", "ValueError")
+'''
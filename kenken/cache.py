@@ -0,0 +1,377 @@
+'''
+A cache of solutions keyed by a canonical puzzle fingerprint.
+'''
+
+import sqlite3  # the on-disk tier of SolutionCache
+from collections import OrderedDict
+from functools import lru_cache
+
+from kenken.puzzle import Guess, Puzzle, puzzle_key
+from kenken.solver import solve_kenken
+
+
+## ******** FINGERPRINTS ***************
+
+## Puzzles which differ only in the naming of their cages, or by a
+## rotation or reflection of the board (including transposes), have the
+## same solutions up to that same rotation or reflection. fingerprint
+## picks one canonical form for all of them: each of the 8 symmetries of
+## the square is applied, cages are renamed by order of first appearance,
+## and the smallest resulting string is kept. Solutions are stored in the
+## canonical orientation and turned back for each caller.
+
+
+def transform(t, x, y, n):
+    '''
+    Returns the position that (x, y) moves to on an n by n board under
+    symmetry t: t % 4 quarter turns, after a left-right flip if t >= 4.
+
+    transform: Nat Nat Nat Nat -> (tuple Nat Nat)
+    Requires: 0 <= t < 8
+
+    Examples:
+       transform(0, 1, 2, 4) => (1, 2)
+       transform(1, 1, 2, 4) => (1, 1)
+       transform(4, 1, 2, 4) => (2, 2)
+    '''
+    if t >= 4:
+        x = n - 1 - x
+    for k in range(t % 4):
+        x, y = n - 1 - y, x
+    return (x, y)
+
+
+@lru_cache(maxsize=None)
+def symmetry_order(t, n):
+    '''
+    Returns the positions (x, y) of an n by n board listed in the row
+    major order of the places symmetry t moves them to.
+
+    symmetry_order: Nat Nat -> (tupleof (tuple Nat Nat))
+    Requires: 0 <= t < 8
+
+    Example:
+       symmetry_order(1, 2) => ((0, 1), (0, 0), (1, 1), (1, 0))
+    '''
+    order = [None] * (n * n)
+    for y in range(n):
+        for x in range(n):
+            x2, y2 = transform(t, x, y, n)
+            order[y2 * n + x2] = (x, y)
+    return tuple(order)
+
+
+def canonical_form(puz, t):
+    '''
+    Returns the string describing puz after symmetry t with its cages
+    renamed 0, 1, 2, ... in order of first appearance (row by row).
+
+    canonical_form: Puzzle Nat -> Str
+    Requires: 0 <= t < 8
+
+    Example:
+       canonical_form(Puzzle(2, [['a', 'b'], ['a', 1]],
+                             [['a', 3, '+'], ['b', 2, '=']]), 0)
+          => '2|c0 c1 c0 =1|3+ 2='
+    '''
+    n = puz.size
+    board = puz.board
+    names = {}
+    cells = []
+    for x, y in symmetry_order(t, n):
+        item = board[y][x]
+        symbol = item.symbol if isinstance(item, Guess) else item
+        if isinstance(symbol, str) and symbol not in names:
+            names[symbol] = len(names)
+        if isinstance(item, Guess):
+            cells.append('g' + str(names[symbol]) + ':' + str(item.number))
+        elif isinstance(item, str):
+            cells.append('c' + str(names[item]))
+        else:
+            cells.append('=' + str(item))
+    rules = [None] * len(names)
+    extra = []
+    for symbol, target, op in puz.constraints:
+        if symbol in names:
+            rules[names[symbol]] = str(target) + op
+        else:
+            extra.append(str(target) + op)
+    rules = [rule or '?' for rule in rules] + sorted(extra)
+    return str(n) + '|' + ' '.join(cells) + '|' + ' '.join(rules)
+
+
+def fingerprint(puz):
+    '''
+    Returns the canonical fingerprint of puz and the symmetry which turns
+    puz into the canonical orientation. Puzzles with the same cages up to
+    renaming, rotation and reflection have the same fingerprint.
+
+    fingerprint: Puzzle -> (list Str Nat)
+
+    Example:
+       fingerprint(puzzle1)[0] == fingerprint(
+          Puzzle(4, [['c', 'b', 'b', 'a'], ['e', 'e', 'd', 'a'],
+                     ['g', 'g', 'd', 'f'], ['i', 'i', 'h', 'f']],
+                 [['a', 6, '*'], ['b', 3, '-'], ['c', 3, '='],
+                  ['d', 5, '+'], ['e', 3, '-'], ['f', 3, '-'],
+                  ['g', 2, '/'], ['h', 4, '='], ['i', 1, '-']]))[0]
+          => True
+    '''
+    best = None
+    best_t = 0
+    for t in range(8):
+        form = canonical_form(puz, t)
+        if best == None or form < best:
+            best = form
+            best_t = t
+    return [best, best_t]
+
+
+def encode_solution(sol, t):
+    '''
+    Returns the numbers of the solved board of sol, after symmetry t,
+    as one comma separated string in row major order.
+
+    encode_solution: Puzzle Nat -> Str
+
+    Example:
+       encode_solution(Puzzle(2, [[1, 2], [2, 1]], []), 4) => '2,1,1,2'
+    '''
+    cells = []
+    for x, y in symmetry_order(t, sol.size):
+        cells.append(sol.board[y][x])
+    return ','.join(map(str, cells))
+
+
+def decode_solution(text, t, n):
+    '''
+    Returns the solved Puzzle of size n whose encode_solution under
+    symmetry t is text.
+
+    decode_solution: Str Nat Nat -> Puzzle
+
+    Example:
+       decode_solution('2,1,1,2', 4, 2) => Puzzle(2, [[1, 2], [2, 1]], [])
+    '''
+    board = []
+    for i in range(n):
+        board.append([0] * n)
+    cells = text.split(',')
+    order = symmetry_order(t, n)
+    for k in range(n * n):
+        x, y = order[k]
+        board[y][x] = int(cells[k])
+    return Puzzle(n, board, [])
+
+
+## ******** SOLUTION CACHE ***************
+
+
+class SolutionCache:
+    '''
+    Fields:
+       capacity (Nat)
+       memory (OrderedDict of Str to (anyof Str None))
+       prints (OrderedDict of Any to (list Str Nat))
+       db (anyof sqlite3.Connection None)
+       hits (Nat)
+       misses (Nat)
+       Requires:
+          memory maps fingerprints to encoded solutions (None for a
+            puzzle with no solution), least recently used first, and
+            holds at most capacity entries.
+          prints maps the puzzle_key of recently seen puzzles to their
+            fingerprint, so exact repeats skip fingerprint; it also
+            holds at most capacity entries.
+          db, if not None, holds every entry ever added, in the table
+            solutions(fingerprint, solution).
+    '''
+
+    def __init__(self, capacity=1024, path=None):
+        '''
+        Initializes a SolutionCache holding up to capacity solutions in
+        memory, backed by the sqlite database file path if it is given.
+
+        Effects: Mutates self, may create a file
+
+        __init__: SolutionCache Nat (anyof Str None) -> None
+        '''
+        self.capacity = capacity
+        self.memory = OrderedDict()
+        self.prints = OrderedDict()
+        self.db = None
+        self.hits = 0
+        self.misses = 0
+        if path != None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS solutions "
+                            "(fingerprint TEXT PRIMARY KEY, solution TEXT)")
+
+    def __repr__(self):
+        '''
+        Returns a string representation of self.
+
+        __repr__: SolutionCache -> Str
+        '''
+        return "SolutionCache({0} in memory, hits={1}, misses={2})".format(
+            len(self.memory), self.hits, self.misses)
+
+    def __enter__(self):
+        '''
+        Returns self, for use in a with statement.
+
+        __enter__: SolutionCache -> SolutionCache
+        '''
+        return self
+
+    def __exit__(self, *exc):
+        '''
+        Closes self at the end of a with statement.
+
+        Effects: Mutates self
+
+        __exit__: SolutionCache Any -> None
+        '''
+        self.close()
+
+    def remember(self, key, text):
+        '''
+        Stores the encoded solution text for fingerprint key in memory,
+        evicting the least recently used entry if memory is full.
+
+        Effects: Mutates self
+
+        remember: SolutionCache Str (anyof Str None) -> None
+        '''
+        self.memory[key] = text
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def fingerprint(self, puz):
+        '''
+        Returns fingerprint(puz), remembering it for exact repeats of puz.
+
+        Effects: Mutates self
+
+        fingerprint: SolutionCache Puzzle -> (list Str Nat)
+        '''
+        key = puzzle_key(puz)
+        if key in self.prints:
+            self.prints.move_to_end(key)
+            return self.prints[key]
+        found = fingerprint(puz)
+        self.prints[key] = found
+        if len(self.prints) > self.capacity:
+            self.prints.popitem(last=False)
+        return found
+
+    def get(self, puz):
+        '''
+        Returns the cached solution of puz in puz's own orientation, False
+        if puz is known to have no solution, or None if puz (and every
+        puzzle with its fingerprint) has not been cached.
+
+        Effects: Mutates self
+
+        get: SolutionCache Puzzle -> (anyof Puzzle False None)
+        '''
+        key, t = self.fingerprint(puz)
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            text = self.memory[key]
+        elif self.db != None:
+            row = self.db.execute("SELECT solution FROM solutions "
+                                  "WHERE fingerprint = ?", (key,)).fetchone()
+            if row == None:
+                self.misses += 1
+                return None
+            text = row[0]
+            self.remember(key, text)
+        else:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if text == None:
+            return False
+        return decode_solution(text, t, puz.size)
+
+    def put(self, puz, sol):
+        '''
+        Adds sol, the solution of puz (False if it has none), to self.
+
+        Effects: Mutates self, may write to a file
+
+        put: SolutionCache Puzzle (anyof Puzzle False) -> None
+        '''
+        key, t = self.fingerprint(puz)
+        text = None
+        if sol != False:
+            text = encode_solution(sol, t)
+        self.remember(key, text)
+        if self.db != None:
+            self.db.execute("INSERT OR REPLACE INTO solutions "
+                            "VALUES (?, ?)", (key, text))
+            self.db.commit()
+
+    def solve(self, puz, solver=solve_kenken):
+        '''
+        Returns the solution of puz (False if it has none), from self if
+        it is cached, and otherwise by solver, adding it to self.
+
+        Effects: Mutates self
+
+        solve: SolutionCache Puzzle (Puzzle -> (anyof Puzzle False))
+               -> (anyof Puzzle False)
+
+        Example:
+           SolutionCache().solve(puzzle1) => puzzle1soln
+        '''
+        sol = self.get(puz)
+        if sol == None:
+            sol = solver(puz)
+            if sol != False:
+                sol = Puzzle(sol.size, sol.board, [])
+            self.put(puz, sol)
+        return sol
+
+    def close(self):
+        '''
+        Closes the database behind self, if there is one.
+
+        Effects: Mutates self
+
+        close: SolutionCache -> None
+        '''
+        if self.db != None:
+            self.db.close()
+            self.db = None
+
+
+'''
+check.expect("Tfp1", transform(3, *transform(1, 1, 2, 4), 4), (1, 2))
+check.expect("Tfp2", fingerprint(puzzle1)[0], fingerprint(Puzzle(4,
+    [['A', 'A', 'F', 'F'], ['B', 'D', 'D', 'H'], ['B', 'E', 'G', 'I'],
+     ['C', 'E', 'G', 'I']],
+    [['A', 6, '*'], ['B', 3, '-'], ['C', 3, '='], ['D', 5, '+'],
+     ['E', 3, '-'], ['F', 3, '-'], ['G', 2, '/'], ['H', 4, '='],
+     ['I', 1, '-']]))[0])
+check.expect("Tfp3", fingerprint(puzzle1)[0] == fingerprint(puzzle2a)[0],
+             False)
+check.expect("Tcache1", SolutionCache().solve(puzzle1), puzzle1soln)
+cache = SolutionCache(capacity=1)
+cache.put(puzzle1, puzzle1soln)
+check.expect("Tcache2", cache.get(puzzle1), puzzle1soln)
+check.expect("Tcache3", cache.get(puzzle1partial4a), None)
+cache.put(puzzle1partial4a, False)
+check.expect("Tcache4", cache.get(puzzle1), None)
+check.expect("Tcache5", cache.get(puzzle1partial4a), False)
+cache.put(puzzle1, puzzle1soln)
+check.expect("Tcache6", cache.get(Puzzle(4,
+    [['A', 'A', 'F', 'F'], ['B', 'D', 'D', 'H'], ['B', 'E', 'G', 'I'],
+     ['C', 'E', 'G', 'I']],
+    [['A', 6, '*'], ['B', 3, '-'], ['C', 3, '='], ['D', 5, '+'],
+     ['E', 3, '-'], ['F', 3, '-'], ['G', 2, '/'], ['H', 4, '='],
+     ['I', 1, '-']])),
+    Puzzle(4, [[2, 3, 4, 1], [1, 2, 3, 4], [4, 1, 2, 3], [3, 4, 1, 2]], []))
+'''
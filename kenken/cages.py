@@ -0,0 +1,81 @@
+'''
+Search that fills in a whole cage per step: solve_kenken_cages.
+'''
+
+import copy  # copies nested list to avoid mutating the consumed lists
+
+from kenken.ordering import ORDERINGS, reorder_constraints
+from kenken.puzzle import Puzzle, puzzle_key
+from kenken.tables import cage_assignments
+
+
+def cage_neighbours(puz, order=None):
+    '''
+    Returns a list of next puzzles after puz, where the whole cage of
+    the first constraint (or of the constraint order picks, if order is
+    given) is filled in at once. There is one puzzle for each of its
+    cage_assignments; in each, the cage's cells hold numbers and its
+    constraint is removed, as after apply_guess.
+
+    cage_neighbours: Puzzle (anyof Ordering None) -> (listof Puzzle)
+
+    Examples:
+       cage_neighbours(puzzle1soln) => []
+       cage_neighbours(puzzle2a) => [puzzle2b]
+    '''
+    if len(puz.constraints) == 0:
+        return []
+    if order != None:
+        puz = reorder_constraints(puz, order)
+    cells, fits = cage_assignments(puz, 0)
+    puzzles = []
+    for vals in fits:
+        board = [row[:] for row in puz.board]
+        for i in range(len(cells)):
+            board[cells[i].y][cells[i].x] = vals[i]
+        puzzles.append(Puzzle(puz.size, board,
+                              copy.deepcopy(puz.constraints[1:]),
+                              puz.cages))
+    return puzzles
+
+
+def solve_kenken_cages(orig, order=None):
+    '''
+    Finds the solution to a KenKen puzzle, orig, or returns False
+    if there is no solution. Searches like solve_kenken, but uses
+    cage_neighbours to fill in a whole cage per step. order is as
+    for solve_kenken.
+
+    solve_kenken_cages: Puzzle (anyof Ordering Str None)
+                        -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_cages(puzzle1) => puzzle1soln
+    '''
+    if isinstance(order, str):
+        order = ORDERINGS[order]
+    to_visit = [(puzzle_key(orig), orig)]
+    visited = set()
+    while to_visit != []:
+        key, puz = to_visit.pop()
+        if len(puz.constraints) == 0:
+            return puz
+        elif key not in visited:
+            visited.add(key)
+            new = []
+            for nbr in cage_neighbours(puz, order):
+                nbr_key = puzzle_key(nbr)
+                if nbr_key not in visited:
+                    new.append((nbr_key, nbr))
+            new.reverse()
+            to_visit.extend(new)
+    return False
+
+
+'''
+check.expect("Ttab3", cage_neighbours(puzzle2a), [puzzle2b])
+check.expect("Ttab4", len(cage_neighbours(puzzle1)), 2)
+check.expect("Ttab5", solve_kenken_cages(puzzle1), puzzle1soln)
+check.expect("Ttab6", solve_kenken_cages(puzzle1partial4a), False)
+check.expect("Ttab7", solve_kenken_cages(puzzle1partial4b), puzzle1soln)
+'''
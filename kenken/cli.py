@@ -0,0 +1,203 @@
+'''
+The command line interface, run by python -m kenken.
+'''
+
+import argparse
+import json
+import os
+import sys
+
+from kenken.batch import (BATCH_ENGINES, ENGINES, iter_batch,
+                          iter_batch_stacked, print_entry, puzzle_files,
+                          save_solution, solve_stream, write_result)
+from kenken.fileio import FORMATS, SolutionWriter, read_puzzle
+from kenken.ordering import ORDERINGS
+
+
+def main(argv=None):
+    '''
+    Runs the command line interface: solves every puzzle file named on
+    the command line (see puzzle_files) in this one process, printing a
+    timing line for each. With no puzzle files, solves seven.txt and
+    prints the solved Puzzle.
+
+    Effects: Reads from and writes to files, prints to the screen
+
+    main: (anyof (listof Str) None) -> Nat
+    '''
+    parser = argparse.ArgumentParser(
+        description="Solve KenKen puzzles in the read_puzzle format.")
+    parser.add_argument("sources", nargs="*",
+                        help="puzzle files, directories or glob patterns")
+    parser.add_argument("-m", "--manifest",
+                        help="file listing one puzzle file per line")
+    parser.add_argument("-s", "--stream", metavar="FILE",
+                        help="solve every puzzle in FILE, which holds "
+                             "any number of them (- for standard input)")
+    parser.add_argument("-o", "--out-dir",
+                        help="write each solution here with print_sol")
+    parser.add_argument("-r", "--results",
+                        help="write all solutions and timings to this file")
+    parser.add_argument("--solutions", metavar="FILE",
+                        help="append every solution to FILE (- for "
+                             "standard output, which sends the timing "
+                             "lines to standard error) in --format")
+    parser.add_argument("--format", choices=FORMATS, default="text",
+                        help="format of --solutions")
+    parser.add_argument("--gzip", action="store_true",
+                        help="compress --solutions with gzip")
+    parser.add_argument("-e", "--engine", choices=sorted(ENGINES),
+                        default="search", help="solver to use")
+    parser.add_argument("--order", choices=sorted(ORDERINGS),
+                        help="cage ordering (search, bounded and cages "
+                             "engines)")
+    parser.add_argument("--max-visited", type=int, metavar="N",
+                        help="keep at most N visited puzzles (bounded "
+                             "engine; default none)")
+    parser.add_argument("--sat-solver", metavar="CMD",
+                        help="SAT solver program to run (sat engine; "
+                             "default the built in one)")
+    parser.add_argument("--stack", type=int, metavar="N",
+                        help="solve N puzzle files at a time in one "
+                             "stacked call (vector engine, without "
+                             "--jobs, --stream or --cache)")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="solve in this many worker processes")
+    parser.add_argument("--chunksize", type=int, default=4,
+                        help="puzzle files sent to a worker at a time")
+    parser.add_argument("--timeout", type=float,
+                        help="seconds allowed per puzzle (with --jobs, "
+                             "without --split)")
+    parser.add_argument("--split", type=int, metavar="DEPTH",
+                        help="solve each puzzle's subtrees below DEPTH "
+                             "in parallel (with --jobs)")
+    parser.add_argument("--cache", metavar="DB",
+                        help="reuse solutions stored in this sqlite file "
+                             "(without --jobs, or with --split)")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="write the search statistics of each puzzle "
+                             "to FILE (- for standard error) as JSON lines "
+                             "(search engine, without --jobs)")
+    args = parser.parse_args(argv)
+    if args.order != None and \
+       args.engine not in ("search", "bounded", "cages"):
+        parser.error("--order needs the search, bounded or cages engine")
+    if args.max_visited != None and (args.engine != "bounded" or
+                                     args.jobs != None):
+        parser.error("--max-visited needs the bounded engine, without "
+                     "--jobs")
+    if args.max_visited != None and args.max_visited < 0:
+        parser.error("--max-visited needs a number that is not negative")
+    if args.sat_solver != None and (args.engine != "sat" or
+                                    args.jobs != None):
+        parser.error("--sat-solver needs the sat engine, without --jobs")
+    if args.stack != None and (args.engine not in BATCH_ENGINES or
+                               args.jobs != None or args.stream != None or
+                               args.cache != None):
+        parser.error("--stack needs the vector engine (and NumPy), "
+                     "without --jobs, --stream or --cache")
+    if args.stack != None and args.stack < 1:
+        parser.error("--stack needs a positive N")
+    if args.split != None and args.jobs == None:
+        parser.error("--split needs --jobs")
+    pooled = args.jobs != None and args.split == None
+    if args.timeout != None and not pooled:
+        parser.error("--timeout needs --jobs (without --split)")
+    if args.cache != None and pooled:
+        parser.error("--cache cannot be used with --jobs alone")
+    if args.stream != None and pooled:
+        parser.error("--stream cannot be used with --jobs alone")
+    if args.stats != None and (args.engine != "search" or
+                               args.jobs != None):
+        parser.error("--stats needs the search engine, without --jobs")
+
+    solver = ENGINES[args.engine]
+    if args.order != None:
+        engine = solver
+        solver = lambda puz: engine(puz, args.order)
+    if args.max_visited != None:
+        from kenken.bounded import solve_kenken_bounded
+        solver = lambda puz: solve_kenken_bounded(puz, args.order,
+                                                  args.max_visited)
+    if args.sat_solver != None:
+        from kenken.sat import solve_kenken_sat
+        solver = lambda puz: solve_kenken_sat(puz, args.sat_solver)
+    ## last holds the SolveStats of the puzzle just solved, if any
+    last = [None]
+    if args.stats != None:
+        from kenken.solver import solve_kenken
+        from kenken.stats import SolveStats
+
+        def solver(puz):
+            last[0] = SolveStats()
+            return solve_kenken(puz, args.order, last[0])
+    if args.split != None:
+        from kenken.parallel import solve_kenken_parallel
+        solver = lambda puz: solve_kenken_parallel(
+            puz, args.split, args.jobs, args.engine, args.order)
+    cache = None
+    if args.cache != None:
+        from kenken.cache import SolutionCache
+        cache = SolutionCache(path=args.cache)
+        uncached = solver
+        solver = lambda puz: cache.solve(puz, uncached)
+
+    if args.stream != None:
+        entries = solve_stream(args.stream, solver)
+    else:
+        files = puzzle_files(args.sources, args.manifest)
+        if files == []:
+            if not os.path.exists("seven.txt"):
+                parser.error("no puzzle files given (and no seven.txt)")
+            print(solver(read_puzzle("seven.txt")))
+            return 0
+        if pooled:
+            from kenken.parallel import solve_pool
+            entries = solve_pool(files, args.engine, args.order, args.jobs,
+                                 args.chunksize, args.timeout)
+        elif args.stack != None:
+            entries = iter_batch_stacked(files, BATCH_ENGINES[args.engine],
+                                         args.stack)
+        else:
+            entries = iter_batch(files, solver)
+
+    if args.out_dir != None:
+        os.makedirs(args.out_dir, exist_ok=True)
+    results = None
+    if args.results != None:
+        results = open(args.results, "w")
+    writer = None
+    if args.solutions != None:
+        writer = SolutionWriter(args.solutions, args.format, args.gzip)
+    ## the timing lines go to standard error when the solutions take
+    ## standard output
+    status_out = sys.stderr if args.solutions == "-" else None
+    stats_out = None
+    if args.stats == "-":
+        stats_out = sys.stderr
+    elif args.stats != None:
+        stats_out = open(args.stats, "w")
+    for entry in entries:
+        if args.out_dir != None:
+            save_solution(entry, args.out_dir)
+        if results != None:
+            write_result(results, entry)
+        if writer != None:
+            sol = entry[1]
+            ## a timeout or an error is not a puzzle with no solution
+            writer.write(None if isinstance(sol, str) else sol)
+        if stats_out != None and last[0] != None:
+            record = last[0].as_dict()
+            record['name'] = entry[0]
+            stats_out.write(json.dumps(record) + "\n")
+            last[0] = None
+        print_entry(entry, status_out)
+    if results != None:
+        results.close()
+    if writer != None:
+        writer.close()
+    if stats_out != None and stats_out != sys.stderr:
+        stats_out.close()
+    if cache != None:
+        cache.close()
+    return 0
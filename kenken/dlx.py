@@ -0,0 +1,208 @@
+'''
+KenKen as an exact cover problem, solved with Algorithm X:
+solve_kenken_dlx.
+'''
+
+from kenken.flat import (NO_CAGE, FlatPuzzle, flatten_puzzle,
+                         unflatten_puzzle)
+from kenken.propagate import cage_groups, initial_domains
+from kenken.tables import cage_clashes, cage_tuples, tuple_fits
+
+
+## ******** EXACT COVER ENGINE ***************
+
+## A solved board is an exact cover: choose, for every cage, one way of
+## filling it (a tuple from cage_tuples), such that
+##   ('cage', i)       cage i is filled exactly once, and
+##   ('row', y, v)     every number v is in row y exactly once, and
+##   ('col', x, v)     every number v is in column x exactly once,
+## where these are the columns of the matrix and each way of filling a
+## cage is a row covering its cage's column, and one 'row' and one 'col'
+## column for each of its cells. Numbers already filled in cover their
+## row and column columns before the search starts, so those columns are
+## left out, and so are the ways of filling a cage that would repeat
+## them.
+##
+## The matrix is kept as Knuth's Algorithm X with dictionaries of sets
+## in place of dancing links: a Matrix is a (list X Y) where X maps each
+## column still to be covered to the set of rows covering it, and Y maps
+## each row to the list of its columns. Removing and restoring the sets
+## plays the part of unlinking and relinking the nodes.
+##
+## A Choice is a (list Nat (tupleof Nat)), [cage, vals]: the row filling
+## the cells of cage number cage (in cage_groups order) with vals.
+
+
+def exact_cover_matrix(fp, table=None):
+    '''
+    Returns [X, Y, choices] for fp as described above, where choices
+    lists the Choice each row number stands for. If table is given, the
+    ways of filling each cage are looked up in it, and added to it when
+    they are not there, keyed by the cage's rule, cells and domains, so
+    that building the matrix again after a small change to the puzzle
+    only lists the ways of filling the cages the change affected.
+
+    Effects: Mutates table, if it is given
+
+    exact_cover_matrix: FlatPuzzle (anyof (dictof Any (listof (tupleof Nat)))
+                                          None)
+                        -> (list (dictof Any (setof Nat))
+                                 (dictof Nat (listof Any)) (listof Choice))
+
+    Example:
+       len(exact_cover_matrix(flatten_puzzle(puzzle1))[2]) => 24
+    '''
+    n = fp.size
+    domains = initial_domains(fp)
+    groups = cage_groups(fp)
+    X = {}
+    for y in range(n):
+        for v in range(1, n + 1):
+            X[('row', y, v)] = set()
+            X[('col', y, v)] = set()
+    for k in range(n * n):
+        if fp.cages[k] == NO_CAGE:
+            v = fp.cells[k]
+            X.pop(('row', k // n, v), None)
+            X.pop(('col', k % n, v), None)
+    ## the domain of a blank cell leaves out the numbers filled in
+    ## elsewhere in its row or column
+    for k in range(n * n):
+        if fp.cages[k] != NO_CAGE:
+            for v in range(1, n + 1):
+                if ('row', k // n, v) not in X or ('col', k % n, v) not in X:
+                    domains[k] &= ~(1 << v)
+    Y = {}
+    choices = []
+    for i in range(len(groups)):
+        op, target, cells = groups[i]
+        X[('cage', i)] = set()
+        doms = [domains[k] for k in cells]
+        key = (op, target, tuple(cells), tuple(doms))
+        if table != None and key in table:
+            fits = table[key]
+        else:
+            clashes = cage_clashes(cells, n)
+            fits = [vals for vals in cage_tuples(op, target, len(cells), n)
+                    if tuple_fits(vals, doms, clashes)]
+            if table != None:
+                table[key] = fits
+        for vals in fits:
+            r = len(choices)
+            choices.append([i, vals])
+            Y[r] = [('cage', i)]
+            for j in range(len(cells)):
+                Y[r].append(('row', cells[j] // n, vals[j]))
+                Y[r].append(('col', cells[j] % n, vals[j]))
+            for col in Y[r]:
+                X[col].add(r)
+    return [X, Y, choices]
+
+
+def cover(X, Y, r):
+    '''
+    Selects row r: removes every column r covers from X, and every row
+    sharing one of them from the other columns, and returns the removed
+    columns' sets in order, for uncover.
+
+    Effects: Mutates X
+
+    cover: (dictof Any (setof Nat)) (dictof Nat (listof Any)) Nat
+           -> (listof (setof Nat))
+    '''
+    removed = []
+    for col in Y[r]:
+        for other in X[col]:
+            for col2 in Y[other]:
+                if col2 != col:
+                    X[col2].remove(other)
+        removed.append(X.pop(col))
+    return removed
+
+
+def uncover(X, Y, r, removed):
+    '''
+    Undoes cover(X, Y, r), which returned removed.
+
+    Effects: Mutates X, removed
+
+    uncover: (dictof Any (setof Nat)) (dictof Nat (listof Any)) Nat
+             (listof (setof Nat)) -> None
+    '''
+    for col in reversed(Y[r]):
+        X[col] = removed.pop()
+        for other in X[col]:
+            for col2 in Y[other]:
+                if col2 != col:
+                    X[col2].add(other)
+
+
+def algorithm_x(X, Y, partial):
+    '''
+    Produces every list of rows which, added to partial, exactly covers
+    the columns of X. The same list is changed between solutions, so it
+    must be copied to be kept.
+
+    Effects: Mutates X and partial while running (both are restored)
+
+    algorithm_x: (dictof Any (setof Nat)) (dictof Nat (listof Any))
+                 (listof Nat) -> (generatorof (listof Nat))
+    '''
+    if X == {}:
+        yield partial
+        return
+    ## the column with the fewest rows left is covered next
+    col = min(X, key=lambda c: len(X[c]))
+    for r in sorted(X[col]):
+        partial.append(r)
+        removed = cover(X, Y, r)
+        yield from algorithm_x(X, Y, partial)
+        uncover(X, Y, r, removed)
+        partial.pop()
+
+
+def solve_kenken_dlx(orig, table=None):
+    '''
+    Finds a solution to a KenKen puzzle, orig, by exact cover, or returns
+    False if there is no solution. table, if given, is passed on to
+    exact_cover_matrix.
+
+    Effects: Mutates table, if it is given
+
+    solve_kenken_dlx: Puzzle (anyof (dictof Any (listof (tupleof Nat))) None)
+                      -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_dlx(puzzle1) => puzzle1soln
+    '''
+    fp = flatten_puzzle(orig)
+    X, Y, choices = exact_cover_matrix(fp, table)
+    groups = cage_groups(fp)
+    for rows in algorithm_x(X, Y, []):
+        cells = fp.cells[:]
+        for r in rows:
+            i, vals = choices[r]
+            for j in range(len(vals)):
+                cells[groups[i][2][j]] = vals[j]
+        return unflatten_puzzle(FlatPuzzle(fp.size, cells, fp.cages,
+                                           fp.constraints,
+                                           len(fp.constraints)))
+    return False
+
+
+'''
+check.expect("Tdlx1", solve_kenken_dlx(puzzle1), puzzle1soln)
+check.expect("Tdlx2", solve_kenken_dlx(puzzle1partial), puzzle1soln)
+check.expect("Tdlx3", solve_kenken_dlx(puzzle1partial3), puzzle1soln)
+check.expect("Tdlx4", solve_kenken_dlx(puzzle1partial4a), False)
+check.expect("Tdlx5", solve_kenken_dlx(puzzle1soln), puzzle1soln)
+X, Y, choices = exact_cover_matrix(flatten_puzzle(puzzle1))
+check.expect("Tdlx6", len(list(algorithm_x(X, Y, []))), 1)
+check.expect("Tdlx7", len(X), 41)
+table = {}
+check.expect("Tdlx8", solve_kenken_dlx(puzzle1partial, table), puzzle1soln)
+check.expect("Tdlx9", len(table), len(puzzle1partial.constraints))
+check.expect("Tdlx10", len(exact_cover_matrix(flatten_puzzle(puzzle1partial),
+                                              table)[2]),
+             len(exact_cover_matrix(flatten_puzzle(puzzle1partial))[2]))
+'''
@@ -0,0 +1,600 @@
+'''
+Reading puzzles from and writing solutions to files.
+'''
+
+import gzip  # optional compression of SolutionWriter output
+import sys
+
+from kenken.puzzle import Puzzle
+
+
+# part a)
+
+def read_puzzle(fname):
+    '''
+    Reads information from fname file and
+    returns the info as a Puzzle value.
+    Blank lines are ignored. Raises MalformedPuzzle, naming the line,
+    if fname is not in the format below.
+
+    Effects: Reads from a file
+
+    read_puzzle: Str -> Puzzle
+    Requires: a file named fname exists and represents a puzzle as described
+              in the project specification.
+
+
+    Example:
+       Assume inp1836.txt contains:
+       4
+       a b b c
+       a d e e
+       f d g g
+       f h i i
+       a 6 *
+       b 3 -
+       c 3 =
+       d 5 +
+       e 3 -
+       f 3 -
+       g 2 /
+       h 4 =
+       i 1 -
+       then read_puzzle("inp1836.txt") =>
+            Puzzle(4, [['a','b','b','c'],
+                       ['a','d','e','e'],
+                       ['f','d','g','g'],
+                       ['f','h','i','i']],
+                      [['a', 6,'*'],
+                       ['b',3,'-'],
+                       ['c',3,'='],
+                       ['d',5,'+'],
+                       ['e',3,'-'],
+                       ['f',3, '-'],
+                       ['g',2,'/'],
+                       ['h',4,'='],
+                       ['i',1,'-']])
+    '''
+    record = []
+    with open(fname, "r") as f:
+        for lineno, line in enumerate(f, 1):
+            if line.strip() != "":
+                record.append([lineno, line])
+    return parse_record(record)
+
+
+'''  
+test1 = read_puzzle("inp1836.txt")
+check.expect("Ta1", test1, puzzle1 )  
+check.expect("Ta1 size", test1.size, puzzle1.size) 
+check.expect("Ta1 board", test1.board, puzzle1.board) 
+check.expect("Ta1 constraints", test1.constraints, puzzle1.constraints) 
+'''
+
+
+class MalformedPuzzle(ValueError):
+    '''
+    Raised for a puzzle record which is not in the read_puzzle format.
+
+    Fields:
+       lineno (Nat)
+       reason (Str)
+    '''
+
+    def __init__(self, lineno, reason):
+        '''
+        Initializes a MalformedPuzzle for a problem, reason, found at
+        line lineno.
+
+        Effects: Mutates self
+
+        __init__: MalformedPuzzle Nat Str -> None
+        '''
+        ValueError.__init__(self, "line {0}: {1}".format(lineno, reason))
+        self.lineno = lineno
+        self.reason = reason
+
+
+def cage_problem(board, constraints):
+    '''
+    Returns None if the cage symbols in board and the constraints match
+    one to one, and otherwise [i, reason], where reason says what is wrong
+    and i is the index into board of the first row holding a cage with
+    no constraint, or len(board) plus the index into constraints of a
+    constraint naming no cage, or a cage already constrained.
+
+    cage_problem: Board (listof Constraint)
+                  -> (anyof (list Nat Str) None)
+
+    Examples:
+       cage_problem([['a', 'b']], [['a', 1, '=']]) =>
+          [0, "cage b has no constraint"]
+       cage_problem([['a']], [['a', 1, '='], ['a', 1, '=']]) =>
+          [2, "cage a has more than one constraint"]
+    '''
+    symbols = set()
+    for row in board:
+        for item in row:
+            if isinstance(item, str):
+                symbols.add(item)
+    seen = set()
+    for i in range(len(constraints)):
+        symbol = constraints[i][0]
+        if symbol in seen:
+            return [len(board) + i,
+                    "cage {0} has more than one constraint".format(symbol)]
+        if symbol not in symbols:
+            return [len(board) + i,
+                    "there is no cage {0} to constrain".format(symbol)]
+        seen.add(symbol)
+    for y in range(len(board)):
+        for item in board[y]:
+            if isinstance(item, str) and item not in seen:
+                return [y, "cage {0} has no constraint".format(item)]
+    return None
+
+
+def parse_record(record):
+    '''
+    Returns the Puzzle described by record, a list of [lineno, line]
+    pairs holding the non-blank lines of one puzzle in the read_puzzle
+    format, or raises MalformedPuzzle naming the first bad line.
+
+    parse_record: (listof (list Nat Str)) -> Puzzle
+    Requires: record != []
+
+    Example:
+       parse_record([[1, "1"], [2, "a"], [3, "a 1 ="]]) =>
+          Puzzle(1, [['a']], [['a', 1, '=']])
+    '''
+    lineno, line = record[0]
+    try:
+        size = int(line)
+    except ValueError:
+        raise MalformedPuzzle(lineno, "expected the board size")
+    if size <= 0:
+        raise MalformedPuzzle(lineno, "the board size must be positive")
+    if len(record) <= size:
+        raise MalformedPuzzle(record[-1][0], "expected {0} board rows"
+                              .format(size))
+    board = []
+    for lineno, line in record[1:size + 1]:
+        row = line.split()
+        if len(row) != size:
+            raise MalformedPuzzle(lineno, "expected {0} cells".format(size))
+        if not all(len(symbol) == 1 for symbol in row):
+            raise MalformedPuzzle(lineno, "a cage symbol must be a single "
+                                          "character")
+        board.append(row)
+    constraints = []
+    for lineno, line in record[size + 1:]:
+        con = line.split()
+        if len(con) != 3 or len(con[0]) != 1 or \
+           con[2] not in ('+', '-', '*', '/', '='):
+            raise MalformedPuzzle(lineno, "expected a constraint")
+        try:
+            con[1] = int(con[1])
+        except ValueError:
+            raise MalformedPuzzle(lineno, "the target must be a number")
+        constraints.append(con)
+    problem = cage_problem(board, constraints)
+    if problem != None:
+        raise MalformedPuzzle(record[problem[0] + 1][0], problem[1])
+    return Puzzle(size, board, constraints)
+
+
+def report_malformed(err):
+    '''
+    Prints err, a MalformedPuzzle, to standard error.
+
+    Effects: Prints to standard error
+
+    report_malformed: MalformedPuzzle -> None
+    '''
+    print("skipped malformed puzzle: " + str(err), file=sys.stderr)
+
+
+def iter_puzzles(lines, on_error=report_malformed):
+    '''
+    Produces, one at a time, the Puzzles in lines, an iterable of lines
+    (such as an open file) holding any number of puzzles in the
+    read_puzzle format. Puzzles are separated by blank lines or by lines
+    of dashes; a line holding only a number after a puzzle's board also
+    starts a new puzzle. Only the current puzzle's lines are held at a
+    time. A malformed puzzle is skipped after calling on_error with its
+    MalformedPuzzle, so the rest of lines are still read.
+
+    Effects: Reads from lines
+
+    iter_puzzles: (iterableof Str) (MalformedPuzzle -> Any)
+                  -> (generatorof Puzzle)
+
+    Example:
+       list(iter_puzzles(["1", "a", "a 1 =", "", "1", "b", "b 1 ="])) =>
+          [Puzzle(1, [['a']], [['a', 1, '=']]),
+           Puzzle(1, [['b']], [['b', 1, '=']])]
+    '''
+    record = []
+    size = 0
+    for lineno, line in enumerate(lines, 1):
+        text = line.strip()
+        ends = text == "" or text.strip("-") == ""
+        starts = record != [] and len(record) > size + 1 and text.isdigit()
+        if (ends or starts) and record != []:
+            try:
+                puz = parse_record(record)
+            except MalformedPuzzle as err:
+                puz = None
+                on_error(err)
+            record = []
+            if puz != None:
+                yield puz
+        if not ends:
+            if record == []:
+                size = int(text) if text.isdigit() else 0
+            record.append([lineno, text])
+    if record != []:
+        try:
+            puz = parse_record(record)
+        except MalformedPuzzle as err:
+            puz = None
+            on_error(err)
+        if puz != None:
+            yield puz
+
+
+def read_puzzles(fname, on_error=report_malformed):
+    '''
+    Produces the Puzzles in the file fname (or standard input, if fname
+    is "-") one at a time, as iter_puzzles does.
+
+    Effects: Reads from a file
+
+    read_puzzles: Str (MalformedPuzzle -> Any) -> (generatorof Puzzle)
+    '''
+    if fname == "-":
+        yield from iter_puzzles(sys.stdin, on_error)
+        return
+    with open(fname, "r") as f:
+        yield from iter_puzzles(f, on_error)
+
+
+'''
+check.expect("Tstream1", parse_record([[1, "1"], [2, "a"], [3, "a 1 ="]]),
+             Puzzle(1, [['a']], [['a', 1, '=']]))
+errors = []
+check.expect("Tstream2", list(iter_puzzles(
+    ["2", "a b", "a b", "a 2 /", "b 1 -", "---",
+     "2", "a a", "b", "a 3 +",
+     "", "", "1", "c", "c 1 =", "1", "d", "d 1 =", ""], errors.append)),
+    [Puzzle(2, [['a', 'b'], ['a', 'b']], [['a', 2, '/'], ['b', 1, '-']]),
+     Puzzle(1, [['c']], [['c', 1, '=']]),
+     Puzzle(1, [['d']], [['d', 1, '=']])])
+check.expect("Tstream3", [err.lineno for err in errors], [9])
+errors = []
+check.expect("Tstream5", list(iter_puzzles(
+    ["2", "a b", "a c", "a 2 /", "b 1 =", "",
+     "1", "a", "a 1 =", "b 1 =", "",
+     "1", "ab", "ab 1 ="], errors.append)), [])
+check.expect("Tstream6", [[err.lineno, err.reason] for err in errors],
+             [[3, "cage c has no constraint"],
+              [10, "there is no cage b to constrain"],
+              [13, "a cage symbol must be a single character"]])
+'''
+
+
+def format_puzzle(puz):
+    '''
+    Returns puz, a puzzle with no Guesses or filled in cells, as text in
+    the read_puzzle format.
+
+    format_puzzle: Puzzle -> Str
+
+    Example:
+       format_puzzle(Puzzle(1, [['a']], [['a', 1, '=']])) => "1\na\na 1 =\n"
+    '''
+    lines = [str(puz.size)]
+    for row in puz.board:
+        lines.append(" ".join(map(str, row)))
+    for symbol, target, op in puz.constraints:
+        lines.append("{0} {1} {2}".format(symbol, target, op))
+    return "\n".join(lines) + "\n"
+
+
+'''
+check.expect("Tstream4", list(iter_puzzles(format_puzzle(puzzle1)
+                                           .splitlines())), [puzzle1])
+'''
+
+
+# part b)
+#print(read_puzzle("inp1836.txt"))
+
+def print_sol(puz, fname):
+    '''
+    Prints the Puzzle puz in fname file
+
+    Effects: Writes to a file
+
+    print_sol: Puzzle Str -> None
+    Requires: Puzzle is solved.
+
+    Example:
+       puzzle1soln = Puzzle(4,
+          [[2,1,4,3],[3,2,1,4],[4,3,2,1],[1,4,3,2]], [])
+       print_sol(puzzle1soln, "out1.txt") => None
+       and "out1.txt" contains:
+       2  1  4  3
+       3  2  1  4
+       4  3  2  1
+       1  4  3  2
+    '''
+    with open(fname, "w") as f:
+        f.write(format_text(puz))
+
+
+# puz = read_puzzle("inp1836.txt")
+#print_sol(puzzle1soln, "output.txt")
+'''  
+result1.txt should contain:
+2  1  4  3
+3  2  1  4
+4  3  2  1
+1  4  3  2
+'''
+'''
+check.set_file_exact("out1.txt", "result1.txt")
+check.expect("Tb1", print_sol(puzzle1soln, "out1.txt"), None)
+'''
+
+
+## ******** SOLUTION WRITER ***************
+
+## SolutionWriter formats:
+##   "text":   each board as print_sol writes it, followed by a blank
+##             line ("no solution" in place of the board if unsolved)
+##   "line":   one line per board, "<size>:<cells>", with each cell as one
+##             base 36 digit in row major order ("-" if unsolved)
+##   "binary": per board, one byte holding the size, then one byte per
+##             cell in row major order (a single 0 byte if unsolved)
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+FORMATS = ("text", "line", "binary")
+
+
+def format_text(puz):
+    '''
+    Returns the solved board of puz as print_sol writes it.
+
+    format_text: Puzzle -> Str
+    Requires: puz is solved
+
+    Example:
+       format_text(Puzzle(2, [[1, 2], [2, 1]], [])) => "1  2\n2  1\n"
+    '''
+    return "".join(["  ".join(map(str, row)) + "\n" for row in puz.board])
+
+
+## the size byte of a board which was not solved in the binary format,
+## more than any board size (see GUESS_FLAG)
+NOT_SOLVED = 255
+
+
+def encode_board(sol, fmt):
+    '''
+    Returns the bytes for one board in the SolutionWriter format fmt,
+    where sol is a solved Puzzle, False for a puzzle with no solution, or
+    None for one that was not solved (such as after a timeout or an
+    error), which has a marker of its own.
+
+    encode_board: (anyof Puzzle False None) Str -> Bytes
+    Requires: fmt is in FORMATS, sol.size < len(DIGITS) for "line"
+
+    Examples:
+       encode_board(Puzzle(2, [[1, 2], [2, 1]], []), "line") => b"2:1221\n"
+       encode_board(False, "binary") => b"\x00"
+       encode_board(None, "line") => b"?\n"
+    '''
+    if fmt == "text":
+        if sol == None:
+            return b"not solved\n\n"
+        if sol == False:
+            return b"no solution\n\n"
+        return (format_text(sol) + "\n").encode()
+    elif fmt == "line":
+        if sol == None:
+            return b"?\n"
+        if sol == False:
+            return b"-\n"
+        cells = []
+        for row in sol.board:
+            for val in row:
+                cells.append(DIGITS[val])
+        return "{0}:{1}\n".format(sol.size, "".join(cells)).encode()
+    if sol == None:
+        return bytes([NOT_SOLVED])
+    if sol == False:
+        return b"\x00"
+    cells = [sol.size]
+    for row in sol.board:
+        cells.extend(row)
+    return bytes(cells)
+
+
+class SolutionWriter:
+    '''
+    Fields:
+       fmt (Str)
+       out (File)
+       pending (listof Bytes)
+       pending_size (Nat)
+       buffer_size (Nat)
+       owns (Bool)
+       Requires:
+          fmt is one of FORMATS
+          owns is True if out is closed along with self
+          pending holds encoded boards not yet written to out, whose
+            lengths add up to pending_size; they are written in one call
+            once pending_size reaches buffer_size
+    '''
+
+    def __init__(self, fname, fmt="text", compress=False,
+                 buffer_size=1 << 20):
+        '''
+        Initializes a SolutionWriter appending boards in the format fmt
+        to the file fname (standard output if fname is "-"), compressed
+        with gzip if compress is True, in blocks of about buffer_size
+        bytes.
+
+        Effects: Mutates self, creates or truncates a file
+
+        __init__: SolutionWriter Str Str Bool Nat -> None
+        Requires: fmt is one of FORMATS
+        '''
+        self.fmt = fmt
+        self.buffer_size = buffer_size
+        self.pending = []
+        self.pending_size = 0
+        if fname == "-":
+            self.out = sys.stdout.buffer
+            if compress:
+                self.out = gzip.GzipFile(fileobj=self.out, mode="wb")
+        elif compress:
+            self.out = gzip.open(fname, "wb")
+        else:
+            self.out = open(fname, "wb")
+        self.owns = fname != "-" or compress
+
+    def __enter__(self):
+        '''
+        Returns self, for use in a with statement.
+
+        __enter__: SolutionWriter -> SolutionWriter
+        '''
+        return self
+
+    def __exit__(self, *exc):
+        '''
+        Closes self at the end of a with statement.
+
+        Effects: Writes to a file
+
+        __exit__: SolutionWriter Any -> None
+        '''
+        self.close()
+
+    def write(self, sol):
+        '''
+        Appends the board of sol, a solved Puzzle, False or None (see
+        encode_board), to the output.
+
+        Effects: Mutates self, may write to a file
+
+        write: SolutionWriter (anyof Puzzle False None) -> None
+        '''
+        data = encode_board(sol, self.fmt)
+        self.pending.append(data)
+        self.pending_size += len(data)
+        if self.pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        '''
+        Writes every pending board to the output in one call.
+
+        Effects: Mutates self, writes to a file
+
+        flush: SolutionWriter -> None
+        '''
+        if self.pending != []:
+            self.out.write(b"".join(self.pending))
+            self.pending = []
+            self.pending_size = 0
+        self.out.flush()
+
+    def close(self):
+        '''
+        Flushes self and closes its output (unless it is standard output).
+
+        Effects: Mutates self, writes to a file
+
+        close: SolutionWriter -> None
+        '''
+        self.flush()
+        if self.owns:
+            self.out.close()
+
+
+def read_solutions(fname, fmt="text", compress=False):
+    '''
+    Produces, one at a time, the boards written to fname by a
+    SolutionWriter with the same fmt and compress, as solved Puzzles
+    (with no constraints), False for puzzles with no solution, or None
+    for puzzles that were not solved.
+
+    Effects: Reads from a file
+
+    read_solutions: Str Str Bool
+                    -> (generatorof (anyof Puzzle False None))
+    '''
+    opener = gzip.open if compress else open
+    with opener(fname, "rb") as f:
+        if fmt == "binary":
+            while True:
+                head = f.read(1)
+                if head == b"":
+                    return
+                size = head[0]
+                if size == NOT_SOLVED:
+                    yield None
+                    continue
+                cells = f.read(size * size)
+                if size == 0:
+                    yield False
+                else:
+                    yield Puzzle(size, [list(cells[i:i + size]) for i in
+                                        range(0, size * size, size)], [])
+        elif fmt == "line":
+            for line in f:
+                line = line.decode().strip()
+                if line == "?":
+                    yield None
+                elif line == "-":
+                    yield False
+                else:
+                    size, cells = line.split(":")
+                    size = int(size)
+                    vals = [DIGITS.index(c) for c in cells]
+                    yield Puzzle(size, [vals[i:i + size] for i in
+                                        range(0, size * size, size)], [])
+        else:
+            board = []
+            for line in f:
+                line = line.decode().strip()
+                if line == "not solved":
+                    yield None
+                elif line == "no solution":
+                    yield False
+                elif line != "":
+                    board.append(list(map(int, line.split())))
+                elif board != []:
+                    yield Puzzle(len(board), board, [])
+                    board = []
+            if board != []:
+                yield Puzzle(len(board), board, [])
+
+
+'''
+check.expect("Tw1", encode_board(puzzle1soln, "line"),
+             b"4:2143321443211432\\n")
+for fmt in FORMATS:
+    for compress in (False, True):
+        with SolutionWriter("out_w.txt", fmt, compress, 16) as w:
+            w.write(puzzle1soln)
+            w.write(False)
+            w.write(None)
+            w.write(puzzle1soln)
+        check.expect("Tw2 " + fmt, list(read_solutions("out_w.txt", fmt,
+                                                       compress)),
+                     [puzzle1soln, False, None, puzzle1soln])
+'''
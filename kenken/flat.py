@@ -0,0 +1,230 @@
+'''
+The array backed FlatPuzzle board and its search, solve_kenken_flat.
+'''
+
+import copy  # copies nested list to avoid mutating the consumed lists
+from array import array  # compact board storage for the flat engine
+
+from kenken.puzzle import Guess, Puzzle
+from kenken.tables import cage_satisfied
+
+
+## ******** FLAT BOARD ENGINE ***************
+
+## A FlatPuzzle stores the board as one array('b') of cell values instead
+## of a Board. A cell is 0 when blank, the number when filled in, and the
+## number with GUESS_FLAG set when it holds a Guess. The cage each cell
+## belongs to is kept in a separate array of indices into constraints,
+## which (like constraints itself) never changes during a search and is
+## shared by every FlatPuzzle derived from the same puzzle. Expanding a
+## state is therefore a single slice copy of cells.
+
+GUESS_FLAG = 64
+NO_CAGE = -1
+
+
+class FlatPuzzle:
+    '''
+    Fields:
+       size (Nat)
+       cells (array of signed bytes)
+       cages (array of signed bytes)
+       constraints (listof Constraint)
+       first (Nat)
+       Requires:
+          0 < size < GUESS_FLAG
+          len(cells) == len(cages) == size * size
+          cells[y * size + x] is 0 if the cell is blank, n if it is
+            filled in with n, and n | GUESS_FLAG if it holds Guess(s, n)
+          cages[y * size + x] is the index into constraints of the cage
+            of a blank or guessed cell, and NO_CAGE for filled in cells
+          constraints[first:] are the constraints still to be satisfied
+          cages and constraints are never mutated
+    '''
+
+    def __init__(self, size, cells, cages, constraints, first):
+        '''
+        Initializes a FlatPuzzle.
+
+        Effects: Mutates self
+
+        __init__: FlatPuzzle Nat (arrayof Int) (arrayof Int)
+                  (listof Constraint) Nat -> None
+        '''
+        self.size = size
+        self.cells = cells
+        self.cages = cages
+        self.constraints = constraints
+        self.first = first
+
+    def __eq__(self, other):
+        '''
+        Returns True if self and other are equal. False otherwise.
+
+        __eq__: FlatPuzzle Any -> Bool
+        '''
+        return (isinstance(other, FlatPuzzle)) and \
+               self.size == other.size and \
+               self.cells == other.cells and \
+               self.constraints[self.first:] == other.constraints[other.first:]
+
+    def __repr__(self):
+        '''
+        Returns a string representation of self.
+
+        __repr__: FlatPuzzle -> Str
+        '''
+        return "FlatPuzzle({0}, {1}, first={2})".format(
+            self.size, list(self.cells), self.first)
+
+
+def flatten_puzzle(puz):
+    '''
+    Returns the FlatPuzzle corresponding to puz.
+
+    flatten_puzzle: Puzzle -> FlatPuzzle
+    Requires: puz.size < GUESS_FLAG
+
+    Example:
+       flatten_puzzle(puzzle1partial2) =>
+          FlatPuzzle(4, [66, 0, 0, 0, 0, 2, 1, 4, 0, 3, 0, 0, 0, 0, 0, 0],
+                     first=0)
+    '''
+    constraints = copy.deepcopy(puz.constraints)
+    index = {}
+    for i in range(len(constraints)):
+        index[constraints[i][0]] = i
+    cells = array('b', bytes(puz.size * puz.size))
+    cages = array('b', [NO_CAGE]) * (puz.size * puz.size)
+    for y in range(puz.size):
+        for x in range(puz.size):
+            item = puz.board[y][x]
+            k = y * puz.size + x
+            if isinstance(item, Guess):
+                cells[k] = item.number | GUESS_FLAG
+                cages[k] = index[item.symbol]
+            elif isinstance(item, str):
+                cages[k] = index[item]
+            else:
+                cells[k] = item
+    return FlatPuzzle(puz.size, cells, cages, constraints, 0)
+
+
+def unflatten_puzzle(fp):
+    '''
+    Returns the Puzzle corresponding to fp.
+
+    unflatten_puzzle: FlatPuzzle -> Puzzle
+
+    Example:
+       unflatten_puzzle(flatten_puzzle(puzzle1partial2)) => puzzle1partial2
+    '''
+    board = []
+    for y in range(fp.size):
+        row = []
+        for x in range(fp.size):
+            k = y * fp.size + x
+            val = fp.cells[k]
+            if val == 0:
+                row.append(fp.constraints[fp.cages[k]][0])
+            elif val & GUESS_FLAG:
+                row.append(Guess(fp.constraints[fp.cages[k]][0],
+                                 val & ~GUESS_FLAG))
+            else:
+                row.append(val)
+        board.append(row)
+    return Puzzle(fp.size, board, copy.deepcopy(fp.constraints[fp.first:]))
+
+
+def flat_neighbours(fp):
+    '''
+    Returns a list of next puzzles after fp, in the same order as
+    neighbours would return them for unflatten_puzzle(fp). Like
+    neighbours, it lists every candidate: a cage which can no longer
+    be satisfied is only found out once it is full, since unlike
+    solve_kenken the flat engine does not prune with guess_valid.
+
+    flat_neighbours: FlatPuzzle -> (listof FlatPuzzle)
+
+    Example:
+       flat_neighbours(flatten_puzzle(puzzle2a)) =>
+          [flatten_puzzle(puzzle2b)]
+    '''
+    if fp.first == len(fp.constraints):
+        return []
+    n = fp.size
+    cells = fp.cells
+    cage = fp.first
+    pos = NO_CAGE
+    for k in range(n * n):
+        if fp.cages[k] == cage and cells[k] == 0:
+            pos = k
+            break
+    if pos != NO_CAGE:
+        y, x = divmod(pos, n)
+        used = 0
+        for j in range(n):
+            used |= 1 << (cells[y * n + j] & ~GUESS_FLAG)
+            used |= 1 << (cells[j * n + x] & ~GUESS_FLAG)
+        puzzles = []
+        for val in range(1, n + 1):
+            if not used & (1 << val):
+                child = cells[:]
+                child[pos] = val | GUESS_FLAG
+                puzzles.append(FlatPuzzle(n, child, fp.cages,
+                                          fp.constraints, cage))
+        return puzzles
+    nums = []
+    for k in range(n * n):
+        if fp.cages[k] == cage and cells[k] & GUESS_FLAG:
+            nums.append(cells[k] & ~GUESS_FLAG)
+    symbol, target, op = fp.constraints[cage]
+    if not cage_satisfied(op, target, nums):
+        return []
+    child = cells[:]
+    for k in range(n * n):
+        if fp.cages[k] == cage:
+            child[k] &= ~GUESS_FLAG
+    return [FlatPuzzle(n, child, fp.cages, fp.constraints, cage + 1)]
+
+
+def solve_kenken_flat(orig):
+    '''
+    Finds the solution to a KenKen puzzle, orig, or returns False
+    if there is no solution, searching over FlatPuzzle values. Unlike
+    solve_kenken, it does not drop puzzles whose cage can no longer be
+    satisfied (see guess_valid), so it may visit puzzles solve_kenken
+    skips, though in the same relative order.
+
+    solve_kenken_flat: Puzzle -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_flat(puzzle1) => puzzle1soln
+    '''
+    start = flatten_puzzle(orig)
+    to_visit = [start]
+    visited = set()
+    while to_visit != []:
+        fp = to_visit.pop()
+        if fp.first == len(fp.constraints):
+            return unflatten_puzzle(fp)
+        key = (fp.cells.tobytes(), fp.first)
+        if key not in visited:
+            visited.add(key)
+            nbrs = flat_neighbours(fp)
+            nbrs.reverse()
+            to_visit.extend(nbrs)
+    return False
+
+
+'''
+check.expect("Tflat1", unflatten_puzzle(flatten_puzzle(puzzle1partial3)),
+             puzzle1partial3)
+check.expect("Tflat2", flat_neighbours(flatten_puzzle(puzzle2c)), [])
+check.expect("Tflat3", [unflatten_puzzle(p) for p in
+                        flat_neighbours(flatten_puzzle(puzzle1))],
+             puzzle1_first_guess)
+check.expect("Tflat4", solve_kenken_flat(puzzle1), puzzle1soln)
+check.expect("Tflat5", solve_kenken_flat(puzzle1partial4a), False)
+check.expect("Tflat6", solve_kenken_flat(puzzle1partial4b), puzzle1soln)
+'''
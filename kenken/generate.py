@@ -0,0 +1,179 @@
+'''
+Seeded random puzzles: generate_puzzle and generate_corpus.
+'''
+
+import random  # every puzzle comes from its own seeded random.Random
+
+from kenken.puzzle import Puzzle
+
+
+## ******** PUZZLE GENERATOR ***************
+
+## A puzzle is generated in three steps, all driven by one random.Random
+## so the same size and seed always give the same puzzle:
+##   1. a random Latin square (the solution) is made by shuffling the
+##      rows, columns and numbers of the cyclic square;
+##   2. the board is cut into cages of connected cells, each grown from
+##      the first free cell (row by row) to a random size;
+##   3. each cage gets an operator its cells allow and the target that
+##      its numbers in the Latin square give.
+## Puzzles are not checked for having a unique solution.
+
+## SYMBOLS names the cages; there are enough for a 9 by 9 board of single
+## cell cages.
+SYMBOLS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ" \
+          "0123456789!#$%&?@^~<>()[]{}|;:,._"
+
+## CAGE_SIZES is the distribution cage sizes are drawn from (a cage may
+## end up smaller if it runs out of free neighbouring cells).
+CAGE_SIZES = (1, 2, 2, 2, 3, 3, 4)
+
+
+def latin_square(size, rng):
+    '''
+    Returns a random size by size Latin square of the numbers 1 to size,
+    as a list of rows, using the random.Random rng.
+
+    Effects: Mutates rng
+
+    latin_square: Nat random.Random -> (listof (listof Nat))
+
+    Example:
+       latin_square(1, random.Random(0)) => [[1]]
+    '''
+    rows = list(range(size))
+    cols = list(range(size))
+    nums = list(range(1, size + 1))
+    rng.shuffle(rows)
+    rng.shuffle(cols)
+    rng.shuffle(nums)
+    square = []
+    for y in rows:
+        square.append([nums[(y + x) % size] for x in cols])
+    return square
+
+
+def cage_partition(size, rng):
+    '''
+    Returns a list of cages, each a list of (x, y) positions of connected
+    cells, which together cover a size by size board exactly once.
+
+    Effects: Mutates rng
+
+    cage_partition: Nat random.Random -> (listof (listof (tuple Nat Nat)))
+
+    Example:
+       cage_partition(1, random.Random(0)) => [[(0, 0)]]
+    '''
+    taken = set()
+    cages = []
+    for y in range(size):
+        for x in range(size):
+            if (x, y) in taken:
+                continue
+            cage = [(x, y)]
+            taken.add((x, y))
+            want = rng.choice(CAGE_SIZES)
+            while len(cage) < want:
+                free = []
+                for cx, cy in cage:
+                    for nx, ny in ((cx + 1, cy), (cx - 1, cy),
+                                   (cx, cy + 1), (cx, cy - 1)):
+                        if 0 <= nx < size and 0 <= ny < size and \
+                           (nx, ny) not in taken and (nx, ny) not in free:
+                            free.append((nx, ny))
+                if free == []:
+                    break
+                pos = rng.choice(free)
+                cage.append(pos)
+                taken.add(pos)
+            cages.append(cage)
+    return cages
+
+
+def cage_rule(nums, rng):
+    '''
+    Returns an [operator, target] pair satisfied by nums, the numbers of
+    one cage, choosing at random among the operators that suit it.
+
+    Effects: Mutates rng
+
+    cage_rule: (listof Nat) random.Random -> (list Str Nat)
+
+    Examples:
+       cage_rule([3], random.Random(0)) => ['=', 3]
+       cage_rule([2, 4], rng) is one of ['-', 2], ['/', 2], ['+', 6], ['*', 8]
+    '''
+    if len(nums) == 1:
+        return ['=', nums[0]]
+    prod = 1
+    for num in nums:
+        prod *= num
+    rules = [['+', sum(nums)], ['*', prod]]
+    if len(nums) == 2:
+        big = max(nums)
+        small = min(nums)
+        rules.append(['-', big - small])
+        if big % small == 0:
+            rules.append(['/', big // small])
+    return rng.choice(rules)
+
+
+def generate_puzzle(size, seed=0):
+    '''
+    Returns a random KenKen puzzle of the given size, the same one for
+    the same size and seed. Its solution is a random Latin square, but
+    it may have other solutions too.
+
+    generate_puzzle: Nat Any -> Puzzle
+    Requires: 0 < size <= 9
+
+    Example:
+       generate_puzzle(1, 5) => Puzzle(1, [['a']], [['a', 1, '=']])
+    '''
+    rng = random.Random(seed)
+    square = latin_square(size, rng)
+    board = []
+    for y in range(size):
+        board.append([None] * size)
+    constraints = []
+    for i, cage in enumerate(cage_partition(size, rng)):
+        symbol = SYMBOLS[i]
+        for x, y in cage:
+            board[y][x] = symbol
+        op, target = cage_rule([square[y][x] for x, y in cage], rng)
+        constraints.append([symbol, target, op])
+    return Puzzle(size, board, constraints)
+
+
+def generate_corpus(sizes, count, seed=0):
+    '''
+    Returns count generated puzzles of each size in sizes, as a list of
+    [name, puzzle] pairs named "<size>x<size>-<k>". The puzzles only
+    depend on sizes, count and seed.
+
+    generate_corpus: (listof Nat) Nat Any -> (listof (list Str Puzzle))
+
+    Example:
+       [name for name, puz in generate_corpus([3], 2)] => ['3x3-0', '3x3-1']
+    '''
+    corpus = []
+    for size in sizes:
+        for k in range(count):
+            name = "{0}x{0}-{1}".format(size, k)
+            corpus.append([name, generate_puzzle(size, "{0}:{1}".format(
+                seed, name))])
+    return corpus
+
+
+'''
+check.expect("Tgen1", generate_puzzle(5, 7), generate_puzzle(5, 7))
+check.expect("Tgen2", generate_puzzle(4, 1) == generate_puzzle(4, 2), False)
+check.expect("Tgen3", solve_kenken_trail(generate_puzzle(4, 3)) != False,
+             True)
+check.expect("Tgen4", sorted(map(sorted, latin_square(4, random.Random(1)))),
+             [[1, 2, 3, 4]] * 4)
+cages = cage_partition(3, random.Random(2))
+check.expect("Tgen5", sorted(pos for cage in cages for pos in cage),
+             [(x, y) for x in range(3) for y in range(3)])
+'''
@@ -0,0 +1,152 @@
+'''
+Policies choosing which cage to fill in next.
+'''
+
+from kenken.puzzle import Guess, Puzzle
+from kenken.tables import cage_assignments
+
+
+## ******** CAGE ORDERING ***************
+
+## An Ordering is a function (Puzzle -> Nat) which, given a puzzle with
+## at least one constraint, returns the index in its constraints of the
+## cage to fill in next. ORDERINGS maps the name of each ordering below
+## to the function, so an ordering can be selected per run by name.
+
+
+def order_file(puz):
+    '''
+    Returns 0: cages are filled in the order they appear in
+    puz.constraints (the order they were read in).
+
+    order_file: Puzzle -> Nat
+    '''
+    return 0
+
+
+def order_fewest(puz):
+    '''
+    Returns the index of the constraint of puz with the fewest
+    cage_assignments (the first such constraint on ties).
+
+    order_fewest: Puzzle -> Nat
+
+    Example:
+       order_fewest(puzzle1) => 2
+    '''
+    best = 0
+    best_count = None
+    for i in range(len(puz.constraints)):
+        count = len(cage_assignments(puz, i)[1])
+        if best_count == None or count < best_count:
+            best = i
+            best_count = count
+            if count <= 1:
+                break
+    return best
+
+
+def order_product(puz):
+    '''
+    Returns the index of the constraint of puz whose cage has the
+    smallest product of available_vals sizes over its blank cells
+    (the first such constraint on ties).
+
+    order_product: Puzzle -> Nat
+
+    Example:
+       order_product(puzzle1) => 2
+    '''
+    space = {}
+    for y in range(puz.size):
+        for x in range(puz.size):
+            item = puz.board[y][x]
+            if isinstance(item, str):
+                ## the number of available_vals for the cell at (x, y)
+                free = puz.size - bin(puz.rows[y] | puz.cols[x]).count('1')
+                space[item] = space.get(item, 1) * free
+    best = 0
+    for i in range(len(puz.constraints)):
+        if space.get(puz.constraints[i][0], 1) < \
+           space.get(puz.constraints[best][0], 1):
+            best = i
+    return best
+
+
+def order_filled(puz):
+    '''
+    Returns the index of the constraint of puz whose blank cells see the
+    most filled in numbers in their rows and columns, in total (the
+    first such constraint on ties).
+
+    order_filled: Puzzle -> Nat
+
+    Example:
+       order_filled(puzzle1partial) => 4
+    '''
+    n = puz.size
+    row_filled = [0] * n
+    col_filled = [0] * n
+    for y in range(n):
+        for x in range(n):
+            if isinstance(puz.board[y][x], int):
+                row_filled[y] += 1
+                col_filled[x] += 1
+    seen = {}
+    for y in range(n):
+        for x in range(n):
+            item = puz.board[y][x]
+            if isinstance(item, str):
+                seen[item] = seen.get(item, 0) + row_filled[y] + col_filled[x]
+    best = 0
+    for i in range(len(puz.constraints)):
+        if seen.get(puz.constraints[i][0], 0) > \
+           seen.get(puz.constraints[best][0], 0):
+            best = i
+    return best
+
+
+ORDERINGS = {'file': order_file,
+             'fewest': order_fewest,
+             'product': order_product,
+             'filled': order_filled}
+
+
+def reorder_constraints(puz, order):
+    '''
+    Returns puz with the constraint chosen by order moved to the front
+    of its constraints, or puz itself if a cage has already been started
+    (there are Guesses on the board) or puz has no constraints.
+
+    reorder_constraints: Puzzle Ordering -> Puzzle
+
+    Example:
+       reorder_constraints(puzzle1, order_fewest).constraints[0] =>
+          ['c', 3, '=']
+    '''
+    if len(puz.constraints) == 0:
+        return puz
+    for row in puz.board:
+        for item in row:
+            if isinstance(item, Guess):
+                return puz
+    i = order(puz)
+    if i == 0:
+        return puz
+    constraints = [puz.constraints[i]] + puz.constraints[:i] + \
+                  puz.constraints[i + 1:]
+    return Puzzle(puz.size, puz.board, constraints, puz.cages, puz.rows,
+                  puz.cols)
+
+
+'''
+check.expect("Tord1", order_fewest(puzzle1), 2)
+check.expect("Tord2", order_filled(puzzle1partial), 4)
+check.expect("Tord3", reorder_constraints(puzzle1partial3, order_fewest),
+             puzzle1partial3)
+check.expect("Tord4", solve_kenken(puzzle1, 'fewest'), puzzle1soln)
+check.expect("Tord5", solve_kenken(puzzle1, order_product), puzzle1soln)
+check.expect("Tord6", solve_kenken(puzzle1partial, 'filled'), puzzle1soln)
+check.expect("Tord7", solve_kenken_cages(puzzle1, 'fewest'), puzzle1soln)
+check.expect("Tord8", solve_kenken(puzzle1partial4a, 'fewest'), False)
+'''
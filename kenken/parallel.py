@@ -0,0 +1,221 @@
+'''
+Solving in worker processes: batches of files, or subtrees of one puzzle.
+'''
+
+import multiprocessing  # solves puzzles in worker processes
+import os
+import queue
+import signal  # per-puzzle time limits in pool workers
+import time
+from itertools import islice
+
+from kenken.batch import ENGINES
+from kenken.fileio import read_puzzle
+from kenken.ordering import ORDERINGS
+from kenken.puzzle import Puzzle, puzzle_key
+from kenken.solver import find_blank, neighbours
+
+
+class SolveTimeout(Exception):
+    '''
+    Raised in a pool worker when a puzzle runs past its time limit.
+    '''
+    pass
+
+
+def raise_timeout(signum, frame):
+    '''
+    Signal handler which raises SolveTimeout.
+
+    raise_timeout: Nat Any -> None
+    '''
+    raise SolveTimeout()
+
+
+def init_worker():
+    '''
+    Sets up a pool worker: SIGALRM raises SolveTimeout (where the
+    platform has it), and Ctrl-C is left to the parent process.
+
+    Effects: Changes signal handlers
+
+    init_worker: -> None
+    '''
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, raise_timeout)
+
+
+def solve_chunk(task):
+    '''
+    Solves each puzzle file in a task [files, engine, order, timeout] in
+    a pool worker, giving up on a puzzle after timeout seconds (if
+    timeout is not None and the platform supports SIGALRM), and returns
+    the list of their Entries. A file that cannot be read or solved gets
+    the error message as its solution instead of stopping the chunk.
+
+    Effects: Reads from files
+
+    solve_chunk: (list (listof Str) Str (anyof Str None) (anyof Float None))
+                 -> (listof Entry)
+    '''
+    files, engine, order, timeout = task
+    solver = ENGINES[engine]
+    use_alarm = timeout != None and hasattr(signal, "SIGALRM")
+    done = []
+    for name in files:
+        start = time.perf_counter()
+        try:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            puz = read_puzzle(name)
+            if order == None:
+                sol = solver(puz)
+            else:
+                sol = solver(puz, order)
+        except SolveTimeout:
+            sol = "timeout"
+        except Exception as err:
+            sol = "error: {0!r}".format(err)
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        if sol != False and not isinstance(sol, str):
+            ## only the board is sent back to the parent process
+            sol = Puzzle(sol.size, sol.board, [])
+        done.append([name, sol, time.perf_counter() - start])
+    return done
+
+
+def solve_pool(files, engine="search", order=None, workers=None,
+               chunksize=4, timeout=None, max_tasks=None):
+    '''
+    Solves every puzzle file in files with the solver ENGINES[engine]
+    (passing order to it, if given) in a pool of worker processes, and
+    produces their Entries one at a time in the order they finish.
+
+    files is consumed lazily and is sent to the workers in chunks of
+    chunksize files, with at most two chunks per worker in flight, so
+    memory use does not grow with the number of files. A puzzle taking
+    more than timeout seconds is abandoned with the solution "timeout".
+    Each worker is replaced after max_tasks chunks, if given.
+
+    Effects: Reads from files, starts processes
+
+    solve_pool: (iterableof Str) Str (anyof Str None) (anyof Nat None) Nat
+                (anyof Float None) (anyof Nat None) -> (generatorof Entry)
+    Requires: chunksize > 0
+    '''
+    if workers == None:
+        workers = os.cpu_count() or 1
+    tasks = iter(files)
+    finished = queue.Queue()
+    with multiprocessing.Pool(workers, init_worker,
+                              maxtasksperchild=max_tasks) as pool:
+
+        def submit():
+            chunk = list(islice(tasks, chunksize))
+            if chunk == []:
+                return False
+            pool.apply_async(solve_chunk, ([chunk, engine, order, timeout],),
+                             callback=finished.put,
+                             error_callback=finished.put)
+            return True
+
+        pending = 0
+        while pending < 2 * workers and submit():
+            pending += 1
+        while pending > 0:
+            done = finished.get()
+            pending -= 1
+            if isinstance(done, BaseException):
+                raise done
+            if submit():
+                pending += 1
+            for entry in done:
+                yield entry
+
+
+def solve_subtree(task):
+    '''
+    Solves the puzzle of a task [puz, engine, order] in a pool worker with
+    ENGINES[engine], passing order to it if it is not None.
+
+    solve_subtree: (list Puzzle Str (anyof Str None)) -> (anyof Puzzle False)
+    '''
+    puz, engine, order = task
+    if order == None:
+        return ENGINES[engine](puz)
+    return ENGINES[engine](puz, order)
+
+
+def split_frontier(orig, depth, order=None):
+    '''
+    Returns the distinct puzzles reached from orig by depth rounds of
+    neighbours, in the order solve_kenken would visit them, or a list of
+    just a solved puzzle if one is reached first. Puzzles with no
+    neighbours are dropped along the way, so the result may be empty.
+
+    split_frontier: Puzzle Nat (anyof Str None) -> (listof Puzzle)
+
+    Example:
+       split_frontier(puzzle1, 1) => puzzle1_first_guess
+    '''
+    if isinstance(order, str):
+        order = ORDERINGS[order]
+    frontier = [orig]
+    for i in range(depth):
+        seen = set()
+        nxt = []
+        for puz in frontier:
+            if find_blank(puz) == False:
+                return [puz]
+            for nbr in neighbours(puz, order):
+                key = puzzle_key(nbr)
+                if key not in seen:
+                    seen.add(key)
+                    nxt.append(nbr)
+        frontier = nxt
+    return frontier
+
+
+def solve_kenken_parallel(orig, depth=2, workers=None, engine="search",
+                          order=None):
+    '''
+    Finds a solution to a KenKen puzzle, orig, or returns False if there
+    is no solution, by splitting the search at split_frontier(orig, depth)
+    and solving the subtrees in a pool of worker processes with
+    ENGINES[engine] (and order, if given). The first solution any worker
+    finds is returned and the remaining workers are stopped, so for
+    puzzles with several solutions it need not be the one solve_kenken
+    would return.
+
+    Effects: Starts processes
+
+    solve_kenken_parallel: Puzzle Nat (anyof Nat None) Str (anyof Str None)
+                           -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_parallel(puzzle1) => puzzle1soln
+    '''
+    frontier = split_frontier(orig, depth, order)
+    if len(frontier) == 1 and find_blank(frontier[0]) == False:
+        return frontier[0]
+    if workers == None:
+        workers = os.cpu_count() or 1
+    tasks = []
+    for puz in frontier:
+        tasks.append([puz, engine, order])
+    with multiprocessing.Pool(workers, init_worker) as pool:
+        for sol in pool.imap_unordered(solve_subtree, tasks):
+            if sol != False:
+                return sol
+    return False
+
+
+'''
+check.expect("Tpar1", split_frontier(puzzle1, 1), puzzle1_first_guess)
+check.expect("Tpar2", split_frontier(puzzle1soln, 3), [puzzle1soln])
+check.expect("Tpar3", solve_kenken_parallel(puzzle1, 2, 2), puzzle1soln)
+check.expect("Tpar4", solve_kenken_parallel(puzzle1partial4a, 1, 2), False)
+'''
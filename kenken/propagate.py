@@ -0,0 +1,208 @@
+'''
+Constraint propagation over bitmask domains: solve_kenken_cp.
+'''
+
+from array import array
+
+from kenken.flat import (GUESS_FLAG, FlatPuzzle, flatten_puzzle,
+                         unflatten_puzzle)
+from kenken.tables import cage_clashes, cage_tuples, tuple_fits
+
+
+## ******** CONSTRAINT PROPAGATION ENGINE ***************
+
+## A Domains, D, is a (listof Nat) of length size * size, indexed like
+## FlatPuzzle.cells. Bit v of D[k] is set when v is still a possible
+## value for cell k, so a cell is decided once D[k] has a single bit set.
+
+
+def initial_domains(fp):
+    '''
+    Returns the Domains of fp before any propagation: filled in and
+    guessed cells may only take their number, blank cells any number
+    from 1 to fp.size.
+
+    initial_domains: FlatPuzzle -> Domains
+
+    Example:
+       initial_domains(flatten_puzzle(puzzle1partial))[4:8] =>
+          [30, 4, 2, 16]
+    '''
+    full = (1 << (fp.size + 1)) - 2
+    domains = []
+    for val in fp.cells:
+        if val == 0:
+            domains.append(full)
+        else:
+            domains.append(1 << (val & ~GUESS_FLAG))
+    return domains
+
+
+def cage_groups(fp):
+    '''
+    Returns a list with one [op, target, cells] entry for each remaining
+    constraint of fp, where cells are the indices of the cage's cells.
+
+    cage_groups: FlatPuzzle -> (listof (list Str Nat (listof Nat)))
+
+    Example:
+       cage_groups(flatten_puzzle(puzzle2a)) =>
+          [['*', 96, [5, 9, 10, 13, 14]], ['+', 5, [4, 8]],
+           ['*', 3, [2, 3, 6]]]
+    '''
+    groups = []
+    for i in range(fp.first, len(fp.constraints)):
+        groups.append([fp.constraints[i][2], fp.constraints[i][1], []])
+    for k in range(len(fp.cages)):
+        if fp.cages[k] >= fp.first:
+            groups[fp.cages[k] - fp.first][2].append(k)
+    return groups
+
+
+def cage_lookup(groups):
+    '''
+    Returns a dictionary mapping each cell of a cage in groups (see
+    cage_groups) to the index in groups of its cage.
+
+    cage_lookup: (listof (list Str Nat (listof Nat))) -> (dictof Nat Nat)
+
+    Example:
+       cage_lookup([['+', 5, [4, 8]], ['=', 2, [3]]]) => {4: 0, 8: 0, 3: 1}
+    '''
+    cage_of = {}
+    for g in range(len(groups)):
+        for k in groups[g][2]:
+            cage_of[k] = g
+    return cage_of
+
+
+def cage_support(op, target, cells, domains, size):
+    '''
+    Returns a list with, for each cell of a cage, the mask of the values
+    it takes in at least one assignment of the cage that satisfies op and
+    target, stays within domains, and does not repeat a number in a row
+    or column of the cage.
+
+    cage_support: Str Nat (listof Nat) Domains Nat -> (listof Nat)
+
+    Example:
+       cage_support('/', 2, [0, 1], [30, 30], 4) => [22, 22]
+    '''
+    m = len(cells)
+    support = [0] * m
+    doms = [domains[k] for k in cells]
+    clashes = cage_clashes(cells, size)
+    for vals in cage_tuples(op, target, m, size):
+        if tuple_fits(vals, doms, clashes):
+            for j in range(m):
+                support[j] |= 1 << vals[j]
+    return support
+
+
+def propagate(domains, size, groups, cage_of, changed):
+    '''
+    Removes values from domains that cannot be part of a solution:
+    a decided cell's number is removed from the rest of its row and
+    column, and each cage's cells are restricted to cage_support.
+    Only cells in changed, and cells whose domains shrink as a result,
+    are revisited, and only the cages of those cells (cage_of is
+    cage_lookup(groups)) are revised. Returns False if some cell is
+    left with no values, True otherwise.
+
+    Effects: Mutates domains
+
+    propagate: Domains Nat (listof (list Str Nat (listof Nat)))
+               (dictof Nat Nat) (listof Nat) -> Bool
+    '''
+    queue = list(changed)
+    dirty = set(cage_of[k] for k in changed if k in cage_of)
+    while queue != [] or dirty:
+        while queue != []:
+            k = queue.pop()
+            if k in cage_of:
+                dirty.add(cage_of[k])
+            dom = domains[k]
+            if dom & (dom - 1):
+                continue
+            row, col = divmod(k, size)
+            for j in range(size):
+                for peer in (row * size + j, j * size + col):
+                    if peer != k and domains[peer] & dom:
+                        domains[peer] &= ~dom
+                        if domains[peer] == 0:
+                            return False
+                        queue.append(peer)
+        if dirty:
+            op, target, cells = groups[dirty.pop()]
+            support = cage_support(op, target, cells, domains, size)
+            for i in range(len(cells)):
+                k = cells[i]
+                if domains[k] & ~support[i]:
+                    domains[k] &= support[i]
+                    if domains[k] == 0:
+                        return False
+                    queue.append(k)
+    return True
+
+
+def solve_kenken_cp(orig):
+    '''
+    Finds a solution to a KenKen puzzle, orig, or returns False
+    if there is no solution. Unlike solve_kenken, each cell keeps a
+    bitmask of its possible numbers which is narrowed by propagate
+    after every choice, and the next cell to choose is one with the
+    fewest possible numbers left.
+
+    solve_kenken_cp: Puzzle -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_cp(puzzle1) => puzzle1soln
+    '''
+    fp = flatten_puzzle(orig)
+    n = fp.size
+    groups = cage_groups(fp)
+    cage_of = cage_lookup(groups)
+    domains = initial_domains(fp)
+    if not propagate(domains, n, groups, cage_of, range(n * n)):
+        return False
+
+    def search(domains):
+        best = None
+        best_count = n + 1
+        for k in range(n * n):
+            count = bin(domains[k]).count('1')
+            if 1 < count < best_count:
+                best = k
+                best_count = count
+        if best == None:
+            return domains
+        for v in range(1, n + 1):
+            if domains[best] & (1 << v):
+                child = domains[:]
+                child[best] = 1 << v
+                if propagate(child, n, groups, cage_of, [best]):
+                    result = search(child)
+                    if result != False:
+                        return result
+        return False
+
+    result = search(domains)
+    if result == False:
+        return False
+    cells = array('b', [dom.bit_length() - 1 for dom in result])
+    return unflatten_puzzle(FlatPuzzle(n, cells, fp.cages, fp.constraints,
+                                       len(fp.constraints)))
+
+
+'''
+check.expect("Tcp1", cage_support('-', 3, [0, 4], [30, 30, 30, 30, 30], 4),
+             [18, 18])
+check.expect("Tcp2", solve_kenken_cp(puzzle1), puzzle1soln)
+check.expect("Tcp3", solve_kenken_cp(puzzle1partial), puzzle1soln)
+check.expect("Tcp4", solve_kenken_cp(puzzle1partial4a), False)
+check.expect("Tcp5", solve_kenken_cp(puzzle1partial4b), puzzle1soln)
+check.expect("Tcp6", solve_kenken_cp(puzzle1soln), puzzle1soln)
+check.expect("Tcp7", cage_lookup(cage_groups(flatten_puzzle(puzzle2a))),
+             {5: 0, 9: 0, 10: 0, 13: 0, 14: 0, 4: 1, 8: 1, 2: 2, 3: 2,
+              6: 2})
+'''
@@ -0,0 +1,280 @@
+'''
+The Puzzle, Guess and Posn data types and the indices kept on a Puzzle.
+'''
+
+
+## A Board, B, is a (listof (listof (anyof Str Nat Guess))
+## Requires:
+##   len(B) > 0 and the length of each inner list equals len(B)
+##   If B[i][j] is a Str, len(B[i][j]) == 1.
+##     (i.e. each cage is represented by a string of length one)
+##   If B[i][j] is a Nat, then it is between 1 and len(B) (inclusive).
+##     (i.e. all filled in numbers are in the valid range)
+##   If B[i][j] is a Guess, then
+##     B[i][j].number is between 1 and len(B) (inclusive).
+##     (i.e. all guessed numbers are in the valid range)
+
+## A Constraint, C, is a (list Str Nat (anyof '+' '-' '*' '/' '='))
+## Requires:
+##   len(C[0]) == 1
+##   C[1] > 0
+
+
+class Puzzle:
+    '''
+      Fields:
+         size (Nat)
+         board (Board)
+         constraints (listof Constraint)
+         Requires:
+            size > 0
+            len(board) == size
+            If board[i][j] is a Guess, board[i][j].symbol is a cage in the
+              puzzle.
+            There is a one to one correspondence between the cages in board and
+              constraints. For example, if "a" represents a cage in the puzzle,
+              it appears in board and there is exactly one constraint for "a".
+            If constraints[i][2] is "=", then the cage constraints[i][0]
+              appears exactly once in the puzzle.
+            If constraints[i][2] is "\" or "-", then the cage constraints[i][0]
+              appears exactly twice in the puzzle.
+      Index fields (built from board by __init__ unless they are given):
+         cages (dictof Str (listof Posn))
+         rows (listof Nat)
+         cols (listof Nat)
+         Requires:
+            cages maps each cage symbol to the positions, in row major
+              order, of the cells of that cage. A cage's cells never move,
+              so cages may be shared by every puzzle made from this one.
+            Bit v of rows[i] (cols[i]) is set if v is filled in or
+              guessed in row (column) i of board.
+            board is not mutated after the Puzzle is made.
+    '''
+
+    def __init__(self, size, board, constraints, cages=None, rows=None,
+                 cols=None):
+        '''
+        Initializes a Puzzle.
+
+        Effects: Mutates self
+
+        __init__: Puzzle Nat Board (listof Constraint)
+                  (anyof (dictof Str (listof Posn)) None)
+                  (anyof (listof Nat) None) (anyof (listof Nat) None) -> None
+        Requires: size > 0
+        '''
+        self.size = size
+        self.board = board
+        self.constraints = constraints
+        if cages == None:
+            cages = cage_index(board)
+        self.cages = cages
+        if rows == None or cols == None:
+            rows, cols = line_masks(board)
+        self.rows = rows
+        self.cols = cols
+
+    def __eq__(self, other):
+        '''
+        Returns True if self and other are equal. False otherwise.
+
+        __eq__: Puzzle Any -> Bool
+        '''
+        return (isinstance(other, Puzzle)) and \
+               self.size == other.size and \
+               self.board == other.board and \
+               self.constraints == other.constraints
+
+    def __repr__(self):
+        '''
+        Returns a string representation of self.
+
+        __repr__: Puzzle -> Str
+        '''
+        s = 'Puzzle(\nSize=' + str(self.size) + '\n' + "Board:\n"
+        for i in range(self.size):
+            for j in range(self.size):
+                if isinstance(self.board[i][j], Guess):
+                    s = s + str(self.board[i][j]) + ' '
+                else:
+                    s = s + str(self.board[i][j]) + ' ' * 12
+            s = s + '\n'
+        s = s + "Constraints:\n"
+        for i in range(len(self.constraints)):
+            s = s + '[ ' + self.constraints[i][0] + '  ' + \
+                str(self.constraints[i][1]) + '  ' + self.constraints[i][2] + \
+                ' ]' + '\n'
+        s = s + ')'
+        return s
+
+
+class Guess:
+    '''
+    Fields:
+       symbol (Str)
+       number (Nat)
+       Requires:
+         len(symbol) == 1
+    '''
+
+    def __init__(self, symbol, number):
+        '''
+        Initializes a Guess.
+
+        Effects: Mutates self
+
+        __init__: Guess Str Nat -> None
+        '''
+        self.symbol = symbol
+        self.number = number
+
+    def __repr__(self):
+        '''
+        Returns a string representation of self.
+
+        __repr__: Guess -> Str
+        '''
+        return "Guess('{0}',{1})".format(self.symbol, self.number)
+
+    def __eq__(self, other):
+        '''
+        Returns True if self and other are equal. False otherwise.
+
+        __eq__: Guess Any -> Bool
+        '''
+        return (isinstance(other, Guess)) and \
+               self.symbol == other.symbol and \
+               self.number == other.number
+
+
+class Posn:
+    '''
+    Fields:
+       x (Nat)
+       y (Nat)
+       Note: Origin (where x=0 and y=0) is top left.
+    '''
+
+    def __init__(self, x, y):
+        '''
+        Initializes a Posn.
+
+        Effects: Mutates self
+
+        __init__: Posn Nat Nat -> None
+        '''
+        self.x = x
+        self.y = y
+
+    def __repr__(self):
+        '''
+        Returns a string representation of self.
+
+        __repr__: Posn -> Str
+        '''
+        return "Posn({0},{1})".format(self.x, self.y)
+
+    def __eq__(self, other):
+        '''
+        Returns True if self and other are equal. False otherwise.
+
+        __eq__: Posn Any -> Bool
+        '''
+        return (isinstance(other, Posn)) and \
+               self.x == other.x and \
+               self.y == other.y
+
+
+
+def cage_index(brd):
+    '''
+    Returns a dictionary mapping each cage symbol in brd to the positions,
+    in row major order, of its cells (the cells holding the symbol or a
+    Guess for it), found in a single pass over brd.
+
+    cage_index: Board -> (dictof Str (listof Posn))
+
+    Example:
+       cage_index([['a', 2], [Guess('a', 1), 'b']]) =>
+          {'a': [Posn(0,0), Posn(0,1)], 'b': [Posn(1,1)]}
+    '''
+    cages = {}
+    for y in range(len(brd)):
+        for x in range(len(brd)):
+            item = brd[y][x]
+            if isinstance(item, Guess):
+                item = item.symbol
+            elif not isinstance(item, str):
+                continue
+            if item in cages:
+                cages[item].append(Posn(x, y))
+            else:
+                cages[item] = [Posn(x, y)]
+    return cages
+
+
+def cell_number(item):
+    '''
+    Returns the number filled in or guessed in a board cell, item,
+    or 0 if item is a cage symbol.
+
+    cell_number: (anyof Str Nat Guess) -> Nat
+
+    Examples:
+       cell_number(Guess('a', 3)) => 3
+       cell_number('a') => 0
+    '''
+    if isinstance(item, Guess):
+        return item.number
+    elif isinstance(item, int):
+        return item
+    return 0
+
+
+def line_masks(brd):
+    '''
+    Returns a list of two lists: for each row, and for each column, of
+    brd the mask with bit v set if v is filled in or guessed in it.
+
+    line_masks: Board -> (list (listof Nat) (listof Nat))
+
+    Example:
+       line_masks([[1, 'a'], [Guess('b', 1), 2]]) => [[2, 6], [6, 6]]
+    '''
+    rows = [0] * len(brd)
+    cols = [0] * len(brd)
+    for y in range(len(brd)):
+        for x in range(len(brd)):
+            bit = (1 << cell_number(brd[y][x])) & ~1
+            rows[y] |= bit
+            cols[x] |= bit
+    return [rows, cols]
+
+
+def puzzle_key(puz):
+    '''
+    Returns a hashable key for puz. Two puzzles have the same key
+    exactly when they are equal (see Puzzle.__eq__), so the key can be
+    stored in a set or dict in place of the puzzle itself.
+
+    A Guess is encoded as the tuple (symbol, number), which can never be
+    equal to a cage symbol (Str) or a filled in number (Nat).
+
+    puzzle_key: Puzzle
+                -> (tuple Nat (tupleof Any) (tupleof (tuple Str Nat Str)))
+
+    Example:
+       puzzle_key(puzzle1partial2) =>
+          (4, (('a', 2), 'b', 'b', 'c', 'a', 2, 1, 4,
+               'f', 3, 'g', 'g', 'f', 'h', 'i', 'i'),
+           (('a', 6, '*'), ('b', 3, '-'), ('c', 3, '='), ('f', 3, '-'),
+            ('g', 2, '/'), ('h', 4, '='), ('i', 1, '-')))
+    '''
+    cells = []
+    for row in puz.board:
+        for item in row:
+            if isinstance(item, Guess):
+                cells.append((item.symbol, item.number))
+            else:
+                cells.append(item)
+    return (puz.size, tuple(cells), tuple(map(tuple, puz.constraints)))
@@ -0,0 +1,462 @@
+'''
+KenKen as a boolean satisfiability (SAT) problem: puzzle_cnf,
+format_dimacs and solve_kenken_sat.
+'''
+
+import argparse
+import heapq
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+
+from kenken.fileio import read_puzzle
+from kenken.flat import NO_CAGE, flatten_puzzle
+from kenken.propagate import cage_groups, initial_domains
+from kenken.puzzle import Puzzle
+from kenken.tables import cage_clashes, cage_tuples, tuple_fits
+
+
+## ******** CNF ENCODING ***************
+
+## A CNF is a (list Nat (listof (listof Int))), [nvars, clauses]: each
+## clause is a list of literals, v for variable v being true and -v for
+## it being false, and a model must make at least one literal of every
+## clause true. Variables are numbered from 1, so an empty clause can
+## never be satisfied.
+##
+## For a board of size n, variable cell_var(k, v, n) = k * n + v means
+## cell k (in FlatPuzzle order) holds v. The clauses say that
+##   - every cell holds exactly one number;
+##   - every number is in every row and every column exactly once;
+##   - decided cells (filled in or guessed) hold their number;
+##   - every cage is filled with one of its tuples from cage_tuples
+## where each cage gets one more "selector" variable per tuple: at least
+## one selector is true, and a true selector sets every cell of the cage
+## to its number. Tuples repeating a decided number of a row or column
+## are left out, like in exact_cover_matrix.
+##
+## A Model is a (setof Nat), the variables set to true.
+
+
+def cell_var(k, v, n):
+    '''
+    Returns the variable for cell k holding v on a board of size n.
+
+    cell_var: Nat Nat Nat -> Nat
+
+    Example:
+       cell_var(5, 2, 4) => 22
+    '''
+    return k * n + v
+
+
+def puzzle_cnf(puz):
+    '''
+    Returns the CNF of puz described above.
+
+    puzzle_cnf: Puzzle -> CNF
+
+    Example:
+       puzzle_cnf(puzzle1)[0] => 88
+    '''
+    fp = flatten_puzzle(puz)
+    n = fp.size
+    domains = initial_domains(fp)
+    clauses = []
+    ## the sets of cells of which each number must be in exactly one:
+    ## cells hold one number, rows and columns hold each number once
+    groups = []
+    for k in range(n * n):
+        groups.append([cell_var(k, v, n) for v in range(1, n + 1)])
+    for i in range(n):
+        for v in range(1, n + 1):
+            groups.append([cell_var(i * n + x, v, n) for x in range(n)])
+            groups.append([cell_var(y * n + i, v, n) for y in range(n)])
+    for lits in groups:
+        clauses.append(lits)
+        for a in range(len(lits)):
+            for b in range(a + 1, len(lits)):
+                clauses.append([-lits[a], -lits[b]])
+    for k in range(n * n):
+        if domains[k] & (domains[k] - 1) == 0:
+            v = domains[k].bit_length() - 1
+            clauses.append([cell_var(k, v, n)])
+            if fp.cages[k] == NO_CAGE:
+                ## a filled in number is ruled out for the rest of its
+                ## row and column before the cage tuples are listed
+                for j in range(n):
+                    if j != k % n:
+                        domains[(k // n) * n + j] &= ~(1 << v)
+                    if j != k // n:
+                        domains[j * n + k % n] &= ~(1 << v)
+    nvars = n * n * n
+    for op, target, cells in cage_groups(fp):
+        doms = [domains[k] for k in cells]
+        clashes = cage_clashes(cells, n)
+        selectors = []
+        for vals in cage_tuples(op, target, len(cells), n):
+            if tuple_fits(vals, doms, clashes):
+                nvars += 1
+                selectors.append(nvars)
+                for j in range(len(cells)):
+                    clauses.append([-nvars, cell_var(cells[j], vals[j], n)])
+        clauses.append(selectors)
+    return [nvars, clauses]
+
+
+def format_dimacs(cnf):
+    '''
+    Returns the text of cnf in the DIMACS format read by SAT solvers.
+
+    format_dimacs: CNF -> Str
+
+    Example:
+       format_dimacs([2, [[1, -2], [2]]]) => "p cnf 2 2\\n1 -2 0\\n2 0\\n"
+    '''
+    nvars, clauses = cnf
+    lines = ["p cnf {0} {1}".format(nvars, len(clauses))]
+    for clause in clauses:
+        lines.append(" ".join([str(lit) for lit in clause] + ["0"]))
+    return "\n".join(lines) + "\n"
+
+
+def decode_model(model, n):
+    '''
+    Returns the solved Puzzle of size n whose cells are set by model.
+
+    decode_model: Model Nat -> Puzzle
+    Requires: model is a model of the puzzle_cnf of a puzzle of size n
+
+    Example:
+       decode_model({1}, 1) => Puzzle(1, [[1]], [])
+    '''
+    board = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            for v in range(1, n + 1):
+                if cell_var(y * n + x, v, n) in model:
+                    row.append(v)
+                    break
+        board.append(row)
+    return Puzzle(n, board, [])
+
+
+## ******** SAT SOLVERS ***************
+
+## cdcl is a small conflict driven clause learning solver, used when no
+## SAT solver program is given. It watches two literals of each clause,
+## learns the first unique implication point clause of every conflict,
+## jumps back to the second highest level of that clause, picks the most
+## active variable next (VSIDS) with its last value, and restarts after
+## a growing number of conflicts. Learnt clauses are never deleted, which
+## is fine for the few thousand conflicts a KenKen takes.
+
+
+def cdcl(cnf):
+    '''
+    Returns a Model of cnf, or None if it has none.
+
+    cdcl: CNF -> (anyof Model None)
+
+    Examples:
+       cdcl([2, [[1, 2], [-1], [-2, 1]]]) => None
+       cdcl([2, [[1, 2], [-1]]]) => {2}
+    '''
+    nvars = cnf[0]
+    ## value[v] is 1 or -1 once v is set, level[v] the decision level it
+    ## was set at and reason[v] the clause that implied it (None for a
+    ## decision); trail lists the true literals in the order they were
+    ## set, and limits where each decision level starts in trail
+    value = [0] * (nvars + 1)
+    level = [0] * (nvars + 1)
+    reason = [None] * (nvars + 1)
+    phase = [-1] * (nvars + 1)
+    activity = [0.0] * (nvars + 1)
+    trail = []
+    limits = []
+    watches = {}
+    for v in range(1, nvars + 1):
+        watches[v] = []
+        watches[-v] = []
+    clauses = []
+
+    def assign(lit, why):
+        v = abs(lit)
+        value[v] = 1 if lit > 0 else -1
+        level[v] = len(limits)
+        reason[v] = why
+        trail.append(lit)
+
+    def true(lit):
+        return value[lit] == 1 if lit > 0 else value[-lit] == -1
+
+    def false(lit):
+        return value[lit] == -1 if lit > 0 else value[-lit] == 1
+
+    units = []
+    for clause in cnf[1]:
+        clause = list(dict.fromkeys(clause))
+        lits = set(clause)
+        if any(-lit in lits for lit in clause):
+            continue
+        if clause == []:
+            return None
+        if len(clause) == 1:
+            units.append(clause[0])
+            continue
+        watches[clause[0]].append(len(clauses))
+        watches[clause[1]].append(len(clauses))
+        clauses.append(clause)
+    for lit in units:
+        if false(lit):
+            return None
+        if not true(lit):
+            assign(lit, None)
+
+    ## head[0] is the position in trail of the next literal to propagate
+    head = [0]
+
+    def propagate():
+        ## returns the index of a clause made false, or None
+        while head[0] < len(trail):
+            lit = -trail[head[0]]
+            head[0] += 1
+            watching = watches[lit]
+            i = 0
+            while i < len(watching):
+                c = watching[i]
+                clause = clauses[c]
+                if clause[0] == lit:
+                    clause[0], clause[1] = clause[1], lit
+                if true(clause[0]):
+                    i += 1
+                    continue
+                for j in range(2, len(clause)):
+                    if not false(clause[j]):
+                        clause[1], clause[j] = clause[j], lit
+                        watches[clause[1]].append(c)
+                        watching[i] = watching[-1]
+                        watching.pop()
+                        break
+                else:
+                    if false(clause[0]):
+                        return c
+                    assign(clause[0], c)
+                    i += 1
+        return None
+
+    def backjump(to):
+        for lit in trail[limits[to]:]:
+            v = abs(lit)
+            phase[v] = value[v]
+            value[v] = 0
+            reason[v] = None
+            heapq.heappush(heap, (-activity[v], v))
+        del trail[limits[to]:]
+        del limits[to:]
+        head[0] = len(trail)
+
+    bump = [1.0]
+
+    def analyze(c):
+        ## returns the learnt clause, its asserting literal first
+        learnt = [None]
+        seen = set()
+        current = 0
+        lit = None
+        i = len(trail) - 1
+        clause = clauses[c]
+        while True:
+            for other in (clause if lit == None else clause[1:]):
+                v = abs(other)
+                if v not in seen and level[v] > 0:
+                    seen.add(v)
+                    activity[v] += bump[0]
+                    if level[v] == len(limits):
+                        current += 1
+                    else:
+                        learnt.append(other)
+            while abs(trail[i]) not in seen:
+                i -= 1
+            lit = trail[i]
+            i -= 1
+            current -= 1
+            if current == 0:
+                break
+            clause = clauses[reason[abs(lit)]]
+        learnt[0] = -lit
+        return learnt
+
+    heap = [(0.0, v) for v in range(1, nvars + 1)]
+    conflicts = 0
+    restart = 100
+    while True:
+        c = propagate()
+        if c != None:
+            if limits == []:
+                return None
+            conflicts += 1
+            learnt = analyze(c)
+            bump[0] /= 0.95
+            if bump[0] > 1e100:
+                for v in range(1, nvars + 1):
+                    activity[v] /= 1e100
+                bump[0] /= 1e100
+            ## the second watch is the literal set last after the first
+            back = 0
+            for j in range(1, len(learnt)):
+                if level[abs(learnt[j])] > back:
+                    back = level[abs(learnt[j])]
+                    learnt[1], learnt[j] = learnt[j], learnt[1]
+            backjump(back)
+            if len(learnt) == 1:
+                assign(learnt[0], None)
+            else:
+                watches[learnt[0]].append(len(clauses))
+                watches[learnt[1]].append(len(clauses))
+                clauses.append(learnt)
+                assign(learnt[0], len(clauses) - 1)
+            continue
+        if conflicts >= restart and limits != []:
+            restart += restart // 2
+            backjump(0)
+            continue
+        v = 0
+        while heap != []:
+            act, v = heapq.heappop(heap)
+            if value[v] == 0:
+                break
+            v = 0
+        if v == 0:
+            return set(lit for lit in trail if lit > 0)
+        limits.append(len(trail))
+        assign(v * phase[v], None)
+
+
+def parse_model(text):
+    '''
+    Returns the Model in text, the output of a SAT solver in the SAT
+    competition format ("s SATISFIABLE" followed by "v" lines of
+    literals ending in 0), or None if it says there is no model. Raises
+    ValueError if text does not say either.
+
+    parse_model: Str -> (anyof Model None)
+
+    Examples:
+       parse_model("c hello\\ns SATISFIABLE\\nv -1 2 0\\n") => {2}
+       parse_model("s UNSATISFIABLE\\n") => None
+    '''
+    status = None
+    model = set()
+    for line in text.splitlines():
+        words = line.split()
+        if words == [] or words[0] == "c":
+            continue
+        if words[0] == "s" and len(words) > 1:
+            status = words[1]
+        elif words[0] == "v":
+            for word in words[1:]:
+                if int(word) > 0:
+                    model.add(int(word))
+    if status == "SATISFIABLE":
+        return model
+    if status == "UNSATISFIABLE":
+        return None
+    raise ValueError("the SAT solver did not say whether there is a model")
+
+
+def run_solver(cnf, command):
+    '''
+    Returns a Model of cnf, or None if it has none, by running command (a
+    program and its arguments, as a list or a shell-like string) on a
+    DIMACS file of cnf. The program must print its answer as parse_model
+    reads it, like kissat, cadical or cryptominisat5 do.
+
+    Effects: Writes and removes a temporary file, runs a program
+
+    run_solver: CNF (anyof Str (listof Str)) -> (anyof Model None)
+    '''
+    if isinstance(command, str):
+        command = shlex.split(command)
+    fd, path = tempfile.mkstemp(suffix=".cnf")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(format_dimacs(cnf))
+        ## SAT solvers exit with 10 or 20, so the status is not checked
+        done = subprocess.run(command + [path], stdout=subprocess.PIPE,
+                              universal_newlines=True)
+    finally:
+        os.remove(path)
+    return parse_model(done.stdout)
+
+
+def solve_kenken_sat(orig, command=None):
+    '''
+    Finds a solution to a KenKen puzzle, orig, with a SAT solver, or
+    returns False if there is no solution. The solver is the program
+    command (see run_solver) if it is given, and cdcl otherwise.
+
+    Effects: Runs command, if it is given
+
+    solve_kenken_sat: Puzzle (anyof Str (listof Str) None)
+                      -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_sat(puzzle1) => puzzle1soln
+    '''
+    cnf = puzzle_cnf(orig)
+    if command == None:
+        model = cdcl(cnf)
+    else:
+        model = run_solver(cnf, command)
+    if model == None:
+        return False
+    return decode_model(model, orig.size)
+
+
+def main(argv=None):
+    '''
+    Writes the CNF of a puzzle file in the DIMACS format, to a file or to
+    standard output.
+
+    Effects: Reads from and writes to files or the screen
+
+    main: (anyof (listof Str) None) -> Nat
+    '''
+    parser = argparse.ArgumentParser(
+        description="Write a KenKen puzzle as a DIMACS CNF file.")
+    parser.add_argument("puzzle", help="puzzle file in the read_puzzle "
+                                       "format")
+    parser.add_argument("-o", "--output", help="write the CNF here")
+    args = parser.parse_args(argv)
+    text = format_dimacs(puzzle_cnf(read_puzzle(args.puzzle)))
+    if args.output == None:
+        sys.stdout.write(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+'''
+check.expect("Tsat1", solve_kenken_sat(puzzle1), puzzle1soln)
+check.expect("Tsat2", solve_kenken_sat(puzzle1partial), puzzle1soln)
+check.expect("Tsat3", solve_kenken_sat(puzzle1partial4a), False)
+check.expect("Tsat4", solve_kenken_sat(puzzle1soln), puzzle1soln)
+check.expect("Tsat5", cdcl([2, [[1, 2], [-1]]]), {2})
+check.expect("Tsat6", cdcl([2, [[1, 2], [-1], [-2, 1]]]), None)
+check.expect("Tsat7", cdcl([1, [[]]]), None)
+check.expect("Tsat8", format_dimacs([2, [[1, -2], [2]]]).split(),
+             ["p", "cnf", "2", "2", "1", "-2", "0", "2", "0"])
+check.expect("Tsat9", parse_model("s SATISFIABLE\\nv -1 2\\nv 3 0"), {2, 3})
+check.expect("Tsat10", parse_model("s UNSATISFIABLE"), None)
+check.expect("Tsat11", decode_model(cdcl(puzzle_cnf(puzzle1)), 4),
+             puzzle1soln)
+'''
@@ -0,0 +1,474 @@
+'''
+The solver as an HTTP/JSON service on asyncio: SolverServer, and
+python -m kenken.server.
+'''
+
+import argparse
+import asyncio
+import json
+import os
+import signal  # per-request time limits in pool workers
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from kenken.batch import ENGINES
+from kenken.fileio import cage_problem, parse_record
+from kenken.parallel import SolveTimeout, init_worker
+from kenken.puzzle import Puzzle
+from kenken.solutions import check_solution, count_solutions
+
+
+## ******** SOLVER SERVICE ***************
+
+## Requests are HTTP/1.1, one per connection, with a JSON body (or the
+## read_puzzle text format as a text/plain body):
+##   POST /solve     {"puzzle": P, "engine": "search"}
+##                   => {"solved": Bool, "board": B or null, "seconds": F}
+##   POST /count     {"puzzle": P, "limit": 2}
+##                   => {"count": Nat, "unique": Bool, "seconds": F}
+##   POST /validate  {"puzzle": P, "solution": B}
+##                   => {"valid": Bool, "reason": Str or null}
+##   GET  /health    => {"status": "ok", "pending": Nat, "workers": Nat}
+## where a puzzle P is either a string in the read_puzzle format or an
+## object {"size": n, "board": rows of symbols and numbers,
+## "constraints": [[symbol, target, op], ...]}, and a board B is a list
+## of rows of numbers.
+##
+## Solving and counting run in a process pool. At most max_pending of
+## them are admitted at a time (queued or running); further requests get
+## 503 at once rather than waiting. Each admitted request has deadline
+## seconds from its arrival: past that it gets 504, and the worker, which
+## is told the same deadline, stops the search by SIGALRM (see
+## parallel.init_worker) so the pool is not left busy. /validate and
+## /health are answered by the event loop itself.
+
+## the most bytes read for a request body, and the seconds allowed for
+## the request line and headers to arrive
+MAX_BODY = 1 << 20
+READ_TIMEOUT = 10.0
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error", 503: "Service Unavailable",
+           504: "Gateway Timeout"}
+
+
+def puzzle_from_json(data):
+    '''
+    Returns the Puzzle described by data, either a string in the
+    read_puzzle format or a dictionary with "size", "board" and
+    "constraints", or raises ValueError saying what is wrong. Both forms
+    must have exactly one constraint for each cage (see cage_problem).
+
+    puzzle_from_json: Any -> Puzzle
+
+    Examples:
+       puzzle_from_json("1\\na\\na 1 =") => Puzzle(1, [['a']], [['a', 1, '=']])
+       puzzle_from_json({"size": 1, "board": [["a"]],
+                         "constraints": [["a", 1, "="]]})
+          => Puzzle(1, [['a']], [['a', 1, '=']])
+    '''
+    if isinstance(data, str):
+        record = []
+        for lineno, line in enumerate(data.splitlines(), 1):
+            if line.strip() != "":
+                record.append([lineno, line])
+        if record == []:
+            raise ValueError("empty puzzle")
+        return parse_record(record)
+    if not isinstance(data, dict):
+        raise ValueError("a puzzle must be a string or an object")
+    size = data.get("size")
+    board = data.get("board")
+    constraints = data.get("constraints")
+    if type(size) != int or size <= 0:
+        raise ValueError("size must be a positive number")
+    if not isinstance(board, list) or len(board) != size or \
+       not all(isinstance(row, list) and len(row) == size for row in board):
+        raise ValueError("board must be {0} rows of {0} cells".format(size))
+    for row in board:
+        for item in row:
+            if not (isinstance(item, str) and len(item) == 1) and \
+               (type(item) != int or not 1 <= item <= size):
+                raise ValueError("a cell must be a symbol or a number "
+                                 "from 1 to {0}".format(size))
+    if not isinstance(constraints, list):
+        raise ValueError("constraints must be a list")
+    for con in constraints:
+        if not isinstance(con, list) or len(con) != 3 or \
+           not isinstance(con[0], str) or type(con[1]) != int or \
+           con[2] not in ('+', '-', '*', '/', '='):
+            raise ValueError("bad constraint: " + json.dumps(con))
+    problem = cage_problem(board, constraints)
+    if problem != None:
+        raise ValueError(problem[1])
+    return Puzzle(size, [row[:] for row in board],
+                  [con[:] for con in constraints])
+
+
+def run_job(task):
+    '''
+    Runs one task [kind, puz, engine, limit, deadline] in a pool worker,
+    where kind is "solve" or "count", and returns the JSON response body
+    for it, or None if time.time() passed deadline first.
+
+    Effects: Uses SIGALRM (where the platform has it)
+
+    run_job: (list Str Puzzle Str (anyof Nat None) Float)
+             -> (anyof (dictof Str Any) None)
+    '''
+    kind, puz, engine, limit, deadline = task
+    left = deadline - time.time()
+    if left <= 0:
+        return None
+    use_alarm = hasattr(signal, "SIGALRM")
+    start = time.perf_counter()
+    try:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, left)
+        if kind == "solve":
+            sol = ENGINES[engine](puz)
+            res = {"solved": sol != False,
+                   "board": None if sol == False else sol.board}
+        else:
+            count = count_solutions(puz, limit)
+            res = {"count": count, "unique": count == 1}
+    except SolveTimeout:
+        return None
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    res["seconds"] = time.perf_counter() - start
+    return res
+
+
+class SolverServer:
+    '''
+    Fields:
+       host (Str)
+       port (Nat)
+       workers (Nat)
+       max_pending (Nat)
+       deadline (Float)
+       pending (Nat)
+       pool (anyof ProcessPoolExecutor None)
+       server (anyof asyncio.Server None)
+       Requires:
+          pending is the number of solve and count jobs submitted to
+            pool and not yet finished, never more than max_pending
+          pool and server are None until start, and after close
+    '''
+
+    def __init__(self, host="127.0.0.1", port=8080, workers=None,
+                 max_pending=None, deadline=10.0):
+        '''
+        Initializes a SolverServer for host and port (0 picks a free
+        port) with workers processes (os.cpu_count() by default),
+        admitting max_pending jobs at a time (twice workers by default)
+        and giving each request deadline seconds.
+
+        Effects: Mutates self
+
+        __init__: SolverServer Str Nat (anyof Nat None) (anyof Nat None)
+                  Float -> None
+        '''
+        if workers == None:
+            workers = os.cpu_count() or 1
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_pending = max_pending or 2 * workers
+        self.deadline = deadline
+        self.pending = 0
+        self.pool = None
+        self.server = None
+
+    def __repr__(self):
+        '''
+        Returns a string representation of self.
+
+        __repr__: SolverServer -> Str
+        '''
+        return "SolverServer({0}:{1}, workers={2}, pending={3})".format(
+            self.host, self.port, self.workers, self.pending)
+
+    async def start(self):
+        '''
+        Starts the worker pool, waits for its workers to be ready, and
+        listens for connections, setting self.port to the port actually
+        used.
+
+        Effects: Mutates self, starts processes, opens a socket
+
+        start: SolverServer -> None
+        '''
+        ## the workers are started before the socket is opened, so that
+        ## forked workers never hold copies of the server's connections
+        self.pool = ProcessPoolExecutor(self.workers, initializer=init_worker)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, time.time)
+                               for i in range(self.workers)])
+        self.server = await asyncio.start_server(self.handle, self.host,
+                                                 self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        '''
+        Stops listening and shuts the worker pool down.
+
+        Effects: Mutates self, stops processes, closes a socket
+
+        close: SolverServer -> None
+        '''
+        if self.server != None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.pool != None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def release(self, fut):
+        '''
+        Counts the job fut as finished. Called on the event loop when a
+        pool future is done.
+
+        Effects: Mutates self
+
+        release: SolverServer concurrent.futures.Future -> None
+        '''
+        self.pending -= 1
+
+    async def dispatch(self, kind, puz, engine, limit, arrived):
+        '''
+        Runs the job [kind, puz, engine, limit] in the pool and returns
+        [status, body] for its response: 200 with the job's result, 503
+        if max_pending jobs are already admitted, or 504 if it did not
+        finish within the deadline from arrived (a time.time()).
+
+        Effects: Mutates self, starts work in the pool
+
+        dispatch: SolverServer Str Puzzle Str (anyof Nat None) Float
+                  -> (list Nat (dictof Str Any))
+        '''
+        if self.pending >= self.max_pending:
+            return [503, {"error": "server busy, try again later"}]
+        loop = asyncio.get_running_loop()
+        deadline = arrived + self.deadline
+        self.pending += 1
+        job = self.pool.submit(run_job, [kind, puz, engine, limit, deadline])
+        job.add_done_callback(
+            lambda fut: loop.call_soon_threadsafe(self.release, fut))
+        try:
+            res = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(job)),
+                max(deadline - time.time(), 0))
+        except asyncio.TimeoutError:
+            ## a job still queued is dropped; a running one stops itself
+            job.cancel()
+            res = None
+        if res == None:
+            return [504, {"error": "deadline of {0} seconds exceeded"
+                                   .format(self.deadline)}]
+        return [200, res]
+
+    async def route(self, method, path, body, arrived):
+        '''
+        Returns [status, body] for the response to a request for path by
+        method with the bytes body, as described above.
+
+        Effects: Mutates self, may start work in the pool
+
+        route: SolverServer Str Str Bytes Float -> (list Nat (dictof Str Any))
+        '''
+        if path == "/health":
+            if method != "GET":
+                return [405, {"error": "use GET"}]
+            return [200, {"status": "ok", "pending": self.pending,
+                          "workers": self.workers}]
+        if path not in ("/solve", "/count", "/validate"):
+            return [404, {"error": "no such endpoint: " + path}]
+        if method != "POST":
+            return [405, {"error": "use POST"}]
+        try:
+            text = body.decode("utf-8")
+            if text.lstrip().startswith("{"):
+                data = json.loads(text)
+                if not isinstance(data, dict):
+                    raise ValueError("expected a JSON object")
+            else:
+                data = {"puzzle": text}
+            puz = puzzle_from_json(data.get("puzzle"))
+            engine = data.get("engine", "search")
+            if not isinstance(engine, str) or engine not in ENGINES:
+                raise ValueError("unknown engine: " + str(engine))
+            limit = data.get("limit", 2)
+            if limit != None and (type(limit) != int or limit <= 0):
+                raise ValueError("limit must be a positive number or null")
+        except (ValueError, UnicodeDecodeError) as err:
+            return [400, {"error": str(err)}]
+        if path == "/validate":
+            if "solution" not in data:
+                return [400, {"error": "expected a \"solution\" to check"}]
+            reason = check_solution(puz, data["solution"])
+            return [200, {"valid": reason == None, "reason": reason}]
+        kind = "solve" if path == "/solve" else "count"
+        return await self.dispatch(kind, puz, engine, limit, arrived)
+
+    async def respond(self, reader):
+        '''
+        Reads one request from reader and returns [status, body] for its
+        response.
+
+        Effects: Reads from reader, mutates self, may start work in the pool
+
+        respond: SolverServer asyncio.StreamReader
+                 -> (list Nat (dictof Str Any))
+        '''
+        arrived = time.time()
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"),
+                                          READ_TIMEOUT)
+            lines = head.decode("latin-1").split("\r\n")
+            method, path, version = lines[0].split(" ")
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", "0"))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                asyncio.TimeoutError, ValueError):
+            return [400, {"error": "malformed HTTP request"}]
+        if length < 0:
+            return [400, {"error": "negative Content-Length"}]
+        if length > MAX_BODY:
+            return [413, {"error": "request body is too large"}]
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length),
+                                          READ_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return [400, {"error": "incomplete request body"}]
+        return await self.route(method, path.split("?")[0], body, arrived)
+
+    async def handle(self, reader, writer):
+        '''
+        Answers the request on one connection, then closes it.
+
+        Effects: Reads from reader, writes to writer, mutates self
+
+        handle: SolverServer asyncio.StreamReader asyncio.StreamWriter
+                -> None
+        '''
+        try:
+            status, body = await self.respond(reader)
+        except Exception as err:
+            status, body = 500, {"error": "error: {0!r}".format(err)}
+        data = json.dumps(body).encode("utf-8")
+        writer.write("HTTP/1.1 {0} {1}\r\nContent-Type: application/json"
+                     "\r\nContent-Length: {2}\r\nConnection: close\r\n{3}\r\n"
+                     .format(status, REASONS[status], len(data),
+                             "Retry-After: 1\r\n" if status == 503 else "")
+                     .encode("latin-1") + data)
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(server):
+    '''
+    Starts server and answers requests until the task is cancelled (for
+    example by Ctrl-C under asyncio.run), then closes it.
+
+    Effects: See SolverServer.start, prints to standard error
+
+    serve: SolverServer -> None
+    '''
+    await server.start()
+    print("serving on http://{0}:{1}/".format(server.host, server.port),
+          file=sys.stderr)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    '''
+    Runs a SolverServer from the command line until it is interrupted.
+
+    Effects: See serve
+
+    main: (anyof (listof Str) None) -> Nat
+    '''
+    parser = argparse.ArgumentParser(
+        description="Serve the KenKen solver over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=8080,
+                        help="port to listen on (0 for any free port)")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--max-pending", type=int,
+                        help="jobs admitted at once before answering 503 "
+                             "(default: twice --jobs)")
+    parser.add_argument("--deadline", type=float, default=10.0,
+                        help="seconds allowed per request before 504")
+    args = parser.parse_args(argv)
+    server = SolverServer(args.host, args.port, args.jobs, args.max_pending,
+                          args.deadline)
+    try:
+        asyncio.run(serve(server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+'''
+check.expect("Tsrv1", puzzle_from_json("1\\n\\na\\na 1 ="),
+             Puzzle(1, [['a']], [['a', 1, '=']]))
+check.expect("Tsrv2", puzzle_from_json({"size": 1, "board": [["a"]],
+                                        "constraints": [["a", 1, "="]]}),
+             Puzzle(1, [['a']], [['a', 1, '=']]))
+check.expect("Tsrv3", run_job(["solve", puzzle1, "search", None,
+                               time.time() + 60])["board"],
+             puzzle1soln.board)
+check.expect("Tsrv4", run_job(["count", puzzle1, "search", 2,
+                               time.time() + 60])["unique"], True)
+check.expect("Tsrv5", run_job(["solve", puzzle1, "search", None,
+                               time.time() - 1]), None)
+for data in ["1\\nab\\nab 1 =", "2\\na b\\na b\\na 2 /",
+             {"size": 1, "board": [["a"]], "constraints": []}]:
+    try:
+        puzzle_from_json(data)
+        check.expect("Tsrv6", "accepted", "ValueError")
+    except ValueError:
+        check.expect("Tsrv6", "ValueError", "ValueError")
+server = SolverServer()
+body = json.dumps({"puzzle": format_puzzle(puzzle1)}).encode("utf-8")
+check.expect("Tsrv7", asyncio.run(server.route("POST", "/validate", body,
+                                               time.time()))[0], 400)
+body = json.dumps({"puzzle": format_puzzle(puzzle1),
+                   "engine": ["search"]}).encode("utf-8")
+check.expect("Tsrv8", asyncio.run(server.route("POST", "/solve", body,
+                                               time.time()))[0], 400)
+
+
+async def respond_to(request):
+    reader = asyncio.StreamReader()
+    reader.feed_data(request)
+    reader.feed_eof()
+    return await server.respond(reader)
+
+
+check.expect("Tsrv9", asyncio.run(respond_to(
+    b"POST /solve HTTP/1.1\\r\\nContent-Length: -5\\r\\n\\r\\n"))[0], 400)
+'''
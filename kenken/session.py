@@ -0,0 +1,225 @@
+'''
+Solving a puzzle again after small edits: SolverSession.
+'''
+
+import copy  # copies nested list to avoid mutating the caller's puzzle
+
+from kenken.dlx import algorithm_x, exact_cover_matrix, solve_kenken_dlx
+from kenken.flat import flatten_puzzle
+from kenken.puzzle import Guess, Puzzle
+from kenken.solutions import check_solution
+
+
+## ******** SOLVER SESSIONS ***************
+
+## A puzzle editor changes one cage rule or one number at a time and
+## wants the puzzle solved again after each change. A SolverSession
+## keeps what the last solve found so that little of it is redone:
+##   - the last solution found: if it still solves the edited puzzle (see
+##     check_solution), which is the usual case for a new given number
+##     taken from it, for a rule it still meets, or for undoing an edit
+##     which left the puzzle with no solution, it is the answer;
+##   - the ways of filling each cage (see exact_cover_matrix), keyed by
+##     the cage's rule and the numbers its cells may still hold, so only
+##     the cages an edit touches are listed again before the exact cover
+##     search.
+## A number fixed in a cage's cell is kept as a Guess, so the cell stays
+## part of its cage and the cage's rule still counts it; it can then be
+## cleared again. Numbers filled in in the puzzle the session started
+## with belong to no cage, so they can be changed but not cleared.
+
+## the most ways of filling cages kept, per cage, before they are dropped
+TABLE_LIMIT = 8
+
+
+class SolverSession:
+    '''
+    Fields:
+       puz (Puzzle)
+       solution (anyof Puzzle False None)
+       solved (Bool)
+       found (anyof Puzzle None)
+       table (dictof Any (listof (tupleof Nat)))
+       searches (Nat)
+       Requires:
+          puz is the puzzle after every edit so far.
+          solution is the solution of puz (False if it has none) if
+            solved is True.
+          found is the last solution found for any version of puz, or
+            None if none has been found.
+          table is the table passed to exact_cover_matrix.
+          searches counts the solves which needed a search.
+    '''
+
+    def __init__(self, puz):
+        '''
+        Initializes a SolverSession for a copy of puz.
+
+        Effects: Mutates self
+
+        __init__: SolverSession Puzzle -> None
+        '''
+        self.puz = Puzzle(puz.size, [row[:] for row in puz.board],
+                          copy.deepcopy(puz.constraints))
+        self.solution = None
+        self.solved = False
+        self.found = None
+        self.table = {}
+        self.searches = 0
+
+    def __repr__(self):
+        '''
+        Returns a string representation of self.
+
+        __repr__: SolverSession -> Str
+        '''
+        return "SolverSession(size={0}, solved={1}, searches={2})".format(
+            self.puz.size, self.solved, self.searches)
+
+    def set_constraint(self, symbol, target, op):
+        '''
+        Changes the rule of the cage symbol to target and op, or raises
+        ValueError if there is no such cage.
+
+        Effects: Mutates self
+
+        set_constraint: SolverSession Str Nat
+                        (anyof '+' '-' '*' '/' '=') -> None
+        '''
+        constraints = copy.deepcopy(self.puz.constraints)
+        for con in constraints:
+            if con[0] == symbol:
+                con[1] = target
+                con[2] = op
+                break
+        else:
+            raise ValueError("there is no cage " + repr(symbol))
+        self.puz = Puzzle(self.puz.size, self.puz.board, constraints,
+                          self.puz.cages, self.puz.rows, self.puz.cols)
+        self.solved = False
+
+    def set_cell(self, x, y, item):
+        '''
+        Replaces the cell (x, y) of self.puz with item.
+
+        Effects: Mutates self
+
+        set_cell: SolverSession Nat Nat (anyof Str Nat Guess) -> None
+        '''
+        board = self.puz.board[:]
+        board[y] = board[y][:]
+        board[y][x] = item
+        self.puz = Puzzle(self.puz.size, board, self.puz.constraints,
+                          self.puz.cages)
+        self.solved = False
+
+    def fix_cell(self, x, y, num):
+        '''
+        Fills in num in the cell (x, y), or raises ValueError if num is
+        not a number from 1 to the puzzle's size.
+
+        Effects: Mutates self
+
+        fix_cell: SolverSession Nat Nat Nat -> None
+        '''
+        n = self.puz.size
+        if type(num) != int or not 1 <= num <= n:
+            raise ValueError("expected a number from 1 to " + str(n))
+        item = self.puz.board[y][x]
+        if isinstance(item, Guess):
+            item = item.symbol
+        if isinstance(item, str):
+            self.set_cell(x, y, Guess(item, num))
+        else:
+            self.set_cell(x, y, num)
+
+    def clear_cell(self, x, y):
+        '''
+        Clears a number fixed in the cell (x, y) by fix_cell, or raises
+        ValueError if the cell is not in a cage.
+
+        Effects: Mutates self
+
+        clear_cell: SolverSession Nat Nat -> None
+        '''
+        item = self.puz.board[y][x]
+        if isinstance(item, Guess):
+            self.set_cell(x, y, item.symbol)
+        elif not isinstance(item, str):
+            raise ValueError("cell ({0}, {1}) is not in a cage".format(x, y))
+
+    def limit_table(self):
+        '''
+        Empties self.table once it holds more than TABLE_LIMIT entries
+        per cage, so that a long session does not keep the ways of
+        filling cages which edits have made stale.
+
+        Effects: Mutates self
+
+        limit_table: SolverSession -> None
+        '''
+        if len(self.table) > TABLE_LIMIT * len(self.puz.constraints):
+            self.table = {}
+
+    def solve(self):
+        '''
+        Returns a solution of self.puz, or False if it has none, reusing
+        the last solution found if it still holds.
+
+        Effects: Mutates self
+
+        solve: SolverSession -> (anyof Puzzle False)
+
+        Example:
+           SolverSession(puzzle1).solve() => puzzle1soln
+        '''
+        if self.solved:
+            return self.solution
+        self.solved = True
+        if self.found != None and \
+           check_solution(self.puz, self.found.board) == None:
+            self.solution = self.found
+            return self.solution
+        self.limit_table()
+        self.solution = solve_kenken_dlx(self.puz, self.table)
+        self.searches += 1
+        if self.solution != False:
+            self.found = self.solution
+        return self.solution
+
+    def count(self, limit=2):
+        '''
+        Returns the number of solutions of self.puz, counting no further
+        than limit (None for no limit), like count_solutions.
+
+        Effects: Mutates self
+
+        count: SolverSession (anyof Nat None) -> Nat
+        '''
+        self.limit_table()
+        X, Y, choices = exact_cover_matrix(flatten_puzzle(self.puz),
+                                           self.table)
+        count = 0
+        for rows in algorithm_x(X, Y, []):
+            count += 1
+            if count == limit:
+                break
+        return count
+
+
+'''
+session = SolverSession(puzzle1)
+check.expect("Tses1", session.solve(), puzzle1soln)
+check.expect("Tses2", session.count(), 1)
+session.fix_cell(0, 0, 2)
+check.expect("Tses3", [session.solve(), session.searches], [puzzle1soln, 1])
+session.fix_cell(0, 0, 1)
+check.expect("Tses4", session.solve(), False)
+session.clear_cell(0, 0)
+check.expect("Tses5", [session.solve(), session.searches], [puzzle1soln, 2])
+session.set_constraint('a', 4, '+')
+check.expect("Tses6", session.count(None), 0)
+session.set_constraint('a', 6, '*')
+check.expect("Tses7", session.solve(), puzzle1soln)
+check.expect("Tses8", puzzle1.constraints[0], ['a', 6, '*'])
+'''
@@ -0,0 +1,144 @@
+'''
+Every solution of a puzzle: iter_solutions and count_solutions.
+'''
+
+from kenken.dlx import algorithm_x, exact_cover_matrix
+from kenken.flat import FlatPuzzle, flatten_puzzle, unflatten_puzzle
+from kenken.puzzle import Guess
+from kenken.symmetry import puzzle_symmetries, solution_orbit
+from kenken.tables import cage_satisfied
+from kenken.trail import trail_search
+
+
+## ******** ALL SOLUTIONS ***************
+
+## Both searches below are generators, so they stop as soon as the caller
+## stops asking: iter_solutions builds each solution only when it is
+## needed, and count_solutions gives up after limit solutions, which is
+## all a uniqueness check needs (limit=2).
+##
+## With symmetry=True both use the symmetries of the puzzle (see
+## symmetry.py) to search each orbit of solutions only once:
+## iter_solutions then produces one solution of each orbit, and
+## count_solutions adds up the sizes of the orbits it finds, so it still
+## counts every solution.
+
+
+def iter_solutions(puz, symmetry=False):
+    '''
+    Produces every solution of puz, one at a time, starting with the one
+    solve_kenken returns, or only the lex leader of each orbit if
+    symmetry is True.
+
+    iter_solutions: Puzzle Bool -> (generatorof Puzzle)
+
+    Example:
+       list(iter_solutions(puzzle1)) => [puzzle1soln]
+    '''
+    fp = flatten_puzzle(puz)
+    symmetries = None
+    if symmetry:
+        symmetries = puzzle_symmetries(fp)
+    for cells in trail_search(fp, symmetries):
+        yield unflatten_puzzle(FlatPuzzle(fp.size, cells[:], fp.cages,
+                                          fp.constraints,
+                                          len(fp.constraints)))
+
+
+def count_solutions(puz, limit=2, symmetry=False):
+    '''
+    Returns the number of solutions of puz, counting no further than
+    limit (None for no limit). So puz has a unique solution exactly when
+    count_solutions(puz) == 1. If symmetry is True, only one solution of
+    each orbit is searched for (see above).
+
+    count_solutions: Puzzle (anyof Nat None) Bool -> Nat
+
+    Examples:
+       count_solutions(puzzle1) => 1
+       count_solutions(puzzle1partial4a) => 0
+    '''
+    if symmetry:
+        fp = flatten_puzzle(puz)
+        symmetries = puzzle_symmetries(fp)
+        count = 0
+        for cells in trail_search(fp, symmetries):
+            count += solution_orbit(cells, symmetries)
+            if limit != None and count >= limit:
+                return limit
+        return count
+    X, Y, choices = exact_cover_matrix(flatten_puzzle(puz))
+    count = 0
+    for rows in algorithm_x(X, Y, []):
+        count += 1
+        if count == limit:
+            break
+    return count
+
+
+def check_solution(puz, board):
+    '''
+    Returns None if board, a list of rows of numbers, solves puz, and
+    otherwise a string saying what is wrong with it.
+
+    check_solution: Puzzle Any -> (anyof Str None)
+
+    Examples:
+       check_solution(puzzle1, puzzle1soln.board) => None
+       check_solution(puzzle1, [[1]]) =>
+          "expected 4 rows of 4 numbers from 1 to 4"
+    '''
+    n = puz.size
+    if not isinstance(board, list) or len(board) != n:
+        return "expected {0} rows of {0} numbers from 1 to {0}".format(n)
+    for row in board:
+        if not isinstance(row, list) or len(row) != n or \
+           not all(type(num) == int and 1 <= num <= n for num in row):
+            return "expected {0} rows of {0} numbers from 1 to {0}".format(n)
+    for y in range(n):
+        for x in range(n):
+            item = puz.board[y][x]
+            if isinstance(item, Guess):
+                item = item.number
+            if isinstance(item, int) and board[y][x] != item:
+                return "cell ({0}, {1}) must be {2}".format(x, y, item)
+    for i in range(n):
+        if len(set(board[i])) != n:
+            return "row {0} repeats a number".format(i)
+        if len(set(row[i] for row in board)) != n:
+            return "column {0} repeats a number".format(i)
+    for symbol, target, op in puz.constraints:
+        nums = [board[pos.y][pos.x] for pos in puz.cages.get(symbol, [])]
+        if not cage_satisfied(op, target, nums):
+            return "cage {0} does not make {1}{2}".format(symbol, target, op)
+    return None
+
+
+'''
+twice = Puzzle(2, [['a', 'a'], ['b', 'b']], [['a', 3, '+'], ['b', 3, '+']])
+check.expect("Tsol1", list(iter_solutions(puzzle1)), [puzzle1soln])
+check.expect("Tsol2", [sol.board for sol in iter_solutions(twice)],
+             [[[1, 2], [2, 1]], [[2, 1], [1, 2]]])
+check.expect("Tsol3", next(iter_solutions(puzzle1partial)),
+             solve_kenken(puzzle1partial))
+check.expect("Tsol4", count_solutions(puzzle1), 1)
+check.expect("Tsol5", count_solutions(puzzle1partial4a), 0)
+check.expect("Tsol6", count_solutions(twice), 2)
+check.expect("Tsol7", count_solutions(twice, 1), 1)
+check.expect("Tsol8", count_solutions(Puzzle(3, [['a'] * 3] * 3,
+                                             [['a', 216, '*']]), None), 12)
+check.expect("Tsol9", check_solution(puzzle1, puzzle1soln.board), None)
+check.expect("Tsol10", check_solution(puzzle1partial, [[1, 2, 3, 4]] * 4),
+             "cell (2, 1) must be 1")
+check.expect("Tsol11", check_solution(twice, [[1, 2], [1, 2]]),
+             "column 0 repeats a number")
+check.expect("Tsol12", check_solution(puzzle1, [[3, 2, 4, 1], [2, 1, 3, 4],
+                                                [1, 4, 2, 3], [4, 3, 1, 2]]),
+             "cage b does not make 3-")
+check.expect("Tsol13", count_solutions(twice, None, True), 2)
+check.expect("Tsol14", [sol.board for sol in iter_solutions(twice, True)],
+             [[[1, 2], [2, 1]]])
+check.expect("Tsol15", count_solutions(Puzzle(3, [['a'] * 3] * 3,
+                                              [['a', 216, '*']]),
+                                       None, True), 12)
+'''
@@ -0,0 +1,449 @@
+'''
+The cage by cage search: solve_kenken and the functions it is built from.
+'''
+
+import copy  # copies nested list to avoid mutating the consumed lists
+import time  # timings for SolveStats
+
+from kenken.ordering import ORDERINGS, reorder_constraints
+from kenken.puzzle import Guess, Posn, Puzzle, cell_number, puzzle_key
+from kenken.tables import cage_feasible
+
+
+## ******** DO NOT CHANGE THESE FUNCTIONS ***************
+
+
+def fill_in_guess(puz, pos, val):
+    '''
+    Fills in the pos Position of puz's board with a guess with value val.
+
+    fill_in_guess: Puzzle Posn Nat -> Puzzle
+    Requires:
+       1 <= val <= len(puz.board)
+       0 <= pos.x < puz.size
+       0 <= pos.y < puz.size
+    '''
+
+    board = place_guess(copy.deepcopy(puz.board), pos, val)
+    rows = puz.rows[:]
+    cols = puz.cols[:]
+    rows[pos.y] = 0
+    cols[pos.x] = 0
+    for i in range(puz.size):
+        rows[pos.y] |= (1 << cell_number(board[pos.y][i])) & ~1
+        cols[pos.x] |= (1 << cell_number(board[i][pos.x])) & ~1
+    return Puzzle(puz.size, board, copy.deepcopy(puz.constraints),
+                  puz.cages, rows, cols)
+
+
+def solve_kenken(orig, order=None, stats=None):
+    '''
+    Finds the solution to a KenKen puzzle, orig, or returns False
+    if there is no solution.
+
+    order chooses which cage is filled in next; it is either an
+    Ordering or the name of one in ORDERINGS. By default cages are
+    filled in the order of orig.constraints.
+
+    If stats (a SolveStats) is given, the counts and timings of the
+    search are added to it.
+
+    Effects: Mutates stats, if it is given
+
+    solve-kenken: Puzzle (anyof Ordering Str None) (anyof SolveStats None)
+                  -> (anyof Puzzle False)
+    '''
+    if isinstance(order, str):
+        order = ORDERINGS[order]
+    if stats != None:
+        start = time.perf_counter()
+
+    ## to_visit is used as a stack: the last element is the next puzzle
+    ## to visit, so the neighbours of a puzzle are pushed in reverse
+    ## order. Each entry is a (key, puzzle, depth) triple, where key is
+    ## puzzle_key(puzzle), so that visited can be a set of keys.
+    ## Neighbours whose current cage can no longer be satisfied
+    ## (guess_valid is False) are dropped before they are pushed.
+    to_visit = [(puzzle_key(orig), orig, 0)]
+    visited = set()
+    sol = False
+    while to_visit != []:
+        key, puz, depth = to_visit.pop()
+        if find_blank(puz) == False:
+            sol = puz
+            break
+        elif key not in visited:
+            visited.add(key)
+            if stats == None:
+                nbrs = neighbours(puz, order)
+            else:
+                stats.nodes += 1
+                stats.event('expand', depth, puz)
+                nbrs = stats.timed('neighbours', neighbours, puz, order,
+                                   stats)
+            new = []
+            for nbr in nbrs:
+                nbr_key = puzzle_key(nbr)
+                if nbr_key in visited:
+                    continue
+                if stats == None:
+                    if guess_valid(nbr):
+                        new.append((nbr_key, nbr, depth + 1))
+                elif stats.timed('guess_valid', guess_valid, nbr):
+                    new.append((nbr_key, nbr, depth + 1))
+                else:
+                    stats.pruned_arith += 1
+                    stats.event('prune', depth + 1, nbr)
+            new.reverse()
+            to_visit.extend(new)
+            if stats != None and len(to_visit) > stats.peak_frontier:
+                stats.peak_frontier = len(to_visit)
+
+    if stats != None:
+        if sol != False:
+            stats.event('solved', depth, sol)
+        stats.visited = len(visited)
+        stats.seconds += time.perf_counter() - start
+    return sol
+
+
+## ******** END OF PROVIDED FUNCTIONS ***************
+
+
+# part c)
+
+def find_blank(puz):
+    '''
+      If no cells are blank, returns False.
+
+      Otherwise, if the first constraint has only guesses
+      on the board, returns 'guess'.
+
+      Otherwise, returns the position of the
+      first blank space corresponding to
+      the first constraint.
+
+    find_blank: Puzzle -> (anyof Posn False 'guess')
+
+    Examples:
+       find_blank(puzzle1) => Posn(0, 0)
+       find_blank(puzzle1partial2) => Posn(0, 1)
+       find_blank(puzzle1partial3) => 'guess'
+       find_blank(puzzle1soln) => False
+    '''
+    if len(puz.constraints) == 0:
+        return False
+    for x in puz.constraints:
+        constraint = x[0]
+        cells = puz.cages.get(constraint, [])
+        for pos in cells:
+            if isinstance(puz.board[pos.y][pos.x], str):
+                return Posn(pos.x, pos.y)
+        for pos in cells:
+            if isinstance(puz.board[pos.y][pos.x], Guess):
+                return 'guess'
+
+    pass
+
+
+'''
+check.expect("Tc1", find_blank(puzzle1), Posn(0, 0))
+check.expect("Tc2", find_blank(puzzle1partial2), Posn(0, 1))
+check.expect("Tc3", find_blank(puzzle1partial3), 'guess')
+check.expect("Tc4", find_blank(puzzle1soln), False)
+'''
+
+
+# part d)
+
+
+def available_vals(puz, pos):
+    '''
+    Returns a list of distinct valid entries in increasing
+    order for the (x,y) position pos, of puz based on
+    the row and column constraints. That is, the entries
+    are those that do not conflict with any numbers that
+    have been filled in or guessed for the same row or
+    column as pos.
+
+    (We completely ignore arithmetic constraints here.)
+
+    available_vals: Puzzle Posn -> (listof Nat)
+    Requires:
+      0 <= pos.x < puz.size
+      0 <= pos.y < puz.size
+
+    Examples:
+       available_vals(puzzle1partial, Posn(2,2)) => [2, 4]
+       available_vals(puzzle1partial3, Posn(0,3)) => [1, 4]
+    '''
+    if (pos.x >= 0 and pos.x < puz.size) and (pos.y >= 0 and pos.y < puz.size):
+        if isinstance(puz.board[pos.y][pos.x], str):
+            constraint = puz.board[pos.y][pos.x]
+            for c in puz.constraints:
+                if c[0] == constraint:
+                    ## the cell at pos holds a symbol, so it is not
+                    ## counted in its own row or column mask
+                    used = puz.rows[pos.y] | puz.cols[pos.x]
+                    distinct_values = []
+                    for i in range(1, puz.size + 1):
+                        if not used & (1 << i):
+                            distinct_values.append(i)
+                    return distinct_values
+        else:
+            return []
+    pass
+
+
+'''
+check.expect("Td1", available_vals(puzzle1partial, Posn(2,2)), [2, 4])
+check.expect("Td2", available_vals(puzzle1partial3, Posn(0,3)), [1, 4])
+'''
+
+
+# part e)
+
+def place_guess(brd, pos, val):
+    '''
+    Fills in the (x,y) position, pos, of the
+    board, brd, with a Guess with value, val.
+
+    place_guess: Board Posn Nat -> Board
+    Requires:
+        0 <= pos.x < len(brd)
+        0 <= pos.y < len(brd)
+        1 <= val <= len(brd)
+        brd at posn contains either a Str or a Guess
+
+    Example:
+       place_guess(puzzle1partial2.board,Posn(0,1),3)
+          => puzzle1partial3.board
+    '''
+    ## A copy of brd is assigned to res without any
+    ## aliasing to avoid mutation of brd.
+    ## You should update res and return it
+    res = copy.deepcopy(brd)
+
+    item = res[pos.y][pos.x]
+    if (pos.x >= 0 and pos.x < len(brd)) and \
+       (pos.y >= 0 and pos.y < len(brd)) and (val >= 1 and val <= len(brd)):
+        if isinstance(item, str):
+            res[pos.y][pos.x] = Guess(item, val)
+        elif isinstance(item, Guess):
+            res[pos.y][pos.x] = Guess(item.symbol, val)
+        return res
+    pass
+
+
+'''
+check.expect("Te1", place_guess(puzzle1partial2.board, 
+       Posn(0,1),3), puzzle1partial3.board)
+check.expect("Te2", place_guess(puzzle1partial4a.board, 
+       Posn(2,0),4), puzzle1partial4b.board)
+
+## Note that fill_in_guess calls place_guess
+check.expect("Te3", fill_in_guess(puzzle1, Posn(3,2),4), 
+       Puzzle(4,[['a','b','b','c'],
+            ['a','d','e','e'],
+            ['f','d','g',Guess('g',4)],
+            ['f','h','i','i']], puzzle1.constraints))
+'''
+
+
+# part f)
+
+
+def guess_valid(puz):
+    '''
+    Returns True if the Guesses in puz corresponding to the
+    symbol in the first constraint satisfy their constraint
+    arithmetically and returns False otherwise.
+
+    If some cells of that cage are still blank, returns True only if
+    the Guesses so far can still be completed to satisfy the
+    constraint (see cage_feasible), so a hopeless cage is cut off
+    before it is filled in. Only the cage's own cells are looked at,
+    and all arithmetic is exact.
+
+    (We completely ignore row and column constraints here.)
+
+    guess_valid: Puzzle -> Bool
+
+    Examples:
+       guess_valid(puzzle1partial3) => True
+       guess_valid(puzzle1partial4a) => False
+       guess_valid(puzzle1partial4b) => True
+       guess_valid(fill_in_guess(puzzle1, Posn(0, 0), 4)) => False
+    '''
+    if puz.constraints == []:
+        return True
+    symbol, ans, operation = puz.constraints[0]
+    nums = []
+    blanks = 0
+    for pos in puz.cages.get(symbol, []):
+        item = puz.board[pos.y][pos.x]
+        if isinstance(item, Guess):
+            nums.append(item.number)
+        elif isinstance(item, str):
+            blanks += 1
+    return cage_feasible(operation, ans, nums, blanks, puz.size)
+
+
+'''
+check.expect("Tf1", guess_valid(puzzle1partial3), True)
+check.expect("Tf2", guess_valid(puzzle1partial4a), False)
+check.expect("Tf3", guess_valid(puzzle1partial4b), True)
+check.expect("Tf4", guess_valid(fill_in_guess(puzzle1, Posn(0, 0), 4)), False)
+check.expect("Tf5", guess_valid(fill_in_guess(puzzle1, Posn(0, 0), 2)), True)
+'''
+
+
+# part g)
+
+def apply_guess(puz):
+    '''
+    Returns a new puzzle corresponding to converting
+    all guesses in puz into their corresponding
+    numbers and removes the first constraint from puz's
+    list of constraints.
+
+    apply_guess:  Puzzle -> Puzzle
+    Requires:
+       guess_valid(puz) => True
+       Guesses corresponding to the first constraint symbol
+       do not violate the row and column restriction
+
+    Example:
+       apply_guess(puzzle1partial3) => puzzle1partial4
+    '''
+    ## A copy of puz is assigned to res without any
+    ## aliasing to avoid mutation of puz.
+    ## You should update res and return it
+    res = Puzzle(puz.size, copy.deepcopy(puz.board),
+                 copy.deepcopy(puz.constraints), puz.cages, puz.rows,
+                 puz.cols)
+
+    letter_con = res.constraints[0][0]
+    for pos in res.cages.get(letter_con, []):
+        if isinstance(res.board[pos.y][pos.x], Guess):
+            res.board[pos.y][pos.x] = res.board[pos.y][pos.x].number
+    res.constraints.pop(0)
+    return res
+
+    pass
+
+
+'''
+check.expect("Tg1", apply_guess(puzzle1partial3), puzzle1partial4)        
+'''
+
+
+# print(apply_guess(puzzle1partial3))
+# part h)
+
+
+def neighbours(puz, order=None, stats=None):
+    '''
+    Returns a list of next puzzles after puz
+    as described in the assignment specification.
+
+    If order is given and no cage has been started (there are no
+    Guesses on the board), the constraint order picks is moved to the
+    front first, so it becomes the cage that is filled in next.
+
+    If stats (a SolveStats) is given, the values ruled out by rows and
+    columns, and the time spent in available_vals and guess_valid, are
+    added to it.
+
+    Effects: Mutates stats, if it is given
+
+    neighbours: Puzzle (anyof Ordering None) (anyof SolveStats None)
+                -> (listof Puzzle)
+
+    Examples:
+       neighbours(puzzle1soln) => []
+       neighbours(puzzle2a) => [puzzle2b]
+    '''
+    ## a copy of puz is assigned to tmp without any
+    ## aliasing to avoid mutation of puz.
+    tmp = Puzzle(puz.size, copy.deepcopy(puz.board),
+                 copy.deepcopy(puz.constraints), puz.cages, puz.rows,
+                 puz.cols)
+    if order != None:
+        tmp = reorder_constraints(tmp, order)
+
+    ##YOUR CODE GOES HERE
+    puzzles = []
+    if len(tmp.constraints) > 0:
+        constraint = tmp.constraints[0]
+        pos = None
+        for cell in tmp.cages.get(constraint[0], []):
+            if isinstance(tmp.board[cell.y][cell.x], str):
+                pos = cell
+                break
+
+        if pos != None:
+            if stats == None:
+                values = available_vals(tmp, pos)
+            else:
+                values = stats.timed('available_vals', available_vals,
+                                     tmp, pos)
+                stats.pruned_line += tmp.size - len(values)
+            for val in values:
+                puzzles.append(fill_in_guess(tmp, pos, val))
+            return puzzles
+        else:
+            if stats == None:
+                valid = guess_valid(tmp)
+            else:
+                valid = stats.timed('guess_valid', guess_valid, tmp)
+            if valid:
+                puzzle = apply_guess(tmp)
+                puzzles.append(puzzle)
+                return puzzles
+            else:
+                if stats != None:
+                    stats.pruned_arith += 1
+                return []
+    else:
+        return []
+    pass
+
+
+'''  
+check.expect("Th1", neighbours(puzzle1soln), [])
+check.expect("Th2", neighbours(puzzle1), puzzle1_first_guess)
+check.expect("Th3", neighbours(puzzle2a),[puzzle2b])
+check.expect("Th4", neighbours(puzzle2c), [])
+'''
+
+'''
+check.expect("Tidx1", puzzle1partial3.cages['a'], [Posn(0,0), Posn(0,1)])
+check.expect("Tidx2", puzzle1partial.rows, [0, 22, 8, 0])
+check.expect("Tidx3", fill_in_guess(puzzle1partial, Posn(2,2), 4).cols,
+             [0, 12, 18, 16])
+check.expect("Tidx4", neighbours(puzzle1)[0].cages is puzzle1.cages, True)
+'''
+
+##Final Tests:
+
+'''
+check.expect("game1",solve_kenken(puzzle1), puzzle1soln)
+check.expect("game2",solve_kenken(puzzle1partial), puzzle1soln)
+check.expect("game3",solve_kenken(puzzle1partial2), puzzle1soln)
+check.expect("game4",solve_kenken(puzzle1partial3), puzzle1soln)
+check.expect("game5",solve_kenken(puzzle1partial4), puzzle1soln)
+check.expect("game6 (fail)",solve_kenken(puzzle1partial4a), False)
+check.expect("game7",solve_kenken(puzzle1partial4b), puzzle1soln)
+check.expect("game8",solve_kenken(puzzle1soln), puzzle1soln)
+'''
+
+'''
+stats = SolveStats()
+check.expect("Tstats1", solve_kenken(puzzle1, None, stats), puzzle1soln)
+check.expect("Tstats2", [stats.nodes, stats.pruned_arith, stats.visited],
+             [29, 7, 29])
+stats = SolveStats()
+check.expect("Tstats3", solve_kenken(puzzle1partial4a, None, stats), False)
+check.expect("Tstats4", stats.pruned_arith, 1)
+'''
@@ -0,0 +1,122 @@
+'''
+Counters and timers describing one run of solve_kenken: SolveStats.
+'''
+
+import time
+
+
+## ******** SEARCH STATISTICS ***************
+
+## solve_kenken, neighbours and the functions they call take an optional
+## SolveStats, stats. When stats is None (the default) they do no extra
+## work beyond one comparison per call, so the statistics cost nothing
+## unless they are asked for.
+##
+## A trace callback, if given, is called as trace(event, depth, puz) for
+## each of these events, where depth is the number of puzzles between
+## puz and the puzzle the search started from:
+##   'expand'  puz is having its neighbours computed
+##   'prune'   puz, a neighbour, was dropped by guess_valid
+##   'solved'  puz is the solution
+
+
+class SolveStats:
+    '''
+    Fields:
+       nodes (Nat)
+       pruned_line (Nat)
+       pruned_arith (Nat)
+       peak_frontier (Nat)
+       visited (Nat)
+       max_depth (Nat)
+       times (dictof Str Float)
+       seconds (Float)
+       trace (anyof (Str Nat Puzzle -> Any) None)
+       Requires:
+          nodes is the number of puzzles whose neighbours were computed
+          pruned_line is the number of values available_vals ruled out
+            because they were already in the cell's row or column
+          pruned_arith is the number of neighbours dropped because their
+            cage could no longer satisfy its arithmetic
+          peak_frontier is the largest size reached by the stack of
+            puzzles still to visit, and visited the final size of the
+            visited set
+          times maps 'neighbours', 'available_vals' and 'guess_valid' to
+            the seconds spent in them (neighbours includes the others
+            it calls), and seconds is the time of the whole search
+    '''
+
+    def __init__(self, trace=None):
+        '''
+        Initializes a SolveStats with every count at 0.
+
+        Effects: Mutates self
+
+        __init__: SolveStats (anyof (Str Nat Puzzle -> Any) None) -> None
+        '''
+        self.nodes = 0
+        self.pruned_line = 0
+        self.pruned_arith = 0
+        self.peak_frontier = 0
+        self.visited = 0
+        self.max_depth = 0
+        self.times = {'neighbours': 0.0, 'available_vals': 0.0,
+                      'guess_valid': 0.0}
+        self.seconds = 0.0
+        self.trace = trace
+
+    def __repr__(self):
+        '''
+        Returns a string representation of self.
+
+        __repr__: SolveStats -> Str
+        '''
+        return "SolveStats(nodes={0}, pruned_line={1}, pruned_arith={2}, " \
+               "peak_frontier={3}, visited={4}, max_depth={5}, " \
+               "seconds={6:.6f})".format(
+                   self.nodes, self.pruned_line, self.pruned_arith,
+                   self.peak_frontier, self.visited, self.max_depth,
+                   self.seconds)
+
+    def timed(self, name, f, *args):
+        '''
+        Returns f(*args), adding the seconds it took to self.times[name].
+
+        Effects: Mutates self
+
+        timed: SolveStats Str (Any -> Any) Any -> Any
+        '''
+        start = time.perf_counter()
+        res = f(*args)
+        self.times[name] += time.perf_counter() - start
+        return res
+
+    def event(self, name, depth, puz):
+        '''
+        Records that puz, at depth depth, had event name, and passes it
+        to self.trace if there is one.
+
+        Effects: Mutates self, calls self.trace
+
+        event: SolveStats Str Nat Puzzle -> None
+        '''
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self.trace != None:
+            self.trace(name, depth, puz)
+
+    def as_dict(self):
+        '''
+        Returns the fields of self (other than trace) as a dictionary,
+        for reports such as a line of JSON.
+
+        as_dict: SolveStats -> (dictof Str Any)
+
+        Example:
+           SolveStats().as_dict()['nodes'] => 0
+        '''
+        return {'nodes': self.nodes, 'pruned_line': self.pruned_line,
+                'pruned_arith': self.pruned_arith,
+                'peak_frontier': self.peak_frontier,
+                'visited': self.visited, 'max_depth': self.max_depth,
+                'times': dict(self.times), 'seconds': self.seconds}
@@ -0,0 +1,166 @@
+'''
+Symmetries of a puzzle and lex-leader symmetry breaking:
+puzzle_symmetries, lex_leader and solution_orbit.
+'''
+
+from kenken.flat import GUESS_FLAG, NO_CAGE
+from kenken.tables import cage_tuples
+
+
+## ******** SYMMETRY BREAKING ***************
+
+## A symmetry of a puzzle maps every solution to another solution. The
+## ones found here move the cells by one of the 8 symmetries of the
+## square (see cache.transform) and then, possibly, replace every number
+## v by size + 1 - v. Such a map is a symmetry of a puzzle when
+##   - every filled in (or guessed) number lands on a cell holding the
+##     number it is mapped to, and every blank cell on a blank cell;
+##   - every cage lands exactly on the cells of one cage, whose rule is
+##     met by the mapped numbers of exactly the tuples meeting the first
+##     cage's rule (so a 3- cage stays a 3- cage when the numbers are
+##     reversed, but a 5+ cage of two cells on a 4 by 4 board needs a
+##     5+ cage to land on).
+## The maps which are symmetries form a group, so the solutions fall into
+## orbits, sets of solutions the symmetries turn into one another, and
+## a search needs to visit only one solution of each orbit: the smallest
+## one, comparing the cells one by one in a fixed order (the lex
+## leader). A partly filled in board can already be ruled out once its
+## filled in cells, compared in that order, are greater than their
+## images under some symmetry, since every board below it in the search
+## is then greater too.
+##
+## A Symmetry is a (list (listof Nat) (listof Nat)), [src, vmap]: the
+## image of a board cells has vmap[cells[src[k]]] in cell k, for the
+## cells of a FlatPuzzle. vmap[0] is 0, so blank cells stay blank.
+##
+## Swapping the numbers of two cells of one + or * cage keeps the cage's
+## sum or product but moves numbers between rows and columns, so it is
+## not a symmetry of the whole puzzle and is not used.
+
+
+def puzzle_symmetries(fp):
+    '''
+    Returns the Symmetries of fp described above, leaving out the
+    identity.
+
+    puzzle_symmetries: FlatPuzzle -> (listof Symmetry)
+
+    Examples:
+       puzzle_symmetries(flatten_puzzle(puzzle1)) => []
+       len(puzzle_symmetries(flatten_puzzle(
+          Puzzle(2, [['a', 'a'], ['b', 'b']],
+                 [['a', 1, '-'], ['b', 1, '-']])))) => 7
+    '''
+    ## imported here so that importing kenken does not import sqlite3
+    from kenken.cache import transform
+    n = fp.size
+    decided = [val & ~GUESS_FLAG for val in fp.cells]
+    cage_cells = {}
+    for k in range(n * n):
+        if fp.cages[k] != NO_CAGE:
+            cage_cells.setdefault(fp.cages[k], []).append(k)
+    symmetries = []
+    for t in range(8):
+        dest = [0] * (n * n)
+        for k in range(n * n):
+            x, y = transform(t, k % n, k // n, n)
+            dest[k] = y * n + x
+        for flip in (False, True):
+            if t == 0 and not flip:
+                continue
+            vmap = list(range(n + 1))
+            if flip:
+                vmap = [0] + list(range(n, 0, -1))
+            if all(decided[dest[k]] == vmap[decided[k]] and
+                   (fp.cages[dest[k]] == NO_CAGE) ==
+                   (fp.cages[k] == NO_CAGE) for k in range(n * n)) and \
+               all(maps_cage(fp, cage_cells, c, dest, vmap)
+                   for c in cage_cells):
+                src = [0] * (n * n)
+                for k in range(n * n):
+                    src[dest[k]] = k
+                symmetries.append([src, vmap])
+    return symmetries
+
+
+def maps_cage(fp, cage_cells, c, dest, vmap):
+    '''
+    Returns True if the cells of cage number c of fp, moved by dest (the
+    cell each cell moves to) with their numbers mapped by vmap, land on
+    exactly one cage with an equivalent rule.
+
+    maps_cage: FlatPuzzle (dictof Nat (listof Nat)) Nat (listof Nat)
+               (listof Nat) -> Bool
+    '''
+    cells = cage_cells[c]
+    image = fp.cages[dest[cells[0]]]
+    if sorted(dest[k] for k in cells) != cage_cells.get(image):
+        return False
+    symbol, target, op = fp.constraints[c]
+    symbol2, target2, op2 = fp.constraints[image]
+    m = len(cells)
+    mapped = set(tuple(vmap[v] for v in vals)
+                 for vals in cage_tuples(op, target, m, fp.size))
+    return mapped == set(cage_tuples(op2, target2, m, fp.size))
+
+
+def lex_leader(cells, symmetries, order):
+    '''
+    Returns False if cells, a partly filled in board, is greater than its
+    image under one of symmetries when their cells are compared in order
+    (up to the first blank cell of either), and True otherwise.
+
+    lex_leader: (arrayof Int) (listof Symmetry) (listof Nat) -> Bool
+
+    Example:
+       lex_leader([2, 1, 1, 2], [[[1, 0, 3, 2], [0, 1, 2]]],
+                  [0, 1, 2, 3]) => False
+    '''
+    for src, vmap in symmetries:
+        for k in order:
+            a = cells[k]
+            b = vmap[cells[src[k]]]
+            if a == 0 or b == 0 or a < b:
+                break
+            if a > b:
+                return False
+    return True
+
+
+def solution_orbit(cells, symmetries):
+    '''
+    Returns the number of different boards cells, a solved board, is
+    turned into by the identity and symmetries, a group of Symmetries.
+
+    solution_orbit: (arrayof Int) (listof Symmetry) -> Nat
+
+    Example:
+       solution_orbit([1, 2, 2, 1], [[[1, 0, 3, 2], [0, 1, 2]]]) => 2
+    '''
+    boards = set([tuple(cells)])
+    for src, vmap in symmetries:
+        boards.add(tuple(vmap[cells[src[k]]] for k in range(len(cells))))
+    return len(boards)
+
+
+'''
+twice = flatten_puzzle(Puzzle(2, [['a', 'a'], ['b', 'b']],
+                              [['a', 1, '-'], ['b', 1, '-']]))
+check.expect("Tsym1", puzzle_symmetries(flatten_puzzle(puzzle1)), [])
+check.expect("Tsym2", len(puzzle_symmetries(twice)), 7)
+rows = Puzzle(3, [['a'] * 3, ['b'] * 3, ['c'] * 3],
+              [['a', 6, '+'], ['b', 6, '*'], ['c', 6, '+']])
+check.expect("Tsym3", len(puzzle_symmetries(flatten_puzzle(rows))), 7)
+check.expect("Tsym4", puzzle_symmetries(flatten_puzzle(
+    Puzzle(3, [['a', 'a', 1], ['b', 'b', 'c'], ['d', 'd', 'c']],
+           [['a', 5, '+'], ['b', 1, '-'], ['c', 1, '-'], ['d', 3, '/']]))),
+             [])
+check.expect("Tsym5", lex_leader([1, 2, 2, 1], puzzle_symmetries(twice),
+                                 [0, 1, 2, 3]), True)
+check.expect("Tsym6", lex_leader([2, 1, 1, 2], puzzle_symmetries(twice),
+                                 [0, 1, 2, 3]), False)
+check.expect("Tsym7", lex_leader([2, 0, 0, 0], puzzle_symmetries(twice),
+                                 [0, 1, 2, 3]), False)
+check.expect("Tsym8", solution_orbit([1, 2, 2, 1],
+                                     puzzle_symmetries(twice)), 2)
+'''
@@ -0,0 +1,219 @@
+'''
+Cage arithmetic and the memoized tables of valid cage assignments.
+'''
+
+from functools import lru_cache  # memoizes the cage tables across puzzles
+from itertools import combinations_with_replacement, permutations
+
+from kenken.puzzle import Guess
+
+
+## ******** CAGE TABLES ***************
+
+
+## The tables below list, for an operator, a target, a number of cells
+## and a board size, every way of filling the cage that satisfies its
+## arithmetic. They only depend on those four values, so they are
+## memoized and shared between cages and between puzzles.
+
+
+def cage_satisfied(op, target, nums):
+    '''
+    Returns True if the numbers nums of a complete cage satisfy the
+    operator op and target, using exact integer arithmetic only.
+
+    cage_satisfied: (anyof '+' '-' '*' '/' '=') Nat (listof Nat) -> Bool
+
+    Examples:
+       cage_satisfied('*', 6, [2, 3]) => True
+       cage_satisfied('/', 2, [4, 2]) => True
+       cage_satisfied('/', 2, [3, 2]) => False
+    '''
+    if op == '+':
+        return sum(nums) == target
+    elif op == '*':
+        prod = 1
+        for num in nums:
+            prod *= num
+        return prod == target
+    elif op == '-':
+        return len(nums) == 2 and abs(nums[0] - nums[1]) == target
+    elif op == '/':
+        return len(nums) == 2 and \
+               (nums[0] == nums[1] * target or nums[1] == nums[0] * target)
+    elif op == '=':
+        return len(nums) == 1 and nums[0] == target
+    return False
+
+
+def cage_feasible(op, target, nums, blanks, size):
+    '''
+    Returns True if a cage of an n = size puzzle, whose filled in cells
+    hold nums and which has blanks cells still blank, might still satisfy
+    the operator op and target, and False if it certainly cannot. Only
+    exact integer arithmetic is used; rows and columns are ignored.
+
+    cage_feasible: (anyof '+' '-' '*' '/' '=') Nat (listof Nat) Nat Nat
+                   -> Bool
+
+    Examples:
+       cage_feasible('+', 5, [4], 1, 4) => True
+       cage_feasible('+', 5, [4, 2], 1, 4) => False
+       cage_feasible('*', 6, [4], 1, 4) => False
+       cage_feasible('/', 2, [3], 1, 4) => False
+    '''
+    if blanks == 0:
+        return cage_satisfied(op, target, nums)
+    if op == '+':
+        total = sum(nums)
+        return total + blanks <= target <= total + blanks * size
+    elif op == '*':
+        prod = 1
+        for num in nums:
+            prod *= num
+        return target % prod == 0 and target // prod <= size ** blanks
+    elif op == '-':
+        if len(nums) + blanks != 2:
+            return False
+        elif nums == []:
+            return 0 <= target < size
+        return nums[0] - target >= 1 or nums[0] + target <= size
+    elif op == '/':
+        if len(nums) + blanks != 2:
+            return False
+        elif nums == []:
+            return 0 < target <= size
+        return nums[0] % target == 0 or nums[0] * target <= size
+    elif op == '=':
+        return nums == [] and blanks == 1 and 1 <= target <= size
+    return False
+
+
+@lru_cache(maxsize=None)
+def cage_multisets(op, target, count, size):
+    '''
+    Returns the multisets of count numbers from 1 to size (as sorted
+    tuples, in increasing order) which satisfy op and target.
+
+    cage_multisets: Str Nat Nat Nat -> (tupleof (tupleof Nat))
+
+    Examples:
+       cage_multisets('+', 5, 2, 4) => ((1, 4), (2, 3))
+       cage_multisets('*', 4, 3, 4) => ((1, 1, 4), (1, 2, 2))
+    '''
+    res = []
+    for combo in combinations_with_replacement(range(1, size + 1), count):
+        if cage_satisfied(op, target, list(combo)):
+            res.append(combo)
+    return tuple(res)
+
+
+@lru_cache(maxsize=None)
+def cage_tuples(op, target, count, size):
+    '''
+    Returns every ordering of every multiset in
+    cage_multisets(op, target, count, size), in increasing order.
+
+    cage_tuples: Str Nat Nat Nat -> (tupleof (tupleof Nat))
+
+    Example:
+       cage_tuples('-', 3, 2, 4) => ((1, 4), (4, 1))
+    '''
+    res = set()
+    for combo in cage_multisets(op, target, count, size):
+        res.update(permutations(combo))
+    return tuple(sorted(res))
+
+
+def cage_clashes(cells, size):
+    '''
+    Returns the pairs (i, j), i < j, of positions in cells (indices into
+    a FlatPuzzle's cells) that share a row or a column, and so must hold
+    different numbers.
+
+    cage_clashes: (listof Nat) Nat -> (listof (tuple Nat Nat))
+
+    Example:
+       cage_clashes([0, 1, 5], 4) => [(0, 1), (1, 2)]
+    '''
+    clashes = []
+    for i in range(len(cells)):
+        for j in range(i + 1, len(cells)):
+            if cells[i] // size == cells[j] // size or \
+               cells[i] % size == cells[j] % size:
+                clashes.append((i, j))
+    return clashes
+
+
+def tuple_fits(vals, doms, clashes):
+    '''
+    Returns True if each vals[i] is in the mask doms[i] and no pair of
+    positions in clashes holds the same number, and False otherwise.
+
+    tuple_fits: (tupleof Nat) (listof Nat) (listof (tuple Nat Nat)) -> Bool
+
+    Example:
+       tuple_fits((1, 1), [30, 30], [(0, 1)]) => False
+    '''
+    for i in range(len(vals)):
+        if not doms[i] & (1 << vals[i]):
+            return False
+    for i, j in clashes:
+        if vals[i] == vals[j]:
+            return False
+    return True
+
+
+def cage_assignments(puz, i):
+    '''
+    Returns a list of the positions of the cage of puz.constraints[i]
+    and a list of the tuples of numbers for those positions (in the same
+    order) that satisfy the cage's arithmetic, keep the cage's existing
+    guesses, and do not repeat a number in any row or column.
+
+    cage_assignments: Puzzle Nat -> (list (listof Posn) (listof (tupleof Nat)))
+    Requires: 0 <= i < len(puz.constraints)
+
+    Example:
+       cage_assignments(puzzle1, 0) =>
+          [[Posn(0,0), Posn(0,1)], [(2, 3), (3, 2)]]
+    '''
+    symbol, target, op = puz.constraints[i]
+    n = puz.size
+    full = (1 << (n + 1)) - 2
+    cells = []
+    doms = []
+    for pos in puz.cages.get(symbol, []):
+        item = puz.board[pos.y][pos.x]
+        if isinstance(item, Guess):
+            cells.append(pos)
+            doms.append(1 << item.number)
+        elif isinstance(item, str):
+            cells.append(pos)
+            doms.append(full)
+    for i in range(len(cells)):
+        pos = cells[i]
+        for j in range(n):
+            for item in (puz.board[pos.y][j], puz.board[j][pos.x]):
+                if isinstance(item, int):
+                    doms[i] &= ~(1 << item)
+    clashes = cage_clashes([pos.y * n + pos.x for pos in cells], n)
+    fits = []
+    for vals in cage_tuples(op, target, len(cells), n):
+        if tuple_fits(vals, doms, clashes):
+            fits.append(vals)
+    return [cells, fits]
+
+
+'''
+check.expect("Ttab1", cage_multisets('+', 5, 2, 4), ((1, 4), (2, 3)))
+check.expect("Ttab2", cage_tuples('/', 2, 2, 4),
+             ((1, 2), (2, 1), (2, 4), (4, 2)))
+check.expect("Ttab8", cage_feasible('+', 5, [4], 1, 4), True)
+check.expect("Ttab9", cage_feasible('+', 9, [1], 1, 4), False)
+check.expect("Ttab10", cage_feasible('*', 6, [4], 1, 4), False)
+check.expect("Ttab11", cage_feasible('*', 12, [1], 2, 4), True)
+check.expect("Ttab12", cage_feasible('-', 3, [2], 1, 4), False)
+check.expect("Ttab13", cage_feasible('/', 2, [3], 1, 4), False)
+check.expect("Ttab14", cage_feasible('/', 2, [4, 2], 0, 4), True)
+'''
@@ -0,0 +1,174 @@
+'''
+Depth first search on one board, changed in place and undone on
+backtracking: solve_kenken_trail.
+'''
+
+from array import array
+
+from kenken.flat import (GUESS_FLAG, FlatPuzzle, flatten_puzzle,
+                         unflatten_puzzle)
+from kenken.symmetry import lex_leader, puzzle_symmetries
+from kenken.tables import cage_feasible, cage_satisfied
+
+
+## ******** TRAIL ENGINE ***************
+
+## The cage by cage search of solve_kenken is a tree: every puzzle in it
+## is reached by exactly one sequence of guesses. So instead of copying
+## the puzzle for every neighbour, the trail engine keeps one working
+## board, fills in a cell in place to step into a neighbour, and records
+## the step on a trail. Backtracking pops the trail and undoes the step.
+## No visited set is needed, and each step costs O(1) memory. As in
+## solve_kenken, a cage that can no longer be satisfied (cage_feasible)
+## is abandoned before its remaining cells are filled in.
+##
+## Given the symmetries of the puzzle (see symmetry.py), the search also
+## abandons a board as soon as a cage is finished and the board is no
+## longer a lex leader, comparing cells in the order they are filled in,
+## so it reaches only one solution of each orbit.
+##
+## A Frame, F, is a (list Nat Nat Nat Nat), [cage, i, k, val]: cell k,
+## the i-th cell of cage number cage, was filled in with val.
+
+
+def trail_search(fp, symmetries=None):
+    '''
+    Produces the cells (with no guesses left) of every solution of fp, in
+    the order solve_kenken would reach them, or only the lex leader of
+    each orbit if symmetries (a group of Symmetries of fp, without the
+    identity) is given. The same array is changed in place between
+    solutions, so it must be copied to be kept.
+
+    trail_search: FlatPuzzle (anyof (listof Symmetry) None)
+                  -> (generatorof (arrayof Int))
+    '''
+    n = fp.size
+    cells = array('b', [val & ~GUESS_FLAG for val in fp.cells])
+    m = len(fp.constraints)
+    cage_cells = []
+    for c in range(m):
+        cage_cells.append([])
+    for k in range(n * n):
+        if fp.cages[k] >= fp.first:
+            cage_cells[fp.cages[k]].append(k)
+    rows = [0] * n
+    cols = [0] * n
+    for k in range(n * n):
+        rows[k // n] |= (1 << cells[k]) & ~1
+        cols[k % n] |= (1 << cells[k]) & ~1
+    full = (1 << (n + 1)) - 2
+    ## the blank cells in the order they are filled in, for lex_leader
+    order = []
+    for c in range(fp.first, m):
+        order.extend(k for k in cage_cells[c] if cells[k] == 0)
+    if symmetries == []:
+        symmetries = None
+
+    def feasible(cage):
+        ## cage_feasible on the current state of cage number cage
+        nums = []
+        blanks = 0
+        for k in cage_cells[cage]:
+            if cells[k] == 0:
+                blanks += 1
+            else:
+                nums.append(cells[k])
+        symbol, target, op = fp.constraints[cage]
+        return cage_feasible(op, target, nums, blanks, n)
+
+    trail = []
+    cage = fp.first
+    i = 0
+    while True:
+        ## step forward, filling in cells, until a solution or a dead end
+        ok = True
+        while cage < m:
+            members = cage_cells[cage]
+            while i < len(members) and cells[members[i]] != 0:
+                i += 1
+            if i == len(members):
+                symbol, target, op = fp.constraints[cage]
+                if not cage_satisfied(op, target,
+                                      [cells[k] for k in members]):
+                    ok = False
+                    break
+                if symmetries != None and \
+                   not lex_leader(cells, symmetries, order):
+                    ok = False
+                    break
+                cage += 1
+                i = 0
+                continue
+            if i > 0 and not feasible(cage):
+                ok = False
+                break
+            k = members[i]
+            free = full & ~(rows[k // n] | cols[k % n])
+            if free == 0:
+                ok = False
+                break
+            val = (free & -free).bit_length() - 1
+            cells[k] = val
+            rows[k // n] |= 1 << val
+            cols[k % n] |= 1 << val
+            trail.append([cage, i, k, val])
+            i += 1
+        if ok:
+            yield cells
+
+        ## backtrack to the most recent cell with another value to try
+        while True:
+            if trail == []:
+                return
+            cage, i, k, val = trail.pop()
+            bit = 1 << val
+            cells[k] = 0
+            rows[k // n] &= ~bit
+            cols[k % n] &= ~bit
+            free = full & ~(rows[k // n] | cols[k % n]) & ~((bit << 1) - 1)
+            if free != 0:
+                val = (free & -free).bit_length() - 1
+                cells[k] = val
+                rows[k // n] |= 1 << val
+                cols[k % n] |= 1 << val
+                trail.append([cage, i, k, val])
+                i += 1
+                break
+
+
+def solve_kenken_trail(orig, symmetry=False):
+    '''
+    Finds the solution to a KenKen puzzle, orig, or returns False if
+    there is no solution. Returns the same solution as solve_kenken, but
+    searches on one board changed in place (see trail_search). If
+    symmetry is True, subtrees which a symmetry of orig turns into ones
+    searched first are skipped, and the solution returned is the lex
+    leader of its orbit instead.
+
+    solve_kenken_trail: Puzzle Bool -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_trail(puzzle1) => puzzle1soln
+    '''
+    fp = flatten_puzzle(orig)
+    symmetries = None
+    if symmetry:
+        symmetries = puzzle_symmetries(fp)
+    for cells in trail_search(fp, symmetries):
+        return unflatten_puzzle(FlatPuzzle(fp.size, cells[:], fp.cages,
+                                           fp.constraints,
+                                           len(fp.constraints)))
+    return False
+
+
+'''
+check.expect("Ttrail1", solve_kenken_trail(puzzle1), puzzle1soln)
+check.expect("Ttrail2", solve_kenken_trail(puzzle1partial), puzzle1soln)
+check.expect("Ttrail3", solve_kenken_trail(puzzle1partial3), puzzle1soln)
+check.expect("Ttrail4", solve_kenken_trail(puzzle1partial4a), False)
+check.expect("Ttrail5", solve_kenken_trail(puzzle1partial4b), puzzle1soln)
+check.expect("Ttrail6", solve_kenken_trail(puzzle1soln), puzzle1soln)
+check.expect("Ttrail7", len(list(trail_search(flatten_puzzle(puzzle1)))), 1)
+check.expect("Ttrail8", solve_kenken_trail(puzzle1, True), puzzle1soln)
+check.expect("Ttrail9", solve_kenken_trail(puzzle1partial4a, True), False)
+'''
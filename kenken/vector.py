@@ -0,0 +1,298 @@
+'''
+Whole-board propagation on NumPy arrays: solve_kenken_vector and
+solve_kenken_vector_batch.
+
+This engine needs NumPy, which the rest of the package does not; it is
+only registered in batch.ENGINES when NumPy can be imported.
+'''
+
+import numpy as np
+
+from kenken.flat import flatten_puzzle
+from kenken.propagate import cage_groups, initial_domains
+from kenken.puzzle import Puzzle
+from kenken.tables import cage_clashes, cage_tuples
+
+
+## ******** VECTOR ENGINE ***************
+
+## A Tensor, T, is a NumPy bool array of shape (n, n, n): T[y, x, v - 1]
+## is True while v is still a possible value for the cell at (x, y). A
+## cell is decided when exactly one of its values is left.
+##
+## latin_round applies the row and column rules to every cell at once:
+##   - naked singles: a decided cell's value is removed from the rest of
+##     its row and column;
+##   - hidden singles: a value with only one place left in a row (or a
+##     column) is decided there.
+## cage_round then keeps, in every cage, only the values some way of
+## filling the cage still allows (like cage_support), and the two steps
+## are repeated until nothing changes. Both work on any stack of Tensors
+## (shape (..., n, n, n)), so solve_kenken_vector_batch propagates many
+## boards of the same size together, in the same few array operations
+## per round as one board.
+##
+## A CageTable is a (list (arrayof Int) (arrayof Int) (arrayof Int) Nat
+## (arrayof Int)), [rows, cells, vals, count, caged], listing the ways of
+## filling the cages of a board (or of a stack of boards, see
+## stack_tables): way rows[i] puts the value vals[i] + 1 in the cell
+## cells[i], counting cells in row major order through the whole stack.
+## There are count ways, numbered from 0, and caged lists the cells of
+## all the cages. Ways that repeat a number in a row or column of their
+## cage are left out.
+##
+## cage_round looks at every way of filling every cage in each round,
+## where solve_kenken_cp revises only the cages whose cells changed, and
+## each array operation has a fixed cost, so on boards smaller than 6 by
+## 6 solve_kenken_cp is faster, even when the boards are stacked. On
+## larger boards the few operations per round pay off.
+##
+## Tensors are NumPy arrays, so they are compared to None with "is".
+
+
+def board_tensor(fp):
+    '''
+    Returns the Tensor of fp before any propagation (see
+    initial_domains).
+
+    board_tensor: FlatPuzzle -> Tensor
+
+    Example:
+       board_tensor(flatten_puzzle(puzzle1partial))[1, 1].tolist() =>
+          [False, True, False, False]
+    '''
+    n = fp.size
+    masks = np.array(initial_domains(fp), dtype=np.int64).reshape(n, n)
+    return ((masks[..., None] >> np.arange(1, n + 1)) & 1).astype(bool)
+
+
+def tensor_puzzle(tensor):
+    '''
+    Returns the Puzzle filled in with the values of tensor, a Tensor
+    whose cells are all decided.
+
+    tensor_puzzle: Tensor -> Puzzle
+    '''
+    return Puzzle(tensor.shape[-1], (tensor.argmax(-1) + 1).tolist(), [])
+
+
+def cage_table(fp):
+    '''
+    Returns the CageTable of the remaining cages of fp.
+
+    cage_table: FlatPuzzle -> CageTable
+
+    Example:
+       [a.tolist() for a in cage_table(flatten_puzzle(
+          Puzzle(2, [['a', 'a'], ['b', 'b']],
+                 [['a', 1, '-'], ['b', 1, '-']])))[:3]] =>
+          [[0, 0, 1, 1, 2, 2, 3, 3], [0, 1, 0, 1, 2, 3, 2, 3],
+           [0, 1, 1, 0, 0, 1, 1, 0]]
+    '''
+    n = fp.size
+    rows = []
+    cells = []
+    vals = []
+    caged = []
+    count = 0
+    for op, target, group in cage_groups(fp):
+        caged.extend(group)
+        clashes = cage_clashes(group, n)
+        for tup in cage_tuples(op, target, len(group), n):
+            if all(tup[i] != tup[j] for i, j in clashes):
+                rows.extend([count] * len(group))
+                cells.extend(group)
+                vals.extend(v - 1 for v in tup)
+                count += 1
+    return [np.array(rows, dtype=np.int64), np.array(cells, dtype=np.int64),
+            np.array(vals, dtype=np.int64), count,
+            np.array(caged, dtype=np.int64)]
+
+
+def stack_tables(tables, n):
+    '''
+    Returns the CageTable of a stack of n by n boards, where tables are
+    the CageTables of the boards, in order.
+
+    stack_tables: (listof CageTable) Nat -> CageTable
+    '''
+    rows = []
+    cells = []
+    caged = []
+    count = 0
+    for b in range(len(tables)):
+        rows.append(tables[b][0] + count)
+        cells.append(tables[b][1] + b * n * n)
+        caged.append(tables[b][4] + b * n * n)
+        count += tables[b][3]
+    return [np.concatenate(rows), np.concatenate(cells),
+            np.concatenate([table[2] for table in tables]), count,
+            np.concatenate(caged)]
+
+
+def latin_round(tensor):
+    '''
+    Returns tensor, a Tensor or a stack of them, after one round of the
+    naked single and hidden single rules in every row and column.
+
+    latin_round: Tensor -> Tensor
+
+    Example:
+       latin_round(np.array([[[True, False], [True, True]],
+                             [[True, True], [True, True]]])).tolist() =>
+          [[[True, False], [False, True]], [[False, True], [True, False]]]
+    '''
+    fixed = tensor.sum(-1) == 1
+    placed = tensor & fixed[..., None]
+    in_row = placed.any(-2)
+    in_col = placed.any(-3)
+    tensor = tensor & ~((in_row[..., :, None, :] | in_col[..., None, :, :]) &
+                        ~fixed[..., None])
+    row_once = tensor.sum(-2) == 1
+    col_once = tensor.sum(-3) == 1
+    forced = tensor & (row_once[..., :, None, :] | col_once[..., None, :, :])
+    return np.where(forced.any(-1)[..., None], forced, tensor)
+
+
+def cage_round(tensor, table):
+    '''
+    Returns tensor, a Tensor or a stack of them, keeping in each cell of
+    a cage only the values of the ways of filling the cage in table that
+    tensor still allows.
+
+    cage_round: Tensor CageTable -> Tensor
+    '''
+    n = tensor.shape[-1]
+    rows, cells, vals, count, caged = table
+    flat = tensor.reshape(-1, n)
+    ## a way is left if none of its values has been ruled out
+    left = np.bincount(rows[~flat[cells, vals]], minlength=count) == 0
+    support = np.ones_like(flat)
+    support[caged] = False
+    support[cells[left[rows]], vals[left[rows]]] = True
+    return (flat & support).reshape(tensor.shape)
+
+
+def dead_ends(tensor):
+    '''
+    Returns, for tensor, a Tensor or a stack of them, whether each board
+    can have no solution: some cell has no value left, some value has no
+    place left in a row or column, or two decided cells of a row or
+    column share a value.
+
+    dead_ends: Tensor -> (anyof Bool (arrayof Bool))
+    '''
+    placed = tensor & (tensor.sum(-1) == 1)[..., None]
+    return ((tensor.sum(-1) == 0).any((-2, -1)) |
+            (tensor.sum(-2) == 0).any((-2, -1)) |
+            (tensor.sum(-3) == 0).any((-2, -1)) |
+            (placed.sum(-2) > 1).any((-2, -1)) |
+            (placed.sum(-3) > 1).any((-2, -1)))
+
+
+def propagate_tensor(tensor, table):
+    '''
+    Returns tensor, a Tensor or a stack of them, after applying
+    latin_round and cage_round (with table) until nothing changes, or
+    until every board is a dead end.
+
+    propagate_tensor: Tensor CageTable -> Tensor
+    '''
+    while True:
+        new = cage_round(latin_round(tensor), table)
+        if np.array_equal(new, tensor) or dead_ends(new).all():
+            return new
+        tensor = new
+
+
+def tensor_search(tensor, table):
+    '''
+    Returns a solved Tensor reachable from tensor by propagate_tensor and
+    guessing (fewest values first), or None if there is none.
+
+    tensor_search: Tensor CageTable -> (anyof Tensor None)
+    '''
+    tensor = propagate_tensor(tensor, table)
+    if dead_ends(tensor):
+        return None
+    n = tensor.shape[-1]
+    counts = tensor.sum(-1)
+    if (counts == 1).all():
+        return tensor
+    k = int(np.where(counts > 1, counts, n + 1).argmin())
+    y, x = divmod(k, n)
+    for v in np.nonzero(tensor[y, x])[0].tolist():
+        guess = tensor.copy()
+        guess[y, x] = False
+        guess[y, x, v] = True
+        res = tensor_search(guess, table)
+        if res is not None:
+            return res
+    return None
+
+
+def solve_kenken_vector(orig):
+    '''
+    Finds a solution to a KenKen puzzle, orig, by propagation on NumPy
+    arrays, or returns False if there is no solution.
+
+    solve_kenken_vector: Puzzle -> (anyof Puzzle False)
+
+    Example:
+       solve_kenken_vector(puzzle1) => puzzle1soln
+    '''
+    fp = flatten_puzzle(orig)
+    res = tensor_search(board_tensor(fp), cage_table(fp))
+    if res is None:
+        return False
+    return tensor_puzzle(res)
+
+
+def solve_kenken_vector_batch(puzzles):
+    '''
+    Returns the list of the solutions of puzzles, in order, as
+    solve_kenken_vector would find them (False for a puzzle with no
+    solution). The puzzles of each size are stacked and propagated
+    together; only the boards propagation leaves unsolved are then
+    searched one at a time.
+
+    solve_kenken_vector_batch: (listof Puzzle) -> (listof (anyof Puzzle
+                                                             False))
+
+    Example:
+       solve_kenken_vector_batch([puzzle1, puzzle1partial4a]) =>
+          [puzzle1soln, False]
+    '''
+    sols = [False] * len(puzzles)
+    ## by_size maps a board size to the [index, FlatPuzzle] of its puzzles
+    by_size = {}
+    for i in range(len(puzzles)):
+        fp = flatten_puzzle(puzzles[i])
+        by_size.setdefault(fp.size, []).append([i, fp])
+    for n, group in by_size.items():
+        tables = [cage_table(fp) for i, fp in group]
+        stack = propagate_tensor(np.stack([board_tensor(fp)
+                                           for i, fp in group]),
+                                 stack_tables(tables, n))
+        dead = dead_ends(stack)
+        for b in range(len(group)):
+            if not dead[b]:
+                res = tensor_search(stack[b], tables[b])
+                if res is not None:
+                    sols[group[b][0]] = tensor_puzzle(res)
+    return sols
+
+
+'''
+check.expect("Tvec1", solve_kenken_vector(puzzle1), puzzle1soln)
+check.expect("Tvec2", solve_kenken_vector(puzzle1partial), puzzle1soln)
+check.expect("Tvec3", solve_kenken_vector(puzzle1partial4a), False)
+check.expect("Tvec4", solve_kenken_vector(puzzle1soln), puzzle1soln)
+fp = flatten_puzzle(puzzle1partial)
+stack = np.stack([board_tensor(fp), board_tensor(flatten_puzzle(puzzle1))])
+check.expect("Tvec5", latin_round(stack)[0].tolist(),
+             latin_round(stack[0]).tolist())
+check.expect("Tvec6", solve_kenken_vector_batch([puzzle1, puzzle1partial4a,
+                                                 puzzle2a, puzzle1partial]),
+             [puzzle1soln, False, solve_kenken_cp(puzzle2a), puzzle1soln])
+'''